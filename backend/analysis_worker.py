@@ -0,0 +1,266 @@
+# ./analysis_worker.py
+# 영상 분석 워커 슈퍼바이저.
+# 부모 프로세스가 BatchVideoAnalyzer의 모델을 한 번만 로드해 추론 전용으로 고정한 뒤 워커를 fork합니다.
+# 워커는 모델 가중치 페이지를 부모와 copy-on-write로 공유하고, DB 대기열에서 분석 작업을 가져와 실행합니다.
+# 사용법:
+#   ANALYSIS_DISPATCH=worker gunicorn -c gunicorn.conf.py wsgi:app   # API는 작업을 대기열에 등록만 함
+#   python analysis_worker.py --workers 2
+#   python analysis_worker.py --workers 4 --memory-report           # 모델 로드 후 프로세스별 메모리만 출력하고 종료
+#   python analysis_worker.py --workers 2 --metrics-port 9100        # 워커 N은 9100+N 포트에서 /metrics 제공
+
+import argparse
+import gc
+import json
+import logging
+import os
+import select
+import signal
+import sys
+import time
+from datetime import datetime
+from typing import Dict, Tuple
+
+from analyzer_small import build_batch_analyzer, load_gemini_api_key, run_analysis
+from core.utils.analysis_logger import AnalysisLogger
+from core.utils.process_memory import format_memory_report, memory_report
+from core.utils.thread_budget import ThreadBudget
+from core.utils.tracing import start_metrics_server, tracer
+
+logger = logging.getLogger("analysis_worker")
+
+DEFAULT_WORKERS = int(os.environ.get("ANALYSIS_WORKERS", "2"))
+DEFAULT_THREAD_PROFILE = os.environ.get("ANALYSIS_THREAD_PROFILE", "throughput")
+POLL_INTERVAL_SECONDS = float(os.environ.get("ANALYSIS_POLL_INTERVAL", "2"))
+METRICS_PORT = int(os.environ.get("ANALYSIS_METRICS_PORT", "0")) # 0이면 지표 서버를 열지 않음
+METRICS_HOST = os.environ.get("ANALYSIS_METRICS_HOST", "127.0.0.1") # 지표 서버는 인증이 없으므로 기본값은 loopback
+MAX_JOBS_PER_WORKER = int(os.environ.get("ANALYSIS_MAX_JOBS_PER_WORKER", "50")) # 누수 방지를 위해 N건 처리 후 워커 재생성
+MIN_WORKER_UPTIME_SECONDS = 30 # 이보다 빨리 종료된 워커는 RESPAWN_BACKOFF_SECONDS 후에 다시 fork
+RESPAWN_BACKOFF_SECONDS = 10
+MEMORY_LOG_INTERVAL_SECONDS = 300
+MEMORY_REPORT_READY_TIMEOUT_SECONDS = 900
+
+class WorkerSupervisor:
+    """
+    워커 프로세스를 fork하고, 종료된 워커를 다시 fork하며, 종료 신호를 워커에 전달합니다.
+
+    - fork 전에 부모는 연산 스레드를 1개로 두고 모델 로드만 수행합니다. OpenMP/CTranslate2 스레드 풀은
+      fork된 자식에 복제되지 않으므로, 스레드 풀은 각 워커가 자신의 스레드 수로 새로 만듭니다.
+    - STT 모델(FasterWhisper)은 생성 시 스레드를 만들기 때문에 fork 후 각 워커에서 로드합니다.
+    - Gemini 클라이언트(gRPC)도 fork 이후에 처음 사용되도록 부모에서는 생성하지 않습니다.
+    """
+    def __init__(self, workers: int, thread_budget: ThreadBudget, preload: bool = True,
+                 max_jobs: int = MAX_JOBS_PER_WORKER, memory_report_only: bool = False, metrics_port: int = 0):
+        self.workers = workers
+        self.thread_budget = thread_budget
+        self.preload = preload
+        self.max_jobs = max_jobs
+        self.memory_report_only = memory_report_only
+        self.metrics_port = metrics_port
+        self.batch_analyzer = None
+        self.api_key = None
+        self.children: Dict[int, Tuple[int, float]] = {} # pid -> (slot, 시작 시각)
+        self._respawn_at: Dict[int, float] = {} # slot -> 다시 fork할 시각
+        self._stopping = False
+        self._ready_fd = None
+
+    def _handle_stop(self, signum, frame):
+        self._stopping = True
+
+    def run(self) -> int:
+        if self.memory_report_only:
+            self.api_key = "" # 모델 메모리만 측정하므로 Gemini는 사용하지 않음
+        else:
+            self.api_key = load_gemini_api_key()
+        self.batch_analyzer = build_batch_analyzer(api_key=self.api_key, thread_budget=self.thread_budget)
+
+        if self.preload:
+            started = time.perf_counter()
+            ThreadBudget.single().apply()
+            self.batch_analyzer.load_models(include_stt=False)
+            self.batch_analyzer.freeze_for_inference()
+            logger.info(f"부모 프로세스에서 모델 로드 완료 ({time.perf_counter() - started:.1f}s). 워커 {self.workers}개를 fork합니다.")
+        # fork 이후 GC가 부모에서 만든 객체의 헤더에 쓰면서 페이지가 복사되지 않도록, 현재 객체를 GC 대상에서 제외합니다.
+        gc.freeze()
+
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+        ready_read_fd = None
+        if self.memory_report_only:
+            ready_read_fd, self._ready_fd = os.pipe()
+        for slot in range(self.workers):
+            self._fork(slot)
+
+        if self.memory_report_only:
+            os.close(self._ready_fd)
+            return self._report_memory_and_stop(ready_read_fd)
+        return self._supervise()
+
+    def _fork(self, slot: int):
+        pid = os.fork()
+        if pid == 0:
+            exit_code = 0
+            try:
+                self._worker_main(slot)
+            except Exception as e:
+                logger.error(f"[worker-{slot}] 워커 비정상 종료: {e}", exc_info=True)
+                exit_code = 1
+            finally:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os._exit(exit_code) # 부모에게서 물려받은 atexit/finally 정리를 자식에서 실행하지 않음
+        self.children[pid] = (slot, time.monotonic())
+        logger.info(f"[worker-{slot}] fork 완료 (pid: {pid}, {self.thread_budget})")
+
+    def _supervise(self) -> int:
+        terminating = False
+        last_memory_log = time.monotonic()
+        while self.children or (self._respawn_at and not self._stopping):
+            if self._stopping and not terminating:
+                logger.info("종료 신호를 받았습니다. 진행 중인 작업을 마친 뒤 워커를 종료합니다.")
+                for pid in self.children:
+                    os.kill(pid, signal.SIGTERM)
+                terminating = True
+                self._respawn_at.clear()
+
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                pid, status = 0, 0
+            if pid == 0:
+                time.sleep(1)
+                now = time.monotonic()
+                for slot, due in list(self._respawn_at.items()):
+                    if due <= now:
+                        del self._respawn_at[slot]
+                        self._fork(slot)
+                if now - last_memory_log >= MEMORY_LOG_INTERVAL_SECONDS:
+                    total = memory_report(self._process_names())["total"]
+                    logger.info(f"워커 메모리 합계: RSS {total['rss']:.0f}MB, PSS {total['pss']:.0f}MB")
+                    last_memory_log = now
+                continue
+
+            slot, started = self.children.pop(pid)
+            if self._stopping:
+                continue
+            uptime = time.monotonic() - started
+            exit_code = os.waitstatus_to_exitcode(status) if hasattr(os, "waitstatus_to_exitcode") else status
+            delay = RESPAWN_BACKOFF_SECONDS if uptime < MIN_WORKER_UPTIME_SECONDS else 0
+            logger.warning(f"[worker-{slot}] 종료됨 (pid: {pid}, exit: {exit_code}, uptime: {uptime:.0f}s). {delay}s 후 다시 fork합니다.")
+            self._respawn_at[slot] = time.monotonic() + delay
+        logger.info("모든 워커가 종료되었습니다.")
+        return 0
+
+    def _process_names(self) -> Dict[str, int]:
+        names = {"supervisor": os.getpid()}
+        names.update({f"worker-{slot}": pid for pid, (slot, _) in self.children.items()})
+        return names
+
+    def _report_memory_and_stop(self, ready_read_fd: int) -> int:
+        """모든 워커가 모델 로드를 마칠 때까지 기다린 뒤 프로세스별 메모리를 출력하고 워커를 종료합니다."""
+        ready = 0
+        deadline = time.monotonic() + MEMORY_REPORT_READY_TIMEOUT_SECONDS
+        while ready < self.workers and not self._stopping:
+            readable, _, _ = select.select([ready_read_fd], [], [], max(0, deadline - time.monotonic()))
+            chunk = os.read(ready_read_fd, self.workers) if readable else b""
+            if not chunk: # 시간 초과 또는 모든 워커 종료(EOF)
+                break
+            ready += len(chunk)
+        os.close(ready_read_fd)
+
+        names = self._process_names()
+        report = memory_report(names)
+        print(format_memory_report(report, list(names) + ["total"]))
+        print("MEMORY_REPORT " + json.dumps({
+            "workers": self.workers, "ready": ready, "preload": self.preload,
+            "thread_budget": self.thread_budget.as_dict(), "total": report["total"]
+        }))
+
+        for pid in self.children:
+            os.kill(pid, signal.SIGTERM)
+        for pid in list(self.children):
+            os.waitpid(pid, 0)
+        return 0 if ready == self.workers else 1
+
+    def _worker_main(self, slot: int):
+        self._stopping = False
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, signal.SIG_IGN) # 터미널 Ctrl+C는 부모가 받아 SIGTERM으로 전달
+
+        import torch
+        self.thread_budget.apply()
+        torch.set_grad_enabled(False)
+        self.batch_analyzer.load_models() # preload 시 STT 모델만 새로 로드됨
+        if not self.preload:
+            self.batch_analyzer.freeze_for_inference()
+
+        if self.memory_report_only:
+            os.write(self._ready_fd, b"1")
+            os.close(self._ready_fd)
+            while not self._stopping:
+                time.sleep(0.5)
+            return
+
+        # 지표는 워커 프로세스마다 따로 집계되므로 부모에서 복제된 값을 비우고 워커별 포트로 노출합니다.
+        tracer.reset()
+        if self.metrics_port:
+            start_metrics_server(self.metrics_port + slot, host=METRICS_HOST)
+
+        # DB 연결은 fork 이후 워커에서 처음 생성되므로 프로세스 간에 소켓을 공유하지 않습니다.
+        from core.models.database import db_session, register_models
+        from core.services.analysis_job_service import AnalysisJobService
+        register_models()
+        job_service = AnalysisJobService()
+        jobs_done = 0
+        while not self._stopping and jobs_done < self.max_jobs:
+            try:
+                job = job_service.claim_next_job()
+            except Exception:
+                job = None # claim_next_job에서 이미 로깅됨
+            finally:
+                db_session.remove()
+            if job is None:
+                time.sleep(POLL_INTERVAL_SECONDS)
+                continue
+
+            record_id, user_id, video_path = job
+            analysis_logger = AnalysisLogger()
+            analysis_logger.log_info(f"분석 시작: {datetime.now().isoformat()}", {
+                "record_id": str(record_id), "user_id": str(user_id), "video_path": video_path,
+                "worker": slot, "pid": os.getpid()
+            })
+            try:
+                with torch.inference_mode():
+                    run_analysis(self.batch_analyzer, video_path, str(record_id), str(user_id), self.api_key, analysis_logger)
+            except Exception as e:
+                logger.error(f"[worker-{slot}] 분석 실패. record_id: {record_id}, error: {e}", exc_info=True)
+                # 예외로 끝난 작업은 재시도해도 같은 결과이므로 reaper의 타임아웃을 기다리지 않고 바로 실패 처리합니다.
+                try:
+                    job_service.mark_failed(record_id, f"{type(e).__name__}: {e}"[:500])
+                except Exception:
+                    pass # mark_failed에서 이미 로깅됨 (상태 저장에 실패하면 reaper가 정리)
+                finally:
+                    db_session.remove()
+            jobs_done += 1
+        logger.info(f"[worker-{slot}] 종료합니다. 처리한 작업: {jobs_done}건")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="모델을 공유하는 영상 분석 워커 슈퍼바이저")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help='fork할 워커 프로세스 수')
+    parser.add_argument('--thread-profile', default=DEFAULT_THREAD_PROFILE, choices=list(ThreadBudget.PROFILES),
+                        help='워커별 스레드 배분 (throughput: CPU를 워커 수로 나눔, latency: 워커마다 CPU 전체 사용)')
+    parser.add_argument('--no-preload', action='store_true', help='부모에서 모델을 로드하지 않고 워커마다 따로 로드 (비교용)')
+    parser.add_argument('--max-jobs', type=int, default=MAX_JOBS_PER_WORKER, help='워커가 처리할 최대 작업 수 (이후 재생성)')
+    parser.add_argument('--memory-report', action='store_true', help='모델 로드 후 프로세스별 RSS/PSS/USS를 출력하고 종료')
+    parser.add_argument('--metrics-port', type=int, default=METRICS_PORT, help='지표 서버 시작 포트 (워커 N은 포트+N, 0이면 사용 안 함)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(process)d] %(levelname)s %(name)s: %(message)s")
+    supervisor = WorkerSupervisor(
+        workers=args.workers,
+        thread_budget=ThreadBudget.for_profile(args.thread_profile, concurrency=args.workers),
+        preload=not args.no_preload,
+        max_jobs=args.max_jobs,
+        memory_report_only=args.memory_report,
+        metrics_port=args.metrics_port
+    )
+    sys.exit(supervisor.run())
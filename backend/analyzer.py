@@ -7,15 +7,17 @@ from pathlib import Path
 import json
 import requests
 import time
-import cv2
 from core.analyzer.video_analyzer import BatchVideoAnalyzer
 from core.analyzer.gemini_sentiment_aggregator import GeminiSentimentAggregator
 from core.renderer.result_renderer import ResultRenderer
 from core.utils.analysis_logger import AnalysisLogger
-from flask import Flask
+from core.utils.progress_reporter import ProgressReporter
+
+API_BASE_URL = os.environ.get("ANALYSIS_API_BASE_URL", "http://localhost:5000/api")
 
 def record_from_webcam(duration_seconds: int, output_filename: str = "recorded_video.avi"):
     """웹캠에서 지정된 시간 동안 비디오를 녹화하고 파일로 저장합니다."""
+    import cv2 # 웹캠 녹화 옵션에서만 필요
     cap = cv2.VideoCapture(0)  # 0번 카메라(기본 웹캠) 열기
     if not cap.isOpened():
         print("오류: 웹캠을 열 수 없습니다.")
@@ -70,8 +72,9 @@ if __name__ == "__main__":
         exit(1)
 
     current_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    detailed_log_filename = f"./logs/detailed_analysis_log_{current_timestamp}.json"
+    detailed_log_filename = f"./logs/detailed_analysis_log_{current_timestamp}.ndjson"
     analysis_logger = AnalysisLogger()
+    analysis_logger.stream_to(detailed_log_filename)
     analysis_logger.log_info(f"분석 시작: {datetime.now().isoformat()}", {"arguments": vars(args)})
     
     IMAGE_MODEL_WEIGHTS = "infrastructure/models/emonet_100_2_trained.pth"
@@ -90,6 +93,10 @@ if __name__ == "__main__":
         analysis_logger.log_error(f"오류: API.json 파일 처리 중 에러 발생: {e}")
         exit(1)
     
+    report_progress = ProgressReporter(API_BASE_URL, args.record_id, args.user_id)
+    report_progress("started")
+    report_progress.start_heartbeat()
+
     print("분석을 시작합니다...")
     batch_analyzer = BatchVideoAnalyzer(
         image_model_name="emonet",
@@ -97,7 +104,8 @@ if __name__ == "__main__":
         api_key=GEMINI_API_KEY,
         voice_model_name=args.voice_model,
         min_speech_segment_duration=args.min_speech_segment_duration,
-        logger=analysis_logger
+        logger=analysis_logger,
+        progress_callback=report_progress
     )
 
     analysis_results_from_segments = batch_analyzer.analyze(VIDEO_FILE_PATH)
@@ -108,6 +116,7 @@ if __name__ == "__main__":
         analysis_results_from_segments.get("segment_analyses", [])
     )
     analysis_logger.save_intermediate_result("final_aggregated_sentiment_result", final_aggregated_sentiment)
+    report_progress("aggregation_completed", {})
 
     # HTML 카드 렌더링
     html_template_path = "./templates/card_template_01.html"
@@ -119,7 +128,7 @@ if __name__ == "__main__":
     rendered_html_content = result_renderer.render(final_aggregated_sentiment)
 
     # 최종 결과를 백엔드 API로 전송
-    api_url = 'http://localhost:5000/api/save_analysis_results'
+    api_url = f'{API_BASE_URL}/save_analysis_results'
     payload = {
         "record_id": args.record_id,
         "user_id": args.user_id,
@@ -145,6 +154,7 @@ if __name__ == "__main__":
     if os.path.exists(VIDEO_FILE_PATH):
         os.remove(VIDEO_FILE_PATH)
     
+    report_progress.stop_heartbeat()
     analysis_logger.save_to_file(detailed_log_filename)
     print(f"\n모든 상세 로그 및 중간 결과는 '{detailed_log_filename}'에 저장되었습니다.")
     analysis_logger.log_info("모든 분석 및 로깅 프로세스 완료.")
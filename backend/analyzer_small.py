@@ -7,15 +7,25 @@ from pathlib import Path
 import json
 import requests
 import time
-import cv2
+from typing import Optional
 from core.analyzer.video_analyzer_small import BatchVideoAnalyzer
 from core.analyzer.gemini_sentiment_aggregator import GeminiSentimentAggregator
 from core.renderer.result_renderer import ResultRenderer
 from core.utils.analysis_logger import AnalysisLogger
-from flask import Flask
+from core.utils.progress_reporter import ProgressReporter
+from core.utils.thread_budget import ThreadBudget
+from core.utils.tracing import span, tracer
+
+API_BASE_URL = os.environ.get("ANALYSIS_API_BASE_URL", "http://localhost:5000/api")
+#IMAGE_MODEL_WEIGHTS = "infrastructure/models/emonet_100_2_trained.pth"
+IMAGE_MODEL_WEIGHTS = "infrastructure/models/mobilenet_v3_small.pth"
+VOICE_MODEL_WEIGHTS = "infrastructure/models/wav2vec2.pth"
+IMAGE_MODEL_NAME = "mobilenet_v3_small"
+VOICE_MODEL_NAME = "wav2vec2"
 
 def record_from_webcam(duration_seconds: int, output_filename: str = "recorded_video.avi"):
     """웹캠에서 지정된 시간 동안 비디오를 녹화하고 파일로 저장합니다."""
+    import cv2 # 웹캠 녹화 옵션에서만 필요
     cap = cv2.VideoCapture(0)  # 0번 카메라(기본 웹캠) 열기
     if not cap.isOpened():
         print("오류: 웹캠을 열 수 없습니다.")
@@ -43,6 +53,103 @@ def record_from_webcam(duration_seconds: int, output_filename: str = "recorded_v
     cv2.destroyAllWindows()
     return output_filename
 
+def load_gemini_api_key() -> str:
+    """.ignore/API.json에서 Gemini API 키를 읽습니다. 파일이 없거나 키가 비어 있으면 예외를 발생시킵니다."""
+    with open(".ignore/API.json", "r") as f:
+        api_info = json.load(f)
+    api_key_gemini = api_info.get("GEMINI_API_KEY")
+    if not api_key_gemini:
+        raise ValueError("GEMINI_API_KEY가 API.json에 없거나 유효하지 않습니다.")
+    return api_key_gemini
+
+def build_batch_analyzer(api_key: str, voice_model_name: str = VOICE_MODEL_NAME, min_speech_segment_duration: float = 5.0,
+                         thread_budget: Optional[ThreadBudget] = None) -> BatchVideoAnalyzer:
+    """작업 간에 재사용할 수 있는 BatchVideoAnalyzer를 생성합니다. 작업별 로거/콜백은 run_analysis에서 연결합니다."""
+    return BatchVideoAnalyzer(
+        image_model_name=IMAGE_MODEL_NAME,
+        image_model_weights_path=IMAGE_MODEL_WEIGHTS,
+        voice_model_weights_path=VOICE_MODEL_WEIGHTS,
+        api_key=api_key,
+        voice_model_name=voice_model_name,
+        min_speech_segment_duration=min_speech_segment_duration,
+        thread_budget=thread_budget
+    )
+
+def run_analysis(batch_analyzer: BatchVideoAnalyzer, video_path: str, record_id: str, user_id: str, api_key: str,
+                 analysis_logger: AnalysisLogger):
+    """
+    영상 한 건을 분석하고 결과를 백엔드 API로 전송합니다.
+    단독 실행(__main__)과 analysis_worker.py의 워커 프로세스가 같은 흐름을 사용합니다.
+    """
+    current_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    # 워커 여러 개가 같은 시각에 시작할 수 있으므로 record_id를 파일명에 포함합니다.
+    detailed_log_filename = f"./logs/detailed_analysis_log_{current_timestamp}_{record_id}.ndjson"
+    analysis_logger.stream_to(detailed_log_filename) # 분석 도중 프로세스가 죽어도 그때까지의 로그가 남도록 바로 기록
+
+    report_progress = ProgressReporter(API_BASE_URL, record_id, user_id)
+    report_progress("started")
+    report_progress.start_heartbeat()
+    job_span = span("analysis_job", record_id=record_id)
+    try:
+        with job_span:
+            print("분석을 시작합니다...")
+            batch_analyzer.bind_job(analysis_logger, report_progress)
+            analysis_results_from_segments = batch_analyzer.analyze(video_path)
+            analysis_logger.save_intermediate_result("batch_video_analysis_full_results", analysis_results_from_segments)
+
+            gemini_aggregator = GeminiSentimentAggregator(api_key=api_key, logger=analysis_logger)
+            final_aggregated_sentiment = gemini_aggregator.aggregate_sentiment(
+                analysis_results_from_segments.get("segment_analyses", [])
+            )
+            analysis_logger.save_intermediate_result("final_aggregated_sentiment_result", final_aggregated_sentiment)
+            report_progress("aggregation_completed", {})
+
+            # HTML 카드 렌더링
+            html_template_path = "./templates/card_template_01.html"
+            current_script_dir = Path(__file__).parent
+            full_html_template_path = current_script_dir / html_template_path
+            template_dir = str(full_html_template_path.parent)
+            template_filename = full_html_template_path.name
+            result_renderer = ResultRenderer(template_dir=template_dir, template_filename=template_filename)
+            rendered_html_content = result_renderer.render(final_aggregated_sentiment)
+
+            # 최종 결과를 백엔드 API로 전송
+            api_url = f'{API_BASE_URL}/save_analysis_results'
+            payload = {
+                "record_id": record_id,
+                "user_id": user_id,
+                "analysis_data": analysis_results_from_segments,
+                "report_data": {
+                    "card": final_aggregated_sentiment,
+                    "detail": analysis_results_from_segments, # 상세 분석 데이터
+                    "summary": { # 추후 Gemini를 통해 생성될 요약 데이터
+                        "overall_score": final_aggregated_sentiment.get("sentiment_score"),
+                        "dominant_emotion": final_aggregated_sentiment.get("dominant_overall_emotion")
+                    }
+                }
+            }
+
+            try:
+                with span("submit_results"):
+                    response = requests.post(api_url, json=payload)
+                    response.raise_for_status()
+                analysis_logger.log_info("분석 결과 백엔드 API 전송 성공.")
+            except requests.exceptions.RequestException as e:
+                analysis_logger.log_error(f"분석 결과 백엔드 API 전송 실패: {e}")
+
+            # 분석 완료 후 임시 파일 정리
+            if os.path.exists(video_path):
+                os.remove(video_path)
+    finally:
+        # 분석이 예외로 끝나면 heartbeat가 멈추고, AnalysisJobService의 reaper가 재시도/실패 처리합니다.
+        report_progress.stop_heartbeat()
+        batch_analyzer.bind_job(None, None)
+        if tracer.enabled:
+            analysis_logger.save_intermediate_result("trace", tracer.export_otlp_spans(trace_id=job_span.trace_id))
+        analysis_logger.save_to_file(detailed_log_filename)
+    print(f"\n모든 상세 로그 및 중간 결과는 '{detailed_log_filename}'에 저장되었습니다.")
+    analysis_logger.log_info("모든 분석 및 로깅 프로세스 완료.")
+
 if __name__ == "__main__":
     # Parse arguments
     parser = argparse.ArgumentParser()
@@ -54,6 +161,9 @@ if __name__ == "__main__":
                         help='음성 감정 분석에 사용할 모델을 선택하세요.')
     parser.add_argument('--min_speech_segment_duration', type=float, default=5.0,
                         help='최소 발화 세그먼트 지속 시간 (초).')
+    parser.add_argument('--thread_profile', type=str, default="latency", choices=list(ThreadBudget.PROFILES),
+                        help='라이브러리별 스레드 배분 (latency: 단건 응답 시간 우선, throughput: 동시 실행 작업 간 분배)')
+    parser.add_argument('--concurrent_jobs', type=int, default=1, help='throughput 프로파일에서 CPU를 나눠 쓸 동시 작업 수')
     parser.add_argument('--record_id', type=str, required=True, default="test_record", help='분석 대상 레코드 ID')
     parser.add_argument('--user_id', type=str, required=True, default="test_user", help='분석 요청 사용자 ID')
     args = parser.parse_args()
@@ -69,88 +179,21 @@ if __name__ == "__main__":
         print("오류: --video_path 또는 --record_from_cam 옵션 중 하나는 반드시 필요합니다.")
         exit(1)
 
-    current_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    detailed_log_filename = f"./logs/detailed_analysis_log_{current_timestamp}.json"
     analysis_logger = AnalysisLogger()
     analysis_logger.log_info(f"분석 시작: {datetime.now().isoformat()}", {"arguments": vars(args)})
-    
-    #IMAGE_MODEL_WEIGHTS = "infrastructure/models/emonet_100_2_trained.pth"
-    IMAGE_MODEL_WEIGHTS = "infrastructure/models/mobilenet_v3_small.pth"
-    VOICE_MODEL_WEIGHTS = "infrastructure/models/wav2vec2.pth"
-    image_model_name = "mobilenet_v3_small"
-    voice_model_name = "wav2vec2"
-    
-    GEMINI_API_KEY = None
+
     try:
-        with open(".ignore/API.json", "r") as f:
-            api_info = json.load(f)
-        api_key_gemini = api_info.get("GEMINI_API_KEY")
-        if not api_key_gemini:
-            raise ValueError("GEMINI_API_KEY가 API.json에 없거나 유효하지 않습니다.")
-        GEMINI_API_KEY = api_key_gemini
+        GEMINI_API_KEY = load_gemini_api_key()
     except FileNotFoundError:
         analysis_logger.log_error("오류: .ignore/API.json 파일을 찾을 수 없습니다. Gemini API 키를 설정해주세요.")
         exit(1)
     except (json.JSONDecodeError, ValueError) as e:
         analysis_logger.log_error(f"오류: API.json 파일 처리 중 에러 발생: {e}")
         exit(1)
-    
-    print("분석을 시작합니다...")
-    batch_analyzer = BatchVideoAnalyzer(
-        image_model_name=image_model_name,
-        image_model_weights_path=IMAGE_MODEL_WEIGHTS,
-        voice_model_weights_path=VOICE_MODEL_WEIGHTS,
+
+    batch_analyzer = build_batch_analyzer(
         api_key=GEMINI_API_KEY,
-        voice_model_name=voice_model_name,
         min_speech_segment_duration=args.min_speech_segment_duration,
-        logger=analysis_logger
+        thread_budget=ThreadBudget.for_profile(args.thread_profile, concurrency=args.concurrent_jobs)
     )
-
-    analysis_results_from_segments = batch_analyzer.analyze(VIDEO_FILE_PATH)
-    analysis_logger.save_intermediate_result("batch_video_analysis_full_results", analysis_results_from_segments)
-
-    gemini_aggregator = GeminiSentimentAggregator(api_key=GEMINI_API_KEY, logger=analysis_logger)
-    final_aggregated_sentiment = gemini_aggregator.aggregate_sentiment(
-        analysis_results_from_segments.get("segment_analyses", [])
-    )
-    analysis_logger.save_intermediate_result("final_aggregated_sentiment_result", final_aggregated_sentiment)
-
-    # HTML 카드 렌더링
-    html_template_path = "./templates/card_template_01.html"
-    current_script_dir = Path(__file__).parent
-    full_html_template_path = current_script_dir / html_template_path
-    template_dir = str(full_html_template_path.parent)
-    template_filename = full_html_template_path.name
-    result_renderer = ResultRenderer(template_dir=template_dir, template_filename=template_filename)
-    rendered_html_content = result_renderer.render(final_aggregated_sentiment)
-
-    # 최종 결과를 백엔드 API로 전송
-    api_url = 'http://localhost:5000/api/save_analysis_results'
-    payload = {
-        "record_id": args.record_id,
-        "user_id": args.user_id,
-        "analysis_data": analysis_results_from_segments,
-        "report_data": {
-            "card": final_aggregated_sentiment,
-            "detail": analysis_results_from_segments, # 상세 분석 데이터
-            "summary": { # 추후 Gemini를 통해 생성될 요약 데이터
-                "overall_score": final_aggregated_sentiment.get("sentiment_score"),
-                "dominant_emotion": final_aggregated_sentiment.get("dominant_overall_emotion")
-            }
-        }
-    }
-    
-    try:
-        response = requests.post(api_url, json=payload)
-        response.raise_for_status()
-        analysis_logger.log_info("분석 결과 백엔드 API 전송 성공.")
-    except requests.exceptions.RequestException as e:
-        analysis_logger.log_error(f"분석 결과 백엔드 API 전송 실패: {e}")
-        
-    # 분석 완료 후 임시 파일 정리
-    if os.path.exists(VIDEO_FILE_PATH):
-        os.remove(VIDEO_FILE_PATH)
-    
-    analysis_logger.save_to_file(detailed_log_filename)
-    print(f"\n모든 상세 로그 및 중간 결과는 '{detailed_log_filename}'에 저장되었습니다.")
-    analysis_logger.log_info("모든 분석 및 로깅 프로세스 완료.")
+    run_analysis(batch_analyzer, VIDEO_FILE_PATH, args.record_id, args.user_id, GEMINI_API_KEY, analysis_logger)
@@ -1,7 +1,7 @@
 # backend/app.py
 from collections import defaultdict
 from fileinput import filename
-from flask import Flask, request, jsonify, session, Blueprint
+from flask import Flask, request, jsonify, session, Blueprint, Response
 from flask_cors import CORS
 import os
 import time
@@ -14,11 +14,12 @@ from pathlib import Path
 from werkzeug.security import generate_password_hash, check_password_hash
 import hashlib
 from functools import wraps
-import subprocess
 import base64
-import io
-from PIL import Image
+import queue
+import threading
+import ipaddress
 from sqlalchemy import func # SQLAlchemy func 임포트
+from sqlalchemy.orm import load_only
 
 from core.models.database import db_session
 from core.models.user import User
@@ -29,9 +30,16 @@ from core.models.analysis import Analysis
 from core.models.report import Report
 from core.models.image_url import ImageUrl
 from core.services.auth_service import AuthService, SessionService
-from core.services.data_service import DataService
-from core.services.chatbot_service import ChatbotService
+from core.services.data_service import DataService, record_status_dict
+from core.services.analysis_job_service import AnalysisJobService
+from core.services.chatbot_service import ChatbotService, CHATBOT_ERROR_MESSAGE
+from core.services.event_service import analysis_events
+from core.services.persona_cache import persona_cache
+from core.services.card_image_service import card_image_service
 from core.utils.json_encoder import AlchemyEncoder, CustomJSONEncoder
+from core.utils.date_range import month_range
+from core.utils.tracing import tracer
+from core.utils.response_cache import response_cache, make_cache_key
 
 # 로깅 설정
 def setup_logging():
@@ -71,6 +79,16 @@ auth_service = AuthService()
 session_service = SessionService()
 data_service = DataService()
 chatbot_service = ChatbotService()
+analysis_job_service = AnalysisJobService()
+analysis_job_service.start_reaper()
+
+# 챗봇 페르소나는 정적 데이터이므로 기동 시 한 번 로드합니다. (DB가 아직 준비되지 않았으면 첫 조회 때 로드)
+try:
+    persona_cache.load()
+except Exception as e:
+    app.logger.warning(f"챗봇 페르소나 캐시 로드 실패, 첫 조회 때 다시 시도합니다: {e}")
+finally:
+    db_session.remove()
 
 # 로그인 데코레이터
 def login_required(f):
@@ -87,6 +105,77 @@ def login_required(f):
 def shutdown_session(exception=None):
     db_session.remove()
 
+# 사용자별 응답 캐시 데코레이터 (login_required 아래에 적용)
+# 응답은 (사용자, user_data_version, 엔드포인트, params)를 키로 캐시되며, 같은 키를 ETag로 내려주어
+# 클라이언트가 If-None-Match로 보내면 본문 없이 304를 반환합니다. 분석 결과 저장/페르소나 변경 시 버전이 올라가 무효화됩니다.
+# window_start를 주면 그 함수가 반환하는 조회 기간 시작 시각도 키에 포함합니다. (최근 7일처럼 현재 시각에 따라 달라지는 응답)
+# 핸들러도 같은 함수로 기간을 계산해야 캐시 키와 응답 내용이 어긋나지 않습니다.
+tracer.register_collector(response_cache.prometheus_samples)
+
+def user_cached(*params, window_start=None):
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            user_id = session.get('user_id')
+            try:
+                user_version = data_service.get_user_data_version(user_id)
+            except Exception as e:
+                app.logger.warning(f"사용자 데이터 버전 조회 실패, 캐시 없이 처리합니다: {e}")
+                db_session.rollback()
+                return f(*args, **kwargs)
+
+            key_params = {name: request.args.get(name) for name in params}
+            if window_start is not None:
+                key_params['_window_start'] = window_start().isoformat()
+            key = make_cache_key(user_id, user_version, request.endpoint, key_params)
+
+            if request.if_none_match.contains(key):
+                response = Response(status=304)
+                cache_status = 'revalidated'
+            else:
+                cached = response_cache.get(key)
+                if cached is not None:
+                    status, mimetype, body = cached
+                    response = Response(body, status=status, mimetype=mimetype)
+                    cache_status = 'hit'
+                else:
+                    response = app.make_response(f(*args, **kwargs))
+                    if response.status_code != 200:
+                        return response # 에러 응답은 캐시하지 않음
+                    response_cache.set(key, response.status_code, response.mimetype, response.get_data())
+                    cache_status = 'miss'
+            response.set_etag(key)
+            response.headers['Cache-Control'] = 'private, no-cache' # 매번 재검증 (If-None-Match)
+            response.headers['X-Cache'] = cache_status
+            return response
+        return decorated_function
+    return decorator
+
+# 내부망 전용 데코레이터 (nginx는 /api만 프록시하므로 지표 엔드포인트는 내부망에서만 접근 가능해야 합니다)
+def internal_only(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        try:
+            remote = ipaddress.ip_address(request.remote_addr or "")
+        except ValueError:
+            remote = None
+        if remote is None or not (remote.is_loopback or remote.is_private):
+            return jsonify({"message": "접근 권한이 없습니다."}), 403
+        return f(*args, **kwargs)
+    return decorated_function
+
+@app.route('/metrics')
+@internal_only
+def metrics():
+    """Prometheus 스크레이프용 지표 (이 gunicorn 워커 프로세스의 값)"""
+    return Response(tracer.render_prometheus(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/metrics/otlp')
+@internal_only
+def metrics_otlp():
+    """최근 span과 지표를 OpenTelemetry(OTLP/JSON) 형식으로 반환합니다."""
+    return jsonify({"traces": tracer.export_otlp_spans(), "metrics": tracer.export_otlp_metrics()})
+
 @api_bp.route('/')
 def index():
     app.logger.info("Health check endpoint accessed.")
@@ -207,11 +296,8 @@ def analyze_video():
         record_id = data_service.save_video_record(user_id, video_path)
         app.logger.info(f"records_tbl에 동영상 정보 저장 완료. record_id: {record_id}")
 
-        #subprocess.Popen(["python", "analyzer.py", "--video_path", video_path, "--record_id", str(record_id), "--user_id", str(user_id)])
-        #app.logger.info(f"백그라운드에서 analyzer.py 실행 요청. record_id: {record_id}")
-        
-        subprocess.Popen(["python", "analyzer_small.py", "--video_path", video_path, "--record_id", str(record_id), "--user_id", str(user_id)])
-        app.logger.info(f"백그라운드에서 analyzer_small.py 실행 요청. record_id: {record_id}")
+        # analyzer 실행 스크립트는 AnalysisJobService.ANALYZER_SCRIPT로 설정합니다.
+        analysis_job_service.launch(record_id, user_id, video_path)
 
         return jsonify({"message": "영상 분석 요청이 접수되었습니다.", "record_id": str(record_id)}), 202
 
@@ -244,9 +330,102 @@ def save_analysis_results():
         app.logger.error(f"분석 결과 저장 중 에러 발생: {e}", exc_info=True)
         return jsonify({"message": "분석 결과 저장에 실패했습니다."}), 500
 
+# 15-1. 분석 진행 상황 보고 API (analyzer.py가 호출)
+@api_bp.route('/analysis/progress', methods=['POST'])
+def report_analysis_progress():
+    data = request.get_json()
+    record_id = data.get('record_id')
+    user_id = data.get('user_id')
+    stage = data.get('stage')
+
+    if not record_id or not user_id or not stage:
+        return jsonify({"message": "필수 데이터가 누락되었습니다."}), 400
+
+    try:
+        data_service.update_record_progress(
+            user_id, record_id, stage,
+            percent=data.get('percent'),
+            current=data.get('current'),
+            total=data.get('total'),
+            eta_seconds=data.get('eta_seconds')
+        )
+        return jsonify({"message": "진행 상황이 저장되었습니다."}), 200
+    except Exception as e:
+        app.logger.error(f"분석 진행 상황 저장 중 에러 발생: {e}", exc_info=True)
+        return jsonify({"message": "진행 상황 저장에 실패했습니다."}), 500
+
+# 15-2. 분석 프로세스 heartbeat API (analyzer.py가 주기적으로 호출)
+@api_bp.route('/analysis/heartbeat', methods=['POST'])
+def report_analysis_heartbeat():
+    data = request.get_json()
+    record_id = data.get('record_id')
+    if not record_id:
+        return jsonify({"message": "필수 데이터가 누락되었습니다."}), 400
+
+    try:
+        data_service.touch_record_heartbeat(record_id)
+        return jsonify({"message": "heartbeat가 갱신되었습니다."}), 200
+    except Exception as e:
+        app.logger.error(f"분석 heartbeat 갱신 중 에러 발생: {e}", exc_info=True)
+        return jsonify({"message": "heartbeat 갱신에 실패했습니다."}), 500
+
+# 15-3. 분석 이벤트 스트림 API (Server-Sent Events)
+SSE_HEARTBEAT_SECONDS = 15
+SSE_MAX_STREAM_SECONDS = 300 # 연결을 주기적으로 끊어 워커 스레드를 회수하고, 클라이언트는 자동 재연결합니다.
+# 스트림은 연결된 동안 워커 스레드 하나를 점유하므로, 프로세스당 동시 스트림 수를 제한합니다.
+# 초과하면 503을 반환하고, 클라이언트는 /records/latest-status 폴링으로 대체합니다. (챗봇 스트림과 합쳐도 스레드가 남도록 기본값은 스레드 수의 1/4)
+ANALYSIS_EVENTS_MAX_STREAMS = int(os.environ.get("ANALYSIS_EVENTS_MAX_STREAMS",
+                                                 max(1, int(os.environ.get("GUNICORN_THREADS", "8")) // 4)))
+analysis_event_slots = threading.BoundedSemaphore(ANALYSIS_EVENTS_MAX_STREAMS)
+
+def _format_sse(event_type: str, data: dict) -> str:
+    return f"event: {event_type}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+@api_bp.route('/analysis/events', methods=['GET'])
+@login_required
+def stream_analysis_events():
+    user_id = session.get('user_id')
+
+    # 연결 직후 최신 레코드 상태를 한 번 전송하여, 구독 전에 완료된 분석도 놓치지 않도록 합니다.
+    latest_record = data_service.get_latest_record_status(user_id)
+    initial_status = record_status_dict(latest_record) if latest_record else {}
+    db_session.remove()
+
+    if not analysis_event_slots.acquire(blocking=False):
+        app.logger.warning(f"동시 분석 이벤트 스트림 수 초과 ({ANALYSIS_EVENTS_MAX_STREAMS}). user_id: {user_id}")
+        response = jsonify({"message": "지금은 연결이 많아 분석 상태를 실시간으로 보낼 수 없습니다."})
+        response.headers['Retry-After'] = '5'
+        return response, 503
+
+    subscriber = analysis_events.subscribe(user_id)
+
+    def generate():
+        try:
+            yield "retry: 3000\n\n"
+            yield _format_sse('status', initial_status)
+            deadline = time.monotonic() + SSE_MAX_STREAM_SECONDS
+            while time.monotonic() < deadline:
+                try:
+                    event = subscriber.get(timeout=SSE_HEARTBEAT_SECONDS)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield _format_sse(event.get('type', 'message'), event.get('data', {}))
+        finally:
+            analysis_events.unsubscribe(user_id, subscriber)
+
+    response = Response(generate(), mimetype='text/event-stream', headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no" # nginx 프록시 버퍼링 비활성화
+    })
+    # 클라이언트가 스트림 시작 전에 끊어도 응답이 닫힐 때 슬롯을 반납합니다.
+    response.call_on_close(analysis_event_slots.release)
+    return response
+
 # 16. 챗봇 화면 데이터 로드 API
 @api_bp.route('/chatbot_init', methods=['GET'])
 @login_required
+@user_cached()
 def chatbot_init():
     app.logger.info("챗봇 초기 데이터 로드 요청 접수.")
     user_id = session.get('user_id')
@@ -286,7 +465,7 @@ def get_report_detail(report_id):
         app.logger.info(f"상세 리포트 조회 성공. report_id: {report_id}")
         return jsonify({
             "report_summary": report.report_summary,
-            "report_detail": report.report_detail,
+            "report_detail": data_service.get_report_detail(report),
             "created_at": report.report_created
         }), 200
     except Exception as e:
@@ -302,7 +481,7 @@ def get_analysis_status(record_id):
     
     try:
         # report_tbl에 해당 record_id가 있는지 확인합니다.
-        report = db_session.query(Report).filter(
+        report = db_session.query(Report).options(load_only(Report.report_id, Report.report_card)).filter(
             Report.report_user_id == user_id,
             Report.report_analysis_id == db_session.query(Analysis.analysis_id).filter(
                 Analysis.analysis_record_id == record_id
@@ -326,6 +505,7 @@ def get_analysis_status(record_id):
 # 23. 특정 날짜의 리포트 목록을 조회하는 API 추가
 @api_bp.route('/reports/date', methods=['GET'])
 @login_required
+@user_cached('date')
 def get_reports_by_date():
     app.logger.info("날짜별 리포트 조회 요청 접수.")
     user_id = session.get('user_id')
@@ -416,54 +596,119 @@ def chatbot_chat():
                     "message": "아직 기록된 감정 리포트가 없습니다."
                 }), 200
         else:
-            # ChatbotService를 사용하여 답변 생성
-            response_message = chatbot_service.generate_response(user_id, user_message)
+            # ChatbotService를 사용하여 답변 생성 (대화 세션별 컨텍스트 사용)
+            context = chatbot_service.contexts.get_context(user_id, session.get('chat_session_id'))
+            session['chat_session_id'] = str(context.chat_session_id)
+            response_message = chatbot_service.generate_chatbot_response(context, user_message)
             return jsonify({"message": response_message}), 200
     except Exception as e:
         app.logger.error(f"챗봇 대화 중 에러 발생: {e}", exc_info=True)
         return jsonify({"message": "챗봇이 응답하는 데 실패했습니다."}), 500
 
+# 19-1. 챗봇 답변 스트리밍 API (Server-Sent Events)
+# Gemini 스트리밍 응답을 받는 대로 token 이벤트로 보내고, 끝나면 done 이벤트(전체 답변, 첫 토큰까지의 시간)를 보냅니다.
+# DB 조회는 스트림 시작 전에 끝내고 세션을 반납하므로, 느린 답변도 DB 연결은 점유하지 않습니다. (대화 저장은 답변이 끝난 뒤)
+# 스트림은 끝날 때까지 워커 스레드 하나를 점유하므로, 프로세스당 동시 스트림 수를 제한하여 다른 API 요청용 스레드를 남겨 둡니다.
+CHATBOT_MAX_CONCURRENT_STREAMS = int(os.environ.get("CHATBOT_MAX_CONCURRENT_STREAMS",
+                                                    max(1, int(os.environ.get("GUNICORN_THREADS", "8")) // 2)))
+chatbot_stream_slots = threading.BoundedSemaphore(CHATBOT_MAX_CONCURRENT_STREAMS)
+
+@api_bp.route('/chatbot/chat/stream', methods=['POST'])
+@login_required
+def chatbot_chat_stream():
+    started = time.monotonic()
+    data = request.get_json() or {}
+    user_id = session.get('user_id')
+    user_message = data.get('message')
+
+    if not user_message:
+        return jsonify({"message": "메시지를 입력해주세요."}), 400
+    if not chatbot_service.gemini_model:
+        return jsonify({"message": "챗봇 서비스를 이용할 수 없습니다. API 키를 확인해주세요."}), 503
+
+    try:
+        if user_message.strip() == "오늘 내 감정을 알려줘":
+            latest_report = data_service.get_latest_report(user_id)
+            report_card = latest_report.report_card if latest_report else None
+            reply = "오늘 기록된 감정 리포트입니다." if latest_report else "아직 기록된 감정 리포트가 없습니다."
+            prompt = None
+        else:
+            report_card = None
+            context = chatbot_service.contexts.get_context(user_id, session.get('chat_session_id'))
+            session['chat_session_id'] = str(context.chat_session_id)
+            reply, prompt = chatbot_service.build_chat_prompt(context, user_message)
+            if prompt is None:
+                chatbot_service.contexts.record_turn(context, user_message, reply)
+    except Exception as e:
+        app.logger.error(f"챗봇 프롬프트 준비 중 에러 발생: {e}", exc_info=True)
+        return jsonify({"message": "챗봇이 응답하는 데 실패했습니다."}), 500
+    finally:
+        db_session.remove()
+
+    if prompt is not None and not chatbot_stream_slots.acquire(blocking=False):
+        app.logger.warning(f"동시 챗봇 스트림 수 초과 ({CHATBOT_MAX_CONCURRENT_STREAMS}). user_id: {user_id}")
+        response = jsonify({"message": "지금은 대화가 많아요. 잠시 후 다시 시도해 주세요."})
+        response.headers['Retry-After'] = '2'
+        return response, 503
+
+    def generate():
+        if prompt is None:
+            yield _format_sse('token', {"text": reply})
+            yield _format_sse('done', {"message": reply, "report_card": report_card})
+            return
+        parts = []
+        try:
+            for text in chatbot_service.stream_chatbot_response(prompt, started=started):
+                if not parts:
+                    time_to_first_token = time.monotonic() - started
+                parts.append(text)
+                yield _format_sse('token', {"text": text})
+            message = "".join(parts).strip()
+            chatbot_service.contexts.record_turn(context, user_message, message)
+            yield _format_sse('done', {
+                "message": message,
+                "time_to_first_token_seconds": round(time_to_first_token, 3) if parts else None,
+                "elapsed_seconds": round(time.monotonic() - started, 3),
+            })
+        except Exception as e:
+            app.logger.error(f"챗봇 스트리밍 중 에러 발생: {e}", exc_info=True)
+            yield _format_sse('error', {"message": CHATBOT_ERROR_MESSAGE})
+        finally:
+            db_session.remove() # record_turn이 사용한 세션 정리 (요청 teardown 이후에 실행됨)
+
+    response = Response(generate(), mimetype='text/event-stream', headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no" # nginx 프록시 버퍼링 비활성화
+    })
+    if prompt is not None:
+        # 클라이언트가 스트림 시작 전에 끊어도 응답이 닫힐 때 슬롯을 반납합니다.
+        response.call_on_close(chatbot_stream_slots.release)
+    return response
+
+def latest_report_window_start() -> datetime:
+    """최근 1주일 요약의 시작 시각: 오늘을 포함한 최근 7일(6일 전 00:00부터). 날짜가 바뀔 때만 달라지므로 응답을 캐시할 수 있습니다."""
+    return datetime.combine(date.today() - timedelta(days=6), datetime.min.time())
+
 @app.route('/api/reports/latest', methods=['GET'])
 @login_required
+@user_cached(window_start=latest_report_window_start)
 def get_latest_report():
     user_id = session.get('user_id')
     try:
-        # 1. 1주일 전 날짜를 계산합니다.
-        seven_days_ago = datetime.now() - timedelta(days=7)
-
-        # 2. 최근 1주일간의 모든 리포트를 조회합니다.
-        reports_last_week = Report.query.filter(
-            Report.report_user_id == user_id,
-            Report.report_created >= seven_days_ago
-        ).order_by(Report.report_created.desc()).all()
+        # 1. 1주일(오늘 포함 7일)의 시작 시각을 계산합니다. 캐시 키에도 같은 값이 들어갑니다.
+        seven_days_ago = latest_report_window_start()
 
-        if reports_last_week:
-            # 3. 1주일간의 데이터를 집계합니다.
-            total_score = 0
-            all_dominant_emotions = []
-            
-            for report in reports_last_week:
-                if report.report_summary:
-                    total_score += report.report_summary.get('overall_score', 0)
-                    dominant_emotion = report.report_summary.get('dominant_emotion')
-                    if dominant_emotion:
-                        all_dominant_emotions.append(dominant_emotion)
-            
-            if not reports_last_week:
-                 return jsonify(success=False, message="지난 1주일간의 리포트가 없습니다."), 404
-
-            # 평균 점수와 가장 빈번한 감정을 계산합니다.
-            average_score = round(total_score / len(reports_last_week))
-            if all_dominant_emotions:
-                most_common_emotion = collections.Counter(all_dominant_emotions).most_common(1)[0][0]
-            else:
-                most_common_emotion = '데이터 없음'
+        # 2. 최근 1주일간의 리포트를 DB에서 집계합니다. (개수/점수 합계/최빈 감정 + 최신 리포트 카드)
+        week_summary = data_service.get_report_window_summary(user_id, seven_days_ago)
 
-            # 4. 집계된 요약 정보를 생성합니다.
+        if week_summary:
+            # 3. 평균 점수와 가장 빈번한 감정으로 요약 정보를 생성합니다.
+            report_count = week_summary['report_count']
+            average_score = round(week_summary['overall_score_sum'] / report_count)
             aggregated_summary = {
-                'dominant_emotion': most_common_emotion,
+                'dominant_emotion': week_summary['dominant_emotion'] or '데이터 없음',
                 'overall_score': average_score,
-                'report_count': len(reports_last_week)
+                'report_count': report_count
             }
 
             # 평균 점수를 기반으로 요약 메시지를 생성합니다.
@@ -477,7 +722,7 @@ def get_latest_report():
                 generated_summary_message = "지난 일주일간 다소 부정적인 감정들이 나타났네요. 힘든 순간도 있었지만, 잘 이겨내셨을 거예요. 😥"
             
             # 화면에는 가장 최신 리포트의 카드를 보여줍니다.
-            latest_report_in_week = reports_last_week[0]
+            latest_report_in_week = week_summary['latest_report']
             report_data = latest_report_in_week.report_card
             report_data['report_created'] = latest_report_in_week.report_created.strftime('%Y년 %m월 %d일')
             report_data['report_id'] = str(latest_report_in_week.report_id)
@@ -497,6 +742,7 @@ def get_latest_report():
 
 @app.route('/api/trends/monthly', methods=['GET'])
 @login_required
+@user_cached('year', 'month')
 def get_monthly_trends():
     user_id = session.get('user_id')
     year = request.args.get('year', type=int)
@@ -506,31 +752,15 @@ def get_monthly_trends():
         return jsonify(success=False, message="년도와 월을 입력해주세요."), 400
 
     try:
-        # 해당 월의 모든 리포트 조회
-        reports = Report.query \
-            .outerjoin(Analysis) \
-            .filter(Report.report_user_id == user_id,
-                    func.extract('year', Report.report_created) == year,
-                    func.extract('month', Report.report_created) == month) \
-            .order_by(Report.report_created.asc()) \
-            .all()
+        # 해당 월의 캘린더용 리포트 카드(분석 JSONB 제외)와 일간 감정 집계(최대 31행) 조회
+        reports, daily_rollups = data_service.get_monthly_trend_source(user_id, month_range(year, month))
         
         reports_by_day = defaultdict(list)
-        daily_positive_scores = defaultdict(float)
-        daily_negative_scores = defaultdict(float)
-        daily_report_counts = defaultdict(int)
-        total_sentiment_score = 0
-        report_count_for_summary = 0
         
         app.logger.info(f"{year}-{month}의 리포트 총 {len(reports)}개 조회됨.")
         
         for report in reports:
-            analysis = report.analysis
-            if not analysis:
-                continue
-            
             report_date = report.report_created.date()
-            day_of_month = report_date.day
 
             # 1. 원본 report_card 데이터를 수정 가능한 dict 형태로 복사
             report_card_data = dict(report.report_card)
@@ -567,36 +797,20 @@ def get_monthly_trends():
             }
             reports_by_day[report_date.isoformat()].append(report_info)
 
-            # 월간 요약 및 트렌드 계산을 위한 점수 집계 (오류 방지)
-            face_score = 0.0
-            voice_score = 0.0
-
-            if isinstance(analysis.analysis_face_emotions_score, dict):
-                face_score = analysis.analysis_face_emotions_score.get('score', 0.0)
-            elif isinstance(analysis.analysis_face_emotions_score, (int, float)):
-                face_score = analysis.analysis_face_emotions_score
-
-            if isinstance(analysis.analysis_voice_emotions_score, dict):
-                voice_score = analysis.analysis_voice_emotions_score.get('score', 0.0)
-            elif isinstance(analysis.analysis_voice_emotions_score, (int, float)):
-                voice_score = analysis.analysis_voice_emotions_score
-            
-            overall_sentiment_score = (face_score + voice_score) / 2 if (face_score + voice_score) > 0 else 0
-            
-            total_sentiment_score += overall_sentiment_score
-            report_count_for_summary += 1
-
-            # 긍정/부정 트렌드 계산
-            pos_face = analysis.analysis_face_emotions_rates.get('기쁨', 0.0) if analysis.analysis_face_emotions_rates else 0.0
-            pos_voice = analysis.analysis_voice_emotions_rates.get('기쁨', 0.0) if analysis.analysis_voice_emotions_rates else 0.0
-            daily_positive_scores[day_of_month] += (pos_face + pos_voice) / 2
-            
-            neg_emotions = ['분노', '불안', '상처', '슬픔']
-            neg_face_sum = sum(analysis.analysis_face_emotions_rates.get(e, 0.0) for e in neg_emotions) if analysis.analysis_face_emotions_rates else 0.0
-            neg_voice_sum = sum(analysis.analysis_voice_emotions_rates.get(e, 0.0) for e in neg_emotions) if analysis.analysis_voice_emotions_rates else 0.0
-            daily_negative_scores[day_of_month] += (neg_face_sum + neg_voice_sum) / 2
+        # 월간 요약 및 긍정/부정 트렌드는 일간 집계 테이블에서 계산
+        daily_positive_scores = {}
+        daily_negative_scores = {}
+        daily_report_counts = {}
+        total_sentiment_score = 0
+        report_count_for_summary = 0
 
-            daily_report_counts[day_of_month] += 1
+        for rollup in daily_rollups:
+            day_of_month = rollup.rollup_date.day
+            daily_positive_scores[day_of_month] = rollup.rollup_positive_sum
+            daily_negative_scores[day_of_month] = rollup.rollup_negative_sum
+            daily_report_counts[day_of_month] = rollup.rollup_report_count
+            total_sentiment_score += rollup.rollup_sentiment_score_sum
+            report_count_for_summary += rollup.rollup_report_count
         
         # 캘린더 표시용 데이터 가공
         days_with_emotions = []
@@ -620,7 +834,7 @@ def get_monthly_trends():
         # 해당 월의 마지막 날짜 계산
         last_day = (datetime(year, month, 1) + timedelta(days=31)).replace(day=1) - timedelta(days=1)
         for day in range(1, last_day.day + 1):
-            if day in daily_report_counts:
+            if daily_report_counts.get(day):
                 positive_trend_data.append({"day": day, "score": daily_positive_scores[day] / daily_report_counts[day]})
                 negative_trend_data.append({"day": day, "score": daily_negative_scores[day] / daily_report_counts[day]})
             else:
@@ -691,21 +905,23 @@ def save_report_image(report_id):
         return jsonify({"message": "이미지 데이터가 없습니다."}), 400
     
     try:
-        report = data_service.get_report_by_id(report_id)
+        report = data_service.get_report_by_id(report_id, with_detail=False)
         if not report or str(report.report_user_id) != user_id:
             app.logger.warning(f"이미지 저장 실패: 리포트를 찾을 수 없거나 접근 권한이 없음. report_id: {report_id}")
             return jsonify({"message": "리포트를 찾을 수 없거나 접근 권한이 없습니다."}), 404
         
-        # Base64 디코딩
-        image_bytes = base64.b64decode(base64_image.split(',')[1])
-        image = Image.open(io.BytesIO(image_bytes))
-        
-        # 이미지 저장 경로 생성
-        image_dir = Path(f'./uploads/images/{user_id}')
-        image_dir.mkdir(parents=True, exist_ok=True)
-        image_path = image_dir / f'{report_id}.png'
-        
-        image.save(image_path)
+        # Base64 디코딩 ("data:image/png;base64," 접두사는 있어도 없어도 됨)
+        try:
+            image_bytes = base64.b64decode(base64_image.split(',')[-1], validate=True)
+        except ValueError:
+            return jsonify({"message": "이미지 데이터가 올바른 base64 형식이 아닙니다."}), 400
+
+        # 헤더로 형식만 확인하고 받은 바이트를 그대로 저장합니다. 썸네일/WebP 변환은 백그라운드에서 처리합니다.
+        try:
+            image_path, image_hash = card_image_service.save(user_id, report_id, image_bytes)
+        except ValueError as e:
+            app.logger.warning(f"이미지 저장 실패: {e} report_id: {report_id}")
+            return jsonify({"message": str(e)}), 400
         app.logger.info(f"이미지 저장 성공. path: {image_path}")
         
         # 이미지 URL을 데이터베이스에 저장하는 로직을 제거함
@@ -720,7 +936,8 @@ def save_report_image(report_id):
 
         return jsonify({
             "message": "이미지가 성공적으로 저장되었습니다.",
-            "image_url": str(image_path)
+            "image_url": str(image_path),
+            "image_hash": image_hash
         }), 201
 
     except Exception as e:
@@ -740,16 +957,11 @@ def get_latest_record_status():
 
     try:
         # record_created 컬럼을 기준으로 내림차순 정렬하여 가장 최신 레코드를 조회
-        latest_record = db_session.query(Records).filter(
-            Records.record_user_id == user_id
-        ).order_by(Records.record_created.desc()).first()
+        latest_record = data_service.get_latest_record_status(user_id)
 
         if latest_record:
             #app.logger.info(f"최신 레코드 상태 조회 성공. record_id: {latest_record.record_id}, status: {latest_record.record_analysis_status}")
-            return jsonify({
-                "record_id": str(latest_record.record_id),
-                "status": latest_record.record_analysis_status
-            }), 200
+            return jsonify(record_status_dict(latest_record)), 200
         else:
             # 사용자의 레코드가 하나도 없는 경우
             app.logger.info(f"사용자(id: {user_id})의 분석 레코드가 존재하지 않음.")
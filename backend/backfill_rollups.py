@@ -0,0 +1,68 @@
+# ./backfill_rollups.py
+# 일간 감정 집계(emotion_daily_rollup_tbl)를 리포트/분석 원본에서 다시 계산합니다.
+# 집계 테이블은 save_analysis_results에서만 갱신되므로, 테이블 도입 이전에 저장된 리포트가 있으면 배포 후 한 번 실행합니다.
+# 월 단위로 upsert하므로 중단 후 다시 실행하거나 API 서버가 동작 중일 때 실행해도 됩니다.
+# 사용법:
+#   python backfill_rollups.py                       # 리포트가 있는 모든 사용자
+#   python backfill_rollups.py --user-id <uuid>      # 특정 사용자만
+#   python backfill_rollups.py --dry-run             # 집계 건수가 리포트 수와 다른 월만 출력
+
+import argparse
+import logging
+import sys
+from uuid import UUID
+
+from sqlalchemy import func
+from core.models.database import db_session
+from core.models.report import Report
+from core.models.emotion_rollup import EmotionDailyRollup
+import core.models.analysis
+import core.models.image_url
+from core.services.data_service import DataService
+from core.utils.date_range import month_range, range_filter
+
+logger = logging.getLogger("backfill_rollups")
+
+def report_months(user_id=None):
+    """(사용자, 연, 월)별 리포트 수를 조회합니다."""
+    year = func.extract('year', Report.report_created)
+    month = func.extract('month', Report.report_created)
+    query = db_session.query(Report.report_user_id, year, month, func.count()).group_by(Report.report_user_id, year, month)
+    if user_id is not None:
+        query = query.filter(Report.report_user_id == user_id)
+    return [(row[0], int(row[1]), int(row[2]), row[3]) for row in query.order_by(Report.report_user_id, year, month)]
+
+def rollup_count(user_id, date_range) -> int:
+    return db_session.query(func.coalesce(func.sum(EmotionDailyRollup.rollup_report_count), 0)).filter(
+        EmotionDailyRollup.rollup_user_id == user_id,
+        *range_filter(EmotionDailyRollup.rollup_date, date_range)
+    ).scalar()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="일간 감정 집계 백필")
+    parser.add_argument('--user-id', type=UUID, default=None, help='이 사용자만 처리')
+    parser.add_argument('--dry-run', action='store_true', help='쓰지 않고 불일치하는 월만 출력')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    data_service = DataService()
+    rebuilt = skipped = failed = 0
+    for user_id, year, month, num_reports in report_months(args.user_id):
+        date_range = month_range(year, month)
+        if rollup_count(user_id, date_range) == num_reports:
+            skipped += 1
+            continue
+        if args.dry_run:
+            print(f"{user_id} {year}-{month:02d}: 리포트 {num_reports}개, 집계 불일치")
+            rebuilt += 1
+            continue
+        try:
+            data_service.rebuild_daily_rollups(user_id, date_range)
+            rebuilt += 1
+        except Exception:
+            failed += 1 # rebuild_daily_rollups에서 이미 로깅됨
+        finally:
+            db_session.remove()
+
+    logger.info(f"백필 완료: 재계산 {rebuilt}개월, 일치 {skipped}개월, 실패 {failed}개월")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,95 @@
+# ./backfill_segments.py
+# segment_tbl 도입 이전에 저장된 분석 결과의 발화 구간 결과를 segment_tbl로 옮깁니다.
+# database/upgrade.sql을 실행한 뒤 한 번 실행합니다. segment_tbl에 행이 없는 분석만 처리하므로 다시 실행해도 됩니다.
+# 구간 결과는 analysis_tbl의 기존 시계열 컬럼(얼굴/음성)을 구간 순서대로 합쳐 만들고,
+# 그 컬럼이 없거나 비어 있으면 report_detail.segment_analyses를 사용합니다. (원본 컬럼과 report_detail은 수정하지 않음)
+# 사용법:
+#   python backfill_segments.py                  # 전체
+#   python backfill_segments.py --dry-run        # 쓰지 않고 옮길 분석 수만 출력
+#   python backfill_segments.py --batch-size 100
+
+import argparse
+import logging
+import sys
+from itertools import zip_longest
+
+from sqlalchemy import text
+from core.models.database import db_session
+from core.models.segment import Segment
+import core.models.analysis
+import core.models.image_url
+
+logger = logging.getLogger("backfill_segments")
+
+LEGACY_COLUMNS = ("analysis_face_emotions_time_series_rates", "analysis_voice_emotions_time_series_rates")
+
+def has_legacy_columns() -> bool:
+    count = db_session.execute(text(
+        "SELECT count(*) FROM information_schema.columns "
+        "WHERE table_schema = 'public' AND table_name = 'analysis_tbl' AND column_name IN :names"
+    ).bindparams(names=LEGACY_COLUMNS)).scalar()
+    return count == len(LEGACY_COLUMNS)
+
+def pending_analyses(after, batch_size: int, legacy: bool):
+    """segment_tbl에 행이 없는 분석을 analysis_id 순서로 batch_size개 조회합니다. (face 시계열, voice 시계열, report의 segment_analyses)"""
+    legacy_select = ", ".join(f"a.{column}" for column in LEGACY_COLUMNS) if legacy else "NULL, NULL"
+    return db_session.execute(text(f"""
+        SELECT a.analysis_id, {legacy_select}, r.report_detail -> 'segment_analyses'
+        FROM analysis_tbl a
+        LEFT JOIN report_tbl r ON r.report_analysis_id = a.analysis_id
+        WHERE NOT EXISTS (SELECT 1 FROM segment_tbl s WHERE s.segment_analysis_id = a.analysis_id)
+          AND (CAST(:after AS uuid) IS NULL OR a.analysis_id > CAST(:after AS uuid))
+        ORDER BY a.analysis_id
+        LIMIT :batch_size
+    """), {"after": after, "batch_size": batch_size}).fetchall()
+
+def legacy_segments(face_series, voice_series, detail_segments) -> list:
+    """얼굴 시계열(visual_analysis)과 음성 시계열(audio_analysis)을 구간별로 합칩니다. 둘 다 없으면 report의 segment_analyses를 사용합니다."""
+    if face_series or voice_series:
+        return [{**voice, **face} for face, voice in zip_longest(face_series or [], voice_series or [], fillvalue={})]
+    return detail_segments or []
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="segment_tbl 백필")
+    parser.add_argument('--batch-size', type=int, default=200, help='한 트랜잭션에서 처리할 분석 수')
+    parser.add_argument('--dry-run', action='store_true', help='쓰지 않고 옮길 분석 수만 출력')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    legacy = has_legacy_columns()
+    if not legacy:
+        logger.info("analysis_tbl에 기존 시계열 컬럼이 없어 report_detail.segment_analyses만 사용합니다.")
+
+    after = None
+    moved = empty = segments = 0
+    failed = False
+    while True:
+        rows = pending_analyses(after, args.batch_size, legacy)
+        if not rows:
+            break
+        after = str(rows[-1][0])
+        segment_rows = []
+        for analysis_id, face_series, voice_series, detail_segments in rows:
+            analysis_segments = legacy_segments(face_series, voice_series, detail_segments)
+            if not analysis_segments:
+                empty += 1 # 구간이 없는 분석 (다시 실행해도 건너뜀)
+                continue
+            segment_rows.extend(Segment.rows_from_analysis(analysis_id, analysis_segments))
+            moved += 1
+        segments += len(segment_rows)
+        if args.dry_run or not segment_rows:
+            continue
+        try:
+            db_session.execute(Segment.__table__.insert(), segment_rows)
+            db_session.commit()
+        except Exception as e:
+            db_session.rollback()
+            logger.error(f"segment_tbl 백필 중 에러 발생. 마지막 analysis_id: {after}: {e}", exc_info=True)
+            failed = True
+            break
+        finally:
+            db_session.remove()
+
+    action = "옮길" if args.dry_run else "옮긴"
+    logger.info(f"백필 {'중단' if failed else '완료'}: {action} 분석 {moved}개 (구간 {segments}개), 구간 없는 분석 {empty}개")
+    sys.exit(1 if failed else 0)
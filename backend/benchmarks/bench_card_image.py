@@ -0,0 +1,94 @@
+# ./benchmarks/bench_card_image.py
+# 감정 카드 이미지 저장의 요청 스레드 처리 시간을 측정합니다.
+#   legacy: Pillow로 디코딩 후 PNG로 다시 인코딩하여 저장 (이전 save_report_image 방식)
+#   raw:    헤더 확인 후 받은 바이트를 그대로 저장 (CardImageService.save, 파생 이미지는 백그라운드)
+#   repeat: 같은 카드를 다시 저장 (내용 해시가 같아 쓰기와 파생 이미지 생성을 건너뜀)
+# 백그라운드 작업이 끝난 뒤 썸네일이 생성되었는지, 작업 처리 전에 같은 리포트 이미지를 다른 이미지로 덮어써도
+# 각 해시의 썸네일이 자기 내용으로 만들어졌는지 확인하며, 아니면 실패(exit 1)합니다.
+# 사용법: python benchmarks/bench_card_image.py --width 1080 --height 1920 --repeat 20
+
+import argparse
+import io
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from PIL import Image, ImageDraw
+from core.services.card_image_service import CardImageService
+
+def make_card_png(width: int, height: int) -> bytes:
+    """그라데이션과 도형이 있는 카드 모양의 PNG를 만듭니다. (단색 이미지는 압축이 지나치게 잘 되어 실제와 다름)"""
+    image = Image.new("RGB", (width, height))
+    draw = ImageDraw.Draw(image)
+    for y in range(height):
+        draw.line([(0, y), (width, y)], fill=(y * 255 // height, 120, 255 - y * 255 // height))
+    for i in range(40):
+        x, y = (i * 97) % width, (i * 193) % height
+        draw.ellipse([x, y, x + width // 6, y + width // 6], outline=(255, 255, 255), width=4)
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+def legacy_save(image_dir: Path, report_id, image_bytes: bytes):
+    image = Image.open(io.BytesIO(image_bytes))
+    image_dir.mkdir(parents=True, exist_ok=True)
+    image.save(image_dir / f"{report_id}.png")
+
+def measure(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="감정 카드 이미지 저장 시간 측정")
+    parser.add_argument('--width', type=int, default=1080)
+    parser.add_argument('--height', type=int, default=1920)
+    parser.add_argument('--repeat', type=int, default=20, help='방식별 반복 횟수')
+    args = parser.parse_args()
+
+    image_bytes = make_card_png(args.width, args.height)
+    user_id = uuid.uuid4()
+    with tempfile.TemporaryDirectory() as base_dir:
+        service = CardImageService(base_dir=Path(base_dir))
+
+        legacy_ms = measure(lambda: legacy_save(Path(base_dir) / "legacy", uuid.uuid4(), image_bytes), args.repeat)
+        # 매번 내용이 달라야 쓰기/해시 계산이 생략되지 않으므로 PNG 뒤에 무시되는 바이트를 붙입니다.
+        variants = [image_bytes + i.to_bytes(4, "big") for i in range(args.repeat)]
+        raw_ms = measure(lambda: service.save(user_id, uuid.uuid4(), variants.pop()), args.repeat)
+        service.join()
+
+        report_id = uuid.uuid4()
+        path, digest = service.save(user_id, report_id, image_bytes)
+        service.join()
+        repeat_ms = measure(lambda: service.save(user_id, report_id, image_bytes), args.repeat)
+
+        thumbnails = list(service.derived_dir(digest).glob("thumb_*.webp"))
+
+        # 워커가 큰 이미지를 처리하는 동안 가로/세로가 다른 두 이미지를 연달아 저장 (첫 작업이 처리되기 전에 원본 파일이 바뀜)
+        overwrite_id = uuid.uuid4()
+        service.save(user_id, uuid.uuid4(), image_bytes + b"busy")
+        portrait = make_card_png(args.width // 4, args.height // 4)
+        landscape = make_card_png(args.height // 4, args.width // 4)
+        digests = [service.save(user_id, overwrite_id, data)[1] for data in (portrait, landscape)]
+        service.join()
+        consistent = True
+        for data, overwrite_digest in zip((portrait, landscape), digests):
+            expected_landscape = Image.open(io.BytesIO(data)).width > Image.open(io.BytesIO(data)).height
+            derived = list(service.derived_dir(overwrite_digest).glob("thumb_*.webp"))
+            consistent &= bool(derived) and (Image.open(derived[0]).width > Image.open(derived[0]).height) == expected_landscape
+        print(f"image={args.width}x{args.height} png={len(image_bytes) / 1024:.0f}KB")
+        print(f"legacy (decode + re-encode): {legacy_ms:8.2f} ms")
+        print(f"raw (sniff + write):         {raw_ms:8.2f} ms")
+        print(f"repeat (same content):       {repeat_ms:8.2f} ms")
+        print(f"thumbnail: {thumbnails[0].name if thumbnails else '없음'}")
+        print(f"overwrite before worker: {'ok' if consistent else 'MISMATCH'}")
+
+    sys.exit(0 if thumbnails and consistent else 1)
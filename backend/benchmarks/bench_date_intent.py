@@ -0,0 +1,114 @@
+# ./benchmarks/bench_date_intent.py
+# 챗봇 과거 감정 질문의 날짜 의도 해석(parse_date_intent)을 예시 질문 모음으로 검증하고 메시지당 처리 시간을 측정합니다.
+# 기대한 기간과 다르게 해석된 질문이 있으면 실패(exit 1)합니다.
+# --database를 주면 DATABASE_URL의 DB에 리포트를 만든 뒤, 질문마다 실행된 SQL 문이 1개 이하인지도 확인합니다.
+# 사용법:
+#   python benchmarks/bench_date_intent.py
+#   DATABASE_URL=postgresql://... python benchmarks/bench_date_intent.py --database --reports 30
+
+import argparse
+import sys
+import timeit
+import uuid
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.utils.date_intent import parse_date_intent
+
+TODAY = date(2025, 3, 12) # 수요일 (지난주 = 3/3~3/9)
+
+# (질문, 기대 기간 [start, end) 또는 None)
+CORPUS = [
+    ("어제 감정 어땠어?", (date(2025, 3, 11), date(2025, 3, 12))),
+    ("어제 나 기분 어땠는지 알려줘", (date(2025, 3, 11), date(2025, 3, 12))),
+    ("그제는 어땠어?", (date(2025, 3, 10), date(2025, 3, 11))),
+    ("그저께 감정", (date(2025, 3, 10), date(2025, 3, 11))),
+    ("오늘 감정 알려줘", (date(2025, 3, 12), date(2025, 3, 13))),
+    ("오늘 회사에서 칭찬받았어", None),
+    ("지난주 행복했어?", (date(2025, 3, 3), date(2025, 3, 10))),
+    ("지난 주 감정 요약해줘", (date(2025, 3, 3), date(2025, 3, 10))),
+    ("저번주에 나 어땠어", (date(2025, 3, 3), date(2025, 3, 10))),
+    ("이번 주 감정은?", (date(2025, 3, 10), date(2025, 3, 13))),
+    ("이번 달 감정 정리해줘", (date(2025, 3, 1), date(2025, 3, 13))),
+    ("이번달 어땠어", (date(2025, 3, 1), date(2025, 3, 13))),
+    ("지난달 감정 알려줘", (date(2025, 2, 1), date(2025, 3, 1))),
+    ("저번 달은 어땠지?", (date(2025, 2, 1), date(2025, 3, 1))),
+    ("지난 3일 동안 감정", (date(2025, 3, 10), date(2025, 3, 13))),
+    ("최근 7일 감정 보여줘", (date(2025, 3, 6), date(2025, 3, 13))),
+    ("8월 1일 감정 알려줘", (date(2024, 8, 1), date(2024, 8, 2))),
+    ("3월 1일에 나 어땠어?", (date(2025, 3, 1), date(2025, 3, 2))),
+    ("3월1일 감정", (date(2025, 3, 1), date(2025, 3, 2))),
+    ("2월 30일 감정", None),
+    ("어제 말고 3월 5일 감정", (date(2025, 3, 5), date(2025, 3, 6))),
+    ("안녕 도담아", None),
+    ("요즘 너무 피곤해", None),
+    ("내일 발표가 있어서 긴장돼", None),
+    ("오늘 점심 뭐 먹지", None),
+    ("이번 달 월세 때문에 걱정이야", None),
+    ("이번 주에 시험이 있어", None),
+    ("지난날을 돌아보면 후회돼", None),
+    ("어제 친구랑 싸웠어", None),
+    ("3월 5일에 면접이 있어", None),
+]
+
+def check_corpus() -> int:
+    failures = 0
+    for message, expected in CORPUS:
+        intent = parse_date_intent(message, TODAY)
+        actual = intent.date_range if intent else None
+        if actual != expected:
+            failures += 1
+            print(f"[FAIL] {message!r}: expected {expected}, got {actual}")
+    return failures
+
+def count_queries_per_message(num_reports: int) -> int:
+    """리포트를 num_reports개 만든 사용자로 각 질문의 과거 감정 요약을 조회하고, SQL이 2개 이상 실행된 질문 수를 반환합니다."""
+    from core.models.database import db_session
+    from core.models.report import Report
+    from core.services.auth_service import AuthService
+    from core.services.chatbot_service import ChatbotService
+    from count_trend_queries import count_queries, seed_reports
+    from core.services.data_service import DataService
+
+    nickname = f"bench_{uuid.uuid4().hex[:8]}"
+    user_id = AuthService().create_user_with_auth(f"{nickname}@bench.local", "bench", nickname, True, False).user_id
+    seed_reports(DataService(), user_id, num_reports)
+    # 리포트 생성 시각을 최근 num_reports일에 하루씩 배치
+    for offset, report in enumerate(db_session.query(Report).filter(Report.report_user_id == user_id).all()):
+        report.report_created = report.report_created - timedelta(days=offset)
+    db_session.commit()
+    db_session.remove()
+
+    chatbot_service = ChatbotService()
+    over = 0
+    for message, _ in CORPUS:
+        with count_queries() as statements:
+            answer = chatbot_service._get_past_emotions_summary(user_id, message)
+        if len(statements) > 1:
+            over += 1
+        print(f"  queries={len(statements)}  {message!r} -> {(answer or '-')[:60]}")
+        db_session.remove()
+    return over
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="챗봇 날짜 의도 해석 검증 및 처리 시간 측정")
+    parser.add_argument('--repeat', type=int, default=5, help='반복 측정 횟수')
+    parser.add_argument('--number', type=int, default=2000, help='측정당 질문 모음 순회 횟수')
+    parser.add_argument('--database', action='store_true', help='DB에서 질문당 SQL 실행 횟수도 확인')
+    parser.add_argument('--reports', type=int, default=30, help='--database 사용 시 만들 리포트 수')
+    args = parser.parse_args()
+
+    failures = check_corpus()
+    messages = [message for message, _ in CORPUS]
+    runs = timeit.repeat(lambda: [parse_date_intent(message, TODAY) for message in messages], repeat=args.repeat, number=args.number)
+    per_message_us = min(runs) / (args.number * len(messages)) * 1e6
+    print(f"corpus={len(messages)}  mismatches={failures}  best={per_message_us:.2f} us/message")
+
+    if args.database:
+        over = count_queries_per_message(args.reports)
+        print(f"질문당 SQL 2개 이상: {over}개")
+        failures += over
+
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,63 @@
+# ./benchmarks/bench_model_load.py
+# 이미지 감정 모델 가중치를 torch.load(전체 복사)와 ModelRegistry(safetensors mmap)로 로드할 때의
+# 로드 시간과 프로세스 RSS를 비교합니다. 각 방식은 새 프로세스에서 측정합니다.
+# 사용법: python benchmarks/bench_model_load.py --model mobilenet_v3_small --weights infrastructure/models/mobilenet_v3_small.pth
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+def rss_mb() -> dict:
+    """현재 프로세스의 RSS(MB). 공유 가능한 mmap 페이지는 RssFile로 따로 집계됩니다."""
+    status = Path('/proc/self/status').read_text()
+    fields = dict(line.split(':', 1) for line in status.splitlines() if ':' in line)
+    return {key: int(fields[key].split()[0]) / 1024 for key in ('VmRSS', 'RssAnon', 'RssFile') if key in fields}
+
+def run_once(method: str, model_name: str, weights: str):
+    import time
+    import torch
+    from core.models.model_factory import create_model
+    from core.models.model_registry import model_registry
+
+    start = time.perf_counter()
+    if method == 'torch_load':
+        model = create_model(model_name=model_name, num_classes=7, pretrained=False)
+        model.load_state_dict(torch.load(weights, map_location='cpu'))
+        model.eval()
+    else:
+        model = model_registry.build_with_weights(lambda: create_model(model_name=model_name, num_classes=7, pretrained=False), weights, 'cpu')
+    elapsed = time.perf_counter() - start
+    print(json.dumps({"method": method, "load_seconds": elapsed, **rss_mb()}))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="모델 가중치 로드 방식 비교")
+    parser.add_argument('--model', default='mobilenet_v3_small', help='create_model에 전달할 모델 이름')
+    parser.add_argument('--weights', default='infrastructure/models/mobilenet_v3_small.pth', help='.pth 가중치 경로')
+    parser.add_argument('--repeat', type=int, default=3, help='방식별 측정 횟수')
+    parser.add_argument('--_child', nargs=1, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(BACKEND_DIR))
+    if args._child:
+        run_once(args._child[0], args.model, args.weights)
+        sys.exit(0)
+
+    # safetensors 변환은 첫 registry 로드에서 한 번만 일어나므로 측정 전에 미리 수행합니다.
+    from core.models.model_registry import model_registry
+    model_registry.load_state_dict(args.weights)
+
+    for method in ('torch_load', 'registry_mmap'):
+        results = []
+        for _ in range(args.repeat):
+            output = subprocess.run(
+                [sys.executable, __file__, '--model', args.model, '--weights', args.weights, '--_child', method],
+                cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+            ).stdout.strip().splitlines()[-1]
+            results.append(json.loads(output))
+        best = min(results, key=lambda result: result['load_seconds'])
+        print(f"{method:<14} load={best['load_seconds'] * 1000:8.1f} ms  RSS={best['VmRSS']:7.1f} MB  "
+              f"anon={best.get('RssAnon', 0):7.1f} MB  file(shared)={best.get('RssFile', 0):7.1f} MB")
@@ -0,0 +1,190 @@
+# ./benchmarks/bench_pipeline.py
+# 합성 영상(benchmarks/fixtures.py)으로 BatchVideoAnalyzer.analyze 전체 파이프라인을 측정합니다.
+# 영상마다 새 프로세스에서 모델을 로드한 뒤 --repeat회 분석하고, 단계별 p50/p95, frames/sec,
+# real-time factor(분석 시간 / 영상 길이), 최대 RSS를 JSON으로 저장합니다. Gemini 텍스트 분석은 중립 결과로 대체합니다.
+# --compare로 이전 결과 JSON과 비교하여 p50이 --max-regression 비율 이상 느려진 단계가 있으면 실패(exit 1)합니다.
+# 사용법:
+#   python benchmarks/bench_pipeline.py --durations 10 30 --resolutions 640x480 1280x720 --repeat 3
+#   python benchmarks/bench_pipeline.py --compare benchmarks/results/pipeline_20250101_120000.json
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+
+from fixtures import DEFAULT_FIXTURE_DIR, generate_fixture, load_fixture_meta, parse_resolution, stub_gemini
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+OVERALL_STAGES = ("full_audio_extraction_seconds", "speech_segmentation_seconds", "total_elapsed_seconds")
+SEGMENT_STAGES = ("audio_cropping_seconds", "text_analysis_seconds", "voice_analysis_seconds", "image_analysis_seconds")
+MIN_COMPARABLE_SECONDS = 0.01 # 이보다 짧은 단계는 측정 오차가 커서 회귀 비교에서 제외
+
+def percentile(values: List[float], ratio: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * ratio))] if ordered else 0.0
+
+def peak_rss_mb() -> float:
+    """이 프로세스와 종료된 자식 프로세스(ffmpeg 등) 중 최대 RSS (Linux ru_maxrss 단위는 KB)"""
+    return max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss) / 1024
+
+def run_fixture(video_path: str, repeat: int, thread_profile: str, fixture_segments: bool):
+    """자식 프로세스: 한 영상을 repeat회 분석하고 원시 측정값을 JSON 한 줄로 출력합니다."""
+    from analyzer_small import build_batch_analyzer
+    from core.utils.thread_budget import ThreadBudget
+
+    meta = load_fixture_meta(video_path)
+    thread_budget = ThreadBudget.for_profile(thread_profile)
+    batch_analyzer = build_batch_analyzer(api_key="", thread_budget=thread_budget)
+    load_started = time.perf_counter()
+    batch_analyzer.load_models()
+    model_load_seconds = time.perf_counter() - load_started
+    stub_gemini(batch_analyzer)
+    if fixture_segments:
+        # 합성 음성은 STT가 인식하지 못할 수 있으므로, 생성 시 기록한 발화 구간을 그대로 사용해 세그먼트 단계를 측정합니다.
+        batch_analyzer.speech_segmenter.get_speech_segments = lambda audio_path: [dict(segment) for segment in meta["segments"]]
+
+    extracted_frames = [0]
+    extract_frames = batch_analyzer.extract_frames
+    def counting_extract_frames(*args, **kwargs):
+        frames = extract_frames(*args, **kwargs)
+        extracted_frames[0] += len(frames)
+        return frames
+    batch_analyzer.extract_frames = counting_extract_frames
+
+    runs = []
+    for _ in range(repeat):
+        extracted_frames[0] = 0
+        with tempfile.TemporaryDirectory() as output_dir:
+            result = batch_analyzer.analyze(video_path, output_dir=output_dir)
+        runs.append({
+            "overall": result["performance"]["overall_processing"],
+            "segments": result["performance"]["segment_processing"],
+            "frames": extracted_frames[0],
+        })
+    print(json.dumps({
+        "model_load_seconds": model_load_seconds,
+        "runs": runs,
+        "thread_budget": thread_budget.as_dict(),
+        "peak_rss_mb": peak_rss_mb(),
+    }))
+
+def summarize(raw: Dict[str, Any], meta: Dict[str, Any]) -> Dict[str, Any]:
+    """원시 측정값을 단계별 p50/p95와 처리량 지표로 요약합니다."""
+    stages = {}
+    for stage in OVERALL_STAGES:
+        values = [run["overall"][stage] for run in raw["runs"] if stage in run["overall"]]
+        if values:
+            stages[stage] = {"p50": percentile(values, 0.5), "p95": percentile(values, 0.95), "count": len(values)}
+    for stage in SEGMENT_STAGES:
+        values = [segment[stage] for run in raw["runs"] for segment in run["segments"] if stage in segment]
+        if values:
+            stages[stage] = {"p50": percentile(values, 0.5), "p95": percentile(values, 0.95), "count": len(values)}
+
+    total_frames = sum(run["frames"] for run in raw["runs"])
+    image_seconds = sum(segment.get("image_analysis_seconds", 0.0) for run in raw["runs"] for segment in run["segments"])
+    total_p50 = stages.get("total_elapsed_seconds", {}).get("p50", 0.0)
+    return {
+        "video": {key: meta[key] for key in ("duration_seconds", "width", "height", "fps", "seed")},
+        "speech_segments": len(meta["segments"]),
+        "segments_analyzed_per_run": [len(run["segments"]) for run in raw["runs"]],
+        "model_load_seconds": raw["model_load_seconds"],
+        "stages": stages,
+        "frames_per_second": total_frames / image_seconds if image_seconds else 0.0,
+        "real_time_factor": total_p50 / meta["duration_seconds"],
+        "peak_rss_mb": raw["peak_rss_mb"],
+        "thread_budget": raw["thread_budget"],
+    }
+
+def git_commit() -> str:
+    result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True)
+    return result.stdout.strip() if result.returncode == 0 else "unknown"
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], max_regression: float) -> List[str]:
+    """baseline 대비 p50이 max_regression 비율 이상 증가한 (영상, 단계) 목록을 반환합니다."""
+    regressions = []
+    for name, result in current["results"].items():
+        baseline_result = baseline.get("results", {}).get(name)
+        if not baseline_result:
+            continue
+        for stage, stats in result["stages"].items():
+            before = baseline_result["stages"].get(stage, {}).get("p50")
+            if before is None or before < MIN_COMPARABLE_SECONDS:
+                continue
+            change = stats["p50"] / before - 1
+            print(f"  {name:<36} {stage:<32} {before:8.3f}s -> {stats['p50']:8.3f}s ({change:+.1%})")
+            if change > max_regression:
+                regressions.append(f"{name}/{stage}")
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="영상 분석 파이프라인 end-to-end 벤치마크")
+    parser.add_argument('--durations', type=float, nargs='+', default=[10, 30, 60], help='합성 영상 길이(초) 목록')
+    parser.add_argument('--resolutions', nargs='+', default=['640x480', '1280x720'], help='합성 영상 해상도 목록 (WxH)')
+    parser.add_argument('--seed', type=int, default=0, help='합성 영상 seed')
+    parser.add_argument('--repeat', type=int, default=3, help='영상별 분석 반복 횟수')
+    parser.add_argument('--thread-profile', default='latency', help='스레드 프로파일 (latency | throughput)')
+    parser.add_argument('--fixture-segments', action='store_true',
+                        help='STT 대신 합성 시 기록한 발화 구간 사용 (세그먼트 단계를 항상 측정)')
+    parser.add_argument('--fixture-dir', type=Path, default=DEFAULT_FIXTURE_DIR, help='합성 영상 캐시 위치')
+    parser.add_argument('--output', type=Path, help='결과 JSON 경로 (기본: benchmarks/results/pipeline_<시각>.json)')
+    parser.add_argument('--compare', type=Path, help='비교할 이전 결과 JSON')
+    parser.add_argument('--max-regression', type=float, default=0.2, help='허용하는 p50 증가 비율')
+    parser.add_argument('--_child', nargs=4, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(BACKEND_DIR))
+    if args._child:
+        video_path, repeat, thread_profile, fixture_segments = args._child
+        run_fixture(video_path, int(repeat), thread_profile, fixture_segments == "1")
+        sys.exit(0)
+
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": git_commit(),
+        "host": {"python": platform.python_version(), "machine": platform.machine(), "cpus": os.cpu_count()},
+        "settings": {"repeat": args.repeat, "thread_profile": args.thread_profile, "fixture_segments": args.fixture_segments},
+        "results": {},
+    }
+    failed = False
+    for duration in args.durations:
+        for resolution in args.resolutions:
+            video_path = generate_fixture(duration, *parse_resolution(resolution), seed=args.seed, fixture_dir=args.fixture_dir)
+            meta = load_fixture_meta(video_path)
+            child = subprocess.run(
+                [sys.executable, __file__, '--_child', str(video_path), str(args.repeat), args.thread_profile,
+                 "1" if args.fixture_segments else "0"],
+                cwd=BACKEND_DIR, capture_output=True, text=True
+            )
+            if child.returncode != 0:
+                failed = True
+                print(f"[FAIL] {meta['name']}: exit {child.returncode}\n{child.stderr[-2000:]}")
+                continue
+            result = summarize(json.loads(child.stdout.strip().splitlines()[-1]), meta)
+            report["results"][meta["name"]] = result
+            total = result["stages"].get("total_elapsed_seconds", {})
+            print(f"{meta['name']:<36} total p50={total.get('p50', 0):7.2f}s p95={total.get('p95', 0):7.2f}s  "
+                  f"RTF={result['real_time_factor']:5.2f}  frames/s={result['frames_per_second']:6.1f}  "
+                  f"peak RSS={result['peak_rss_mb']:7.0f}MB")
+
+    output = args.output or RESULTS_DIR / f"pipeline_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, ensure_ascii=False, indent=2))
+    print(f"결과 저장: {output}")
+
+    if args.compare:
+        print(f"{args.compare} 대비 p50 변화:")
+        regressions = compare(report, json.loads(args.compare.read_text()), args.max_regression)
+        if regressions:
+            failed = True
+            print(f"[FAIL] {args.max_regression:.0%} 이상 느려진 단계: {', '.join(regressions)}")
+
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,76 @@
+# ./benchmarks/bench_process_raw_analysis.py
+
+import argparse
+import random
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from collections import defaultdict
+from core.services.data_service import _mean_distribution, _process_raw_analysis_data
+
+EMOTION_LABELS = ['기쁨', '당황', '분노', '불안', '상처', '슬픔', '중립']
+
+def make_segments(num_segments: int, seed: int = 0) -> list:
+    """analyzer.py 출력 형식과 동일한 구조의 합성 세그먼트 리스트를 생성합니다."""
+    rng = random.Random(seed)
+    segments = []
+    for i in range(num_segments):
+        segments.append({
+            "segment_id": i + 1,
+            "start_time": i * 5.0,
+            "end_time": i * 5.0 + 5.0,
+            "transcribed_text": "오늘은 조금 피곤했지만 괜찮은 하루였어요.",
+            "visual_analysis": {
+                "dominant_emotion": rng.choice(EMOTION_LABELS),
+                "distribution": {e: rng.random() for e in EMOTION_LABELS}
+            },
+            "audio_analysis": {
+                "text_based_analysis": {
+                    "sentiment": {"긍정": rng.random(), "부정": rng.random()},
+                    "emotions": {e: rng.random() for e in EMOTION_LABELS}
+                },
+                "voice_based_analysis": {"distribution": {e: rng.random() for e in EMOTION_LABELS}}
+            }
+        })
+    return segments
+
+def reference_mean_distribution(distributions: list) -> dict:
+    """NumPy 도입 전 구현: 감정별로 세그먼트 순서대로 더한 뒤 세그먼트 수로 나눕니다."""
+    sums = defaultdict(float)
+    for distribution in distributions:
+        for emotion, score in distribution.items():
+            sums[emotion] += score
+    return {emotion: total / len(distributions) for emotion, total in sums.items()} if distributions else {}
+
+def check_equivalence(num_cases: int = 300, seed: int = 0) -> int:
+    """임의 입력(감정 누락 포함)에서 _mean_distribution이 기존 구현과 비트 단위로 같은지 확인하고, 다른 경우의 수를 반환합니다."""
+    rng = random.Random(seed)
+    mismatches = 0
+    for _ in range(num_cases):
+        distributions = [
+            {e: rng.random() for e in EMOTION_LABELS if rng.random() > 0.1}
+            for _ in range(rng.randint(1, 200))
+        ]
+        if _mean_distribution(distributions) != reference_mean_distribution(distributions):
+            mismatches += 1
+    return mismatches
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="_process_raw_analysis_data 처리 시간 벤치마크")
+    parser.add_argument('--segments', type=int, nargs='+', default=[10, 100, 1000], help='세그먼트 개수 목록')
+    parser.add_argument('--repeat', type=int, default=5, help='반복 측정 횟수')
+    parser.add_argument('--number', type=int, default=20, help='측정당 호출 횟수')
+    args = parser.parse_args()
+
+    for num_segments in args.segments:
+        analysis_data = {"segment_analyses": make_segments(num_segments)}
+        runs = timeit.repeat(lambda: _process_raw_analysis_data(analysis_data), repeat=args.repeat, number=args.number)
+        best_ms = min(runs) / args.number * 1000
+        print(f"segments={num_segments:>6}  best={best_ms:8.3f} ms/call")
+
+    mismatches = check_equivalence()
+    print(f"기존 구현과 평균이 다른 입력: {mismatches}/300")
+    sys.exit(1 if mismatches else 0)
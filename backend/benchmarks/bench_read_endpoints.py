@@ -0,0 +1,85 @@
+# ./benchmarks/bench_read_endpoints.py
+# 읽기 API를 여러 스레드로 반복 호출하여 처리량/지연시간과 커넥션 풀 재사용 지표를 측정합니다.
+# 사용법: DATABASE_URL=postgresql://... python benchmarks/bench_read_endpoints.py --threads 8 --requests 200
+#         풀 미사용과 비교: ... python benchmarks/bench_read_endpoints.py --poolclass null
+
+import argparse
+import os
+import sys
+import threading
+import time
+import uuid
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+def percentile(values: list, ratio: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * ratio))]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="읽기 API 부하 및 커넥션 풀 재사용 벤치마크")
+    parser.add_argument('--threads', type=int, default=8, help='동시 요청 스레드 수')
+    parser.add_argument('--requests', type=int, default=200, help='스레드당 요청 수')
+    parser.add_argument('--reports', type=int, default=10, help='미리 저장할 리포트 개수')
+    parser.add_argument('--poolclass', choices=['queue', 'null'], default=None, help='DB_POOLCLASS 환경 변수 대신 사용할 풀 종류')
+    args = parser.parse_args()
+
+    # database 모듈이 임포트되기 전에 설정해야 엔진에 반영됩니다.
+    if args.poolclass:
+        os.environ['DB_POOLCLASS'] = args.poolclass
+    os.chdir(Path(__file__).resolve().parent.parent)
+
+    import app as feellog_app
+    from core.models.database import db_session
+    from core.utils.db_pool_metrics import pool_metrics
+    from count_trend_queries import seed_reports
+
+    nickname = f"bench_{uuid.uuid4().hex[:8]}"
+    email = f"{nickname}@bench.local"
+    user = feellog_app.auth_service.create_user_with_auth(email, "bench", nickname, True, False)
+    seed_reports(feellog_app.data_service, user.user_id, args.reports)
+    db_session.remove()
+
+    today = date.today()
+    paths = [
+        '/api/dashboard',
+        '/api/reports/latest',
+        f'/api/trends/monthly?year={today.year}&month={today.month}',
+        '/api/records/latest-status',
+    ]
+
+    latencies = []
+    errors = []
+    latencies_lock = threading.Lock()
+
+    def worker():
+        client = feellog_app.app.test_client()
+        client.post('/api/login_email', json={"email": email, "password": "bench"})
+        local_latencies = []
+        for i in range(args.requests):
+            start = time.perf_counter()
+            response = client.get(paths[i % len(paths)])
+            local_latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                errors.append(response.status_code)
+        with latencies_lock:
+            latencies.extend(local_latencies)
+
+    pool_metrics.reset()
+    threads = [threading.Thread(target=worker) for _ in range(args.threads)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    metrics = pool_metrics.snapshot()
+    print(f"poolclass={os.environ.get('DB_POOLCLASS', 'queue')} threads={args.threads} requests={len(latencies)} errors={len(errors)}")
+    print(f"throughput={len(latencies) / elapsed:8.1f} req/s  p50={percentile(latencies, 0.5) * 1000:7.2f} ms  p95={percentile(latencies, 0.95) * 1000:7.2f} ms")
+    print(f"connects={metrics['connects']} checkouts={metrics['checkouts']} "
+          f"reuse={1 - metrics['connects'] / max(metrics['checkouts'], 1):.1%} "
+          f"wait_avg={metrics['wait_seconds_total'] / max(metrics['wait_count'], 1) * 1000:.3f} ms "
+          f"wait_max={metrics['wait_seconds_max'] * 1000:.3f} ms timeouts={metrics['timeouts']}")
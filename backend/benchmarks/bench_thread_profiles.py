@@ -0,0 +1,96 @@
+# ./benchmarks/bench_thread_profiles.py
+# 고정된 영상 하나로 스레드 프로파일(latency/throughput)별 BatchVideoAnalyzer.analyze 시간을 측정합니다.
+# --concurrency N이면 N개 프로세스가 같은 영상을 동시에 분석하여, 작업당 시간과 전체 처리량(jobs/min)을 비교합니다.
+# 모델 로드 시간은 제외하며, 텍스트 감정 분석(Gemini API)은 네트워크 지연이라 중립 결과로 대체합니다.
+# --video를 생략하면 benchmarks/fixtures.py의 합성 영상(30초, 640x480)을 사용합니다.
+# 사용법: python benchmarks/bench_thread_profiles.py --video sample.mp4 --concurrency 1 2 4
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from fixtures import generate_fixture, stub_gemini
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+def run_job(video: str, profile: str, concurrency: int, start_at: float):
+    """자식 프로세스: 모델을 로드한 뒤 start_at 시각에 맞춰 분석을 시작하고 결과를 JSON 한 줄로 출력합니다."""
+    from analyzer_small import build_batch_analyzer
+    from core.utils.thread_budget import ThreadBudget
+
+    thread_budget = ThreadBudget.for_profile(profile, concurrency=concurrency)
+    batch_analyzer = build_batch_analyzer(api_key="", thread_budget=thread_budget)
+    batch_analyzer.load_models()
+    stub_gemini(batch_analyzer)
+
+    time.sleep(max(0.0, start_at - time.time())) # 동시 실행 작업들이 모델 로드를 마친 뒤 함께 시작
+    with tempfile.TemporaryDirectory() as output_dir:
+        started = time.perf_counter()
+        result = batch_analyzer.analyze(video, output_dir=output_dir)
+        elapsed = time.perf_counter() - started
+    print(json.dumps({
+        "elapsed_seconds": elapsed,
+        "segments": result.get("total_segments", 0),
+        "stages": result["performance"]["overall_processing"],
+        "thread_budget": thread_budget.as_dict(),
+    }))
+
+def run_profile(video: str, profile: str, concurrency: int, warmup_seconds: float) -> dict:
+    start_at = time.time() + warmup_seconds
+    processes = [
+        subprocess.Popen(
+            [sys.executable, __file__, '--video', video, '--_child', profile, str(concurrency), str(start_at)],
+            cwd=BACKEND_DIR, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+        )
+        for _ in range(concurrency)
+    ]
+    jobs = []
+    for process in processes:
+        stdout, stderr = process.communicate()
+        if process.returncode != 0:
+            raise RuntimeError(f"분석 프로세스 실패 (exit {process.returncode}):\n{stderr[-2000:]}")
+        jobs.append(json.loads(stdout.strip().splitlines()[-1]))
+    makespan = max(job["elapsed_seconds"] for job in jobs)
+    return {
+        "mean_job_seconds": sum(job["elapsed_seconds"] for job in jobs) / len(jobs),
+        "makespan_seconds": makespan,
+        "jobs_per_minute": len(jobs) * 60 / makespan,
+        "thread_budget": jobs[0]["thread_budget"],
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="스레드 프로파일별 분석 시간 비교")
+    parser.add_argument('--video', help='측정에 사용할 고정 영상 경로 (기본: 합성 영상)')
+    parser.add_argument('--profiles', nargs='+', default=['latency', 'throughput'], help='비교할 스레드 프로파일')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 2], help='동시에 분석할 작업 수 목록')
+    parser.add_argument('--warmup-seconds', type=float, default=120.0, help='모델 로드를 기다릴 시간(초)')
+    parser.add_argument('--_child', nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(BACKEND_DIR))
+    video = str(Path(args.video).resolve()) if args.video else str(generate_fixture(30, 640, 480))
+    if args._child:
+        profile, concurrency, start_at = args._child
+        run_job(video, profile, int(concurrency), float(start_at))
+        sys.exit(0)
+
+    failed = False
+    print(f"{'jobs':>4} {'profile':<11} {'torch/cv/stt/ffmpeg':<20} {'job(s)':>8} {'makespan(s)':>11} {'jobs/min':>9}")
+    for concurrency in args.concurrency:
+        for profile in args.profiles:
+            try:
+                result = run_profile(video, profile, concurrency, args.warmup_seconds)
+            except RuntimeError as e:
+                failed = True
+                print(f"{concurrency:>4} {profile:<11} {e}")
+                continue
+            budget = result["thread_budget"]
+            threads = f"{budget['torch']}/{budget['opencv']}/{budget['stt']}/{budget['ffmpeg']}"
+            print(f"{concurrency:>4} {profile:<11} {threads:<20} {result['mean_job_seconds']:8.1f} "
+                  f"{result['makespan_seconds']:11.1f} {result['jobs_per_minute']:9.2f}")
+
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,46 @@
+# ./benchmarks/bench_worker_memory.py
+# analysis_worker.py를 워커 수/모델 공유 여부별로 실행하여, 모델 로드 직후의 전체 RSS/PSS/USS를 비교합니다.
+# - preload: 부모에서 모델을 로드한 뒤 fork (가중치 copy-on-write 공유)
+# - no-preload: 워커마다 모델을 따로 로드 (기존처럼 프로세스별 사본)
+# 사용법: python benchmarks/bench_worker_memory.py --workers 1 2 4
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+def run_config(workers: int, preload: bool, thread_profile: str) -> dict:
+    command = [sys.executable, 'analysis_worker.py', '--workers', str(workers), '--thread-profile', thread_profile, '--memory-report']
+    if not preload:
+        command.append('--no-preload')
+    result = subprocess.run(command, cwd=BACKEND_DIR, capture_output=True, text=True)
+    for line in result.stdout.splitlines():
+        if line.startswith('MEMORY_REPORT '):
+            return json.loads(line[len('MEMORY_REPORT '):])
+    raise RuntimeError(f"메모리 리포트를 찾을 수 없습니다 (exit {result.returncode}):\n{result.stderr[-2000:]}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="분석 워커 구성별 메모리 비교")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4], help='측정할 워커 수 목록')
+    parser.add_argument('--thread-profile', default='throughput', help='워커 스레드 프로파일 (latency | throughput)')
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'workers':>7} {'mode':<11} {'torch':>7} {'RSS(MB)':>10} {'PSS(MB)':>10} {'USS(MB)':>10}")
+    for workers in args.workers:
+        for preload in (True, False):
+            try:
+                report = run_config(workers, preload, args.thread_profile)
+            except RuntimeError as e:
+                failed = True
+                print(f"{workers:>7} {'preload' if preload else 'no-preload':<11} {e}")
+                continue
+            total = report["total"]
+            failed = failed or report["ready"] != workers
+            print(f"{workers:>7} {'preload' if preload else 'no-preload':<11} {report['thread_budget']['torch']:>7} "
+                  f"{total['rss']:10.1f} {total['pss']:10.1f} {total['uss']:10.1f}")
+
+    sys.exit(1 if failed else 0)
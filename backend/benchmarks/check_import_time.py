@@ -0,0 +1,77 @@
+# ./benchmarks/check_import_time.py
+# analyzer 진입점의 임포트 시간을 `python -X importtime`으로 측정하여 예산을 넘거나
+# 무거운 모듈(torch, cv2 등)이 모듈 로드 시점에 임포트되면 실패(exit 1)합니다.
+# 사용법: python benchmarks/check_import_time.py [--budget-ms 400] [--repeat 3]
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# 모듈 로드 시점에 임포트되면 안 되는 패키지 (해당 단계가 실행될 때만 임포트)
+HEAVY_MODULES = (
+    'torch', 'torchvision', 'torchaudio', 'transformers', 'cv2', 'moviepy',
+    'faster_whisper', 'google.generativeai', 'flask',
+)
+
+TARGETS = (
+    'analyzer',
+    'analyzer_small',
+    'analysis_worker',
+    'core.analyzer.video_analyzer',
+    'core.analyzer.video_analyzer_small',
+    'core.analyzer.audio_analyzer',
+    'core.analyzer.audio_analyzer_small',
+    'core.analyzer.speech_segmenter',
+    'core.analyzer.gemini_sentiment_aggregator',
+)
+
+def measure(module: str) -> Tuple[float, List[str]]:
+    """새 인터프리터에서 module을 임포트하고 (누적 임포트 시간 ms, 임포트된 모듈 이름 목록)을 반환합니다."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=BACKEND_DIR, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{module} 임포트 실패:\n{result.stderr[-2000:]}")
+
+    total_us = 0
+    imported = []
+    for line in result.stderr.splitlines():
+        # 형식: "import time:      self [us] |  cumulative | imported package"
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        imported.append(name.strip())
+        if name.strip() == module and not name[1:].startswith(' '):
+            total_us = int(cumulative)
+    return total_us / 1000, imported
+
+def heavy_imports(imported: List[str]) -> List[str]:
+    return sorted({name for name in imported for heavy in HEAVY_MODULES if name == heavy or name.startswith(heavy + '.')})
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="analyzer 임포트 시간 회귀 검사")
+    parser.add_argument('--budget-ms', type=float, default=400.0, help='모듈별 임포트 시간 예산(ms)')
+    parser.add_argument('--repeat', type=int, default=3, help='측정 반복 횟수 (최솟값 사용)')
+    parser.add_argument('--targets', nargs='+', default=list(TARGETS), help='검사할 모듈 목록')
+    args = parser.parse_args()
+
+    failed = False
+    for module in args.targets:
+        try:
+            best_ms, imported = min((measure(module) for _ in range(args.repeat)), key=lambda run: run[0])
+        except RuntimeError as e:
+            failed = True
+            print(f"[FAIL] {module:<45} {e}")
+            continue
+        heavy = heavy_imports(imported)
+        ok = best_ms <= args.budget_ms and not heavy
+        failed = failed or not ok
+        print(f"[{'OK' if ok else 'FAIL'}] {module:<45} {best_ms:8.1f} ms  modules={len(imported):>4}"
+              + (f"  heavy={','.join(heavy)}" if heavy else ""))
+
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,78 @@
+# ./benchmarks/count_trend_queries.py
+# 월간 트렌드 조회의 SQL 실행 횟수가 리포트 개수와 무관하게 고정인지 확인합니다.
+# 일간 집계가 없는 경우(백필 전)도 측정하며, 이때도 횟수가 고정이고 읽기 요청이 아무것도 쓰지 않아야 합니다.
+# 사용법: DATABASE_URL=postgresql://... python benchmarks/count_trend_queries.py --reports 1 10 50
+
+import argparse
+import sys
+import uuid
+from contextlib import contextmanager
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import event
+from core.models.database import db_session, engine
+import core.models.analysis
+import core.models.image_url
+from core.models.emotion_rollup import EmotionDailyRollup
+from core.services.auth_service import AuthService
+from core.services.data_service import DataService
+from core.utils.date_range import month_range
+from bench_process_raw_analysis import make_segments
+
+@contextmanager
+def count_queries():
+    """블록 안에서 실행된 SQL 문 개수를 세는 컨텍스트 매니저."""
+    statements = []
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _before_cursor_execute)
+
+def seed_reports(data_service: DataService, user_id, num_reports: int):
+    """num_reports개의 분석 결과를 저장합니다."""
+    for i in range(num_reports):
+        record_id = data_service.save_video_record(user_id, f"./uploads/{user_id}/bench_{i}.mp4")
+        analysis_data = {"segment_analyses": make_segments(3, seed=i)}
+        card = {"sentiment_score": 50, "dominant_overall_emotion": "중립", "emotion_distribution": []}
+        data_service.save_analysis_results(user_id, record_id, analysis_data, {"card": card, "detail": analysis_data, "summary": {}})
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="월간 트렌드 조회 쿼리 수 측정")
+    parser.add_argument('--reports', type=int, nargs='+', default=[1, 10, 50], help='사용자별 리포트 개수 목록')
+    args = parser.parse_args()
+
+    data_service = DataService()
+    today = date.today()
+    counts = {}
+    fallback_counts = {}
+    for num_reports in args.reports:
+        nickname = f"bench_{uuid.uuid4().hex[:8]}"
+        user_id = AuthService().create_user_with_auth(f"{nickname}@bench.local", "bench", nickname, True, False).user_id
+        seed_reports(data_service, user_id, num_reports)
+        db_session.remove()
+
+        with count_queries() as statements:
+            _, daily_rollups = data_service.get_monthly_trend_source(user_id, month_range(today.year, today.month))
+        counts[num_reports] = len(statements)
+        db_session.remove()
+
+        # 집계 행을 지운 뒤(백필 전 상태) 다시 조회
+        db_session.query(EmotionDailyRollup).filter(EmotionDailyRollup.rollup_user_id == user_id).delete()
+        db_session.commit()
+        with count_queries() as fallback_statements:
+            _, computed_rollups = data_service.get_monthly_trend_source(user_id, month_range(today.year, today.month))
+        fallback_counts[num_reports] = len(fallback_statements)
+        writes = [statement for statement in fallback_statements if not statement.lstrip().upper().startswith("SELECT")]
+        if writes or computed_rollups != daily_rollups:
+            fallback_counts[num_reports] = -1
+        print(f"reports={num_reports:>5}  queries={len(statements)}  without_rollups={len(fallback_statements)}  writes={len(writes)}")
+        db_session.remove()
+
+    ok = len(set(counts.values())) == 1 and len(set(fallback_counts.values())) == 1 and -1 not in fallback_counts.values()
+    sys.exit(0 if ok else 1)
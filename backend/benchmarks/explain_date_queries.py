@@ -0,0 +1,118 @@
+# ./benchmarks/explain_date_queries.py
+# DataService/ChatbotService의 날짜 범위 조회가 실제로 실행하는 SQL을 가로채어 플래너 기본 설정으로 EXPLAIN하고,
+# 날짜 조건이 (user_id, created DESC) 복합 인덱스의 Index Cond로 처리되는지 확인합니다. (Seq Scan이거나 Filter로 처리되면 실패)
+# 테이블이 작으면 플래너가 Seq Scan을 고르므로, 여러 사용자의 레코드/분석/리포트를 한 트랜잭션 안에서 만들고 ANALYZE한 뒤 확인하며,
+# 끝나면 롤백하므로 DB에 데이터가 남지 않습니다.
+# 사용법: DATABASE_URL=postgresql://... python benchmarks/explain_date_queries.py --users 200 --reports-per-user 100
+
+import argparse
+import sys
+import uuid
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import event, text
+from core.models.database import db_session, engine, register_models
+from core.services.chatbot_service import ChatbotService
+from core.services.data_service import DataService
+from core.utils.date_range import month_range, week_range
+
+SEED_SQL = """
+WITH users AS (
+    INSERT INTO user_tbl (user_email, user_nickname, user_agree_privacy, user_agree_alarm)
+    SELECT 'explain_' || :tag || '_' || u || '@bench.local', 'explain_' || :tag || '_' || u, true, false
+    FROM generate_series(1, :users) AS u
+    RETURNING user_id
+), records AS (
+    INSERT INTO records_tbl (record_user_id, record_created, record_video_path, record_seconds, record_analysis_status)
+    SELECT user_id, now() - n * interval '7 hours', 'bench.mp4', 10, 'completed'
+    FROM users, generate_series(1, :per_user) AS n
+    RETURNING record_id, record_user_id, record_created
+), analyses AS (
+    INSERT INTO analysis_tbl (analysis_record_id, analysis_face_emotions_rates, analysis_voice_emotions_rates,
+                              analysis_face_emotions_score, analysis_voice_emotions_score, analysis_majority_emotion)
+    SELECT record_id, '{}', '{}', '{}', '{}', '{}' FROM records
+    RETURNING analysis_id, analysis_record_id
+)
+INSERT INTO report_tbl (report_analysis_id, report_user_id, report_created, report_detail, report_summary, report_card)
+SELECT a.analysis_id, r.record_user_id, r.record_created, '{}',
+       '{"overall_score": 50, "dominant_emotion": "중립"}', '{"sentiment_score": 50, "dominant_overall_emotion": "중립"}'
+FROM analyses a JOIN records r ON r.record_id = a.analysis_record_id
+"""
+
+def seed(num_users: int, per_user: int):
+    """현재 트랜잭션에 사용자 num_users명 x 리포트 per_user개를 만들고 통계를 갱신한 뒤, 조회 대상 사용자 id를 반환합니다."""
+    tag = uuid.uuid4().hex[:8]
+    db_session.execute(text(SEED_SQL), {"tag": tag, "users": num_users, "per_user": per_user})
+    for table in ("user_tbl", "records_tbl", "analysis_tbl", "report_tbl"):
+        db_session.execute(text(f"ANALYZE {table}"))
+    return db_session.execute(text("SELECT user_id FROM user_tbl WHERE user_nickname = :nickname"),
+                              {"nickname": f"explain_{tag}_1"}).scalar()
+
+def capture(call) -> list:
+    """call()이 드라이버로 보낸 (SQL, 파라미터) 목록을 반환합니다."""
+    captured = []
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    try:
+        call()
+    finally:
+        event.remove(engine, "before_cursor_execute", _before_cursor_execute)
+    return captured
+
+def explain(statement: str, parameters) -> str:
+    """드라이버에 전달된 SQL과 파라미터 그대로 EXPLAIN합니다."""
+    rows = db_session.connection().exec_driver_sql(f"EXPLAIN {statement}", parameters).fetchall()
+    return "\n".join(row[0] for row in rows)
+
+def index_conditions(plan: str) -> list:
+    """EXPLAIN 결과에서 'Index Cond:' 줄의 조건식만 모아 반환합니다. (Filter 줄은 제외)"""
+    return [line.split("Index Cond:", 1)[1].strip() for line in plan.splitlines() if "Index Cond:" in line]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="날짜 범위 조회의 실제 SQL에 대한 EXPLAIN 확인")
+    parser.add_argument('--users', type=int, default=200, help='만들 사용자 수')
+    parser.add_argument('--reports-per-user', type=int, default=100, help='사용자당 리포트 수 (7시간 간격)')
+    args = parser.parse_args()
+
+    register_models()
+    data_service = DataService()
+    chatbot_service = ChatbotService()
+    today = date.today()
+    try:
+        user_id = seed(args.users, args.reports_per_user)
+
+        # (이름, 서비스 호출, 확인할 테이블, Index Cond에 있어야 하는 컬럼)
+        cases = [
+            ("get_reports_by_date", lambda: data_service.get_reports_by_date(user_id, today), "report_tbl", "report_created"),
+            ("get_reports_in_range(week)", lambda: data_service.get_reports_in_range(user_id, week_range(today)).all(), "report_tbl", "report_created"),
+            ("get_monthly_trend_source", lambda: data_service.get_monthly_trend_source(user_id, month_range(today.year, today.month)), "report_tbl", "report_created"),
+            ("get_report_window_summary", lambda: data_service.get_report_window_summary(user_id, datetime.now() - timedelta(days=7)), "report_tbl", "report_created"),
+            ("get_card_emotions_in_range", lambda: data_service.get_card_emotions_in_range(user_id, month_range(today.year, today.month), limit=10), "report_tbl", "report_created"),
+            ("past_emotions('어제 감정 어땠어?')", lambda: chatbot_service._get_past_emotions_summary(user_id, "어제 감정 어땠어?"), "report_tbl", "report_created"),
+            ("past_emotions('지난주 감정 알려줘')", lambda: chatbot_service._get_past_emotions_summary(user_id, "지난주 감정 알려줘"), "report_tbl", "report_created"),
+            ("get_latest_record_status", lambda: data_service.get_latest_record_status(user_id), "records_tbl", "record_user_id"),
+        ]
+
+        failed = False
+        for name, call, table, expected_column in cases:
+            statements = [(sql, params) for sql, params in capture(call) if f"FROM {table}" in sql]
+            if not statements:
+                failed = True
+                print(f"[FAIL] {name}: {table}를 조회하는 SQL이 실행되지 않았습니다.\n")
+                continue
+            for sql, params in statements:
+                plan = explain(sql, params)
+                # 컬럼이 Filter가 아닌 Index Cond 안에 있어야 인덱스 범위 스캔으로 처리된 것입니다.
+                uses_index = (f"Seq Scan on {table}" not in plan
+                              and any(expected_column in condition for condition in index_conditions(plan)))
+                failed = failed or not uses_index
+                print(f"[{'OK' if uses_index else 'FAIL'}] {name}\n{plan}\n")
+    finally:
+        db_session.rollback()
+        db_session.remove()
+
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,133 @@
+# ./benchmarks/fixtures.py
+# 벤치마크용 합성 영상 생성기와 공용 헬퍼.
+# 말하는 얼굴을 흉내 낸 그림(입 모양이 음량에 맞춰 움직임)과, TTS 없이 합성한 모음 발화(배음 + 포먼트 + 음절 단위 진폭 변조)를
+# 발화/침묵 구간이 번갈아 나오도록 만듭니다. 같은 seed면 항상 같은 영상이 생성되므로 측정 간 비교가 가능합니다.
+# 사용법: python benchmarks/fixtures.py --durations 10 30 --resolutions 640x480 1280x720
+
+import argparse
+import json
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+DEFAULT_FIXTURE_DIR = Path(tempfile.gettempdir()) / "feellog_bench_fixtures"
+AUDIO_SAMPLE_RATE = 16000
+VIDEO_FPS = 25
+# 모음별 (F1, F2) 포먼트 주파수(Hz)
+VOWEL_FORMANTS = [(730, 1090), (270, 2290), (300, 870), (530, 1840), (570, 840)]
+NEUTRAL_TEXT_RESULT = {
+    "sentiment": {"긍정": 0.0, "부정": 0.0},
+    "emotions": {"기쁨": 0.0, "당황": 0.0, "분노": 0.0, "불안": 0.0, "상처": 0.0, "슬픔": 0.0, "중립": 1.0}
+}
+
+def parse_resolution(value: str) -> Tuple[int, int]:
+    width, height = value.lower().split('x')
+    return int(width), int(height)
+
+def fixture_name(duration: float, width: int, height: int, seed: int) -> str:
+    return f"synthetic_{int(duration)}s_{width}x{height}_seed{seed}"
+
+def speech_schedule(duration: float, rng: np.random.Generator) -> List[Dict[str, Any]]:
+    """0.5초부터 시작해 2~6초 발화와 0.8~1.5초 침묵이 번갈아 나오는 구간 목록 (SpeechSegmenter 출력 형식)"""
+    segments = []
+    cursor = 0.5
+    while cursor < duration - 1.0:
+        end = min(duration - 0.3, cursor + rng.uniform(2.0, 6.0))
+        segments.append({"start": round(cursor, 2), "end": round(end, 2), "text": ""})
+        cursor = end + rng.uniform(0.8, 1.5)
+    return segments
+
+def synthesize_speech(duration: float, segments: List[Dict[str, Any]], rng: np.random.Generator) -> np.ndarray:
+    """발화 구간마다 음절(약 4Hz) 단위로 모음과 피치를 바꿔 가며 배음을 합성한 모노 오디오 (-1.0 ~ 1.0)"""
+    audio = np.zeros(int(duration * AUDIO_SAMPLE_RATE), dtype=np.float32)
+    for segment in segments:
+        start, end = int(segment["start"] * AUDIO_SAMPLE_RATE), int(segment["end"] * AUDIO_SAMPLE_RATE)
+        syllable_length = AUDIO_SAMPLE_RATE // 4
+        for syllable_start in range(start, end, syllable_length):
+            length = min(syllable_length, end - syllable_start)
+            t = np.arange(length) / AUDIO_SAMPLE_RATE
+            f0 = rng.uniform(110, 220) * (1 + 0.05 * np.sin(2 * np.pi * 3 * t)) # 억양
+            f1, f2 = VOWEL_FORMANTS[rng.integers(len(VOWEL_FORMANTS))]
+            phase = 2 * np.pi * np.cumsum(f0) / AUDIO_SAMPLE_RATE
+            wave = np.zeros(length, dtype=np.float32)
+            for harmonic in range(1, 25):
+                frequency = f0.mean() * harmonic
+                gain = np.exp(-((frequency - f1) / 150) ** 2) + 0.7 * np.exp(-((frequency - f2) / 200) ** 2) + 0.02
+                wave += (gain / harmonic) * np.sin(harmonic * phase)
+            envelope = np.sin(np.pi * np.arange(length) / length) ** 0.5 # 음절 단위 진폭 변조
+            audio[syllable_start:syllable_start + length] += wave * envelope
+    audio += rng.normal(0, 0.003, audio.shape).astype(np.float32) # 배경 잡음
+    return audio / max(1e-6, np.abs(audio).max()) * 0.8
+
+def draw_face(frame: np.ndarray, mouth_open: float, t: float):
+    """피부색 타원 얼굴, 눈, 음량에 따라 열리는 입을 그립니다. (얼굴 탐지/크롭 단계의 입력용 자리표시자)"""
+    import cv2
+    height, width = frame.shape[:2]
+    center = (width // 2 + int(width * 0.02 * np.sin(t)), height // 2)
+    axes = (int(height * 0.22), int(height * 0.3))
+    cv2.ellipse(frame, center, axes, 0, 0, 360, (140, 170, 215), -1)
+    eye_y = center[1] - axes[1] // 4
+    for dx in (-axes[0] // 2, axes[0] // 2):
+        cv2.ellipse(frame, (center[0] + dx, eye_y), (axes[0] // 6, axes[0] // 10), 0, 0, 360, (255, 255, 255), -1)
+        cv2.circle(frame, (center[0] + dx, eye_y), axes[0] // 14, (40, 30, 20), -1)
+    mouth_center = (center[0], center[1] + axes[1] // 2)
+    cv2.ellipse(frame, mouth_center, (axes[0] // 3, max(2, int(axes[1] * 0.15 * mouth_open))), 0, 0, 360, (60, 40, 150), -1)
+
+def generate_fixture(duration: float, width: int, height: int, seed: int = 0, fixture_dir: Path = DEFAULT_FIXTURE_DIR) -> Path:
+    """합성 영상(mp4)과 메타데이터(json)를 생성하고 영상 경로를 반환합니다. 이미 있으면 재사용합니다."""
+    from moviepy import VideoClip
+    from moviepy.audio.AudioClip import AudioArrayClip
+
+    fixture_dir.mkdir(parents=True, exist_ok=True)
+    name = fixture_name(duration, width, height, seed)
+    video_path = fixture_dir / f"{name}.mp4"
+    meta_path = fixture_dir / f"{name}.json"
+    if video_path.exists() and meta_path.exists():
+        return video_path
+
+    rng = np.random.default_rng(seed)
+    segments = speech_schedule(duration, rng)
+    audio = synthesize_speech(duration, segments, rng)
+    hop = AUDIO_SAMPLE_RATE // VIDEO_FPS
+    loudness = np.array([np.abs(audio[i:i + hop]).mean() for i in range(0, len(audio), hop)])
+    loudness = loudness / max(1e-6, loudness.max())
+    background = np.tile(np.linspace(40, 90, width, dtype=np.uint8)[None, :, None], (height, 1, 3))
+    noise = np.random.default_rng(seed + 1).integers(0, 12, (height, width, 3), dtype=np.uint8)
+
+    def frame_function(t: float) -> np.ndarray:
+        frame = background + noise # 압축/디코딩 비용이 실제 영상과 비슷하도록 질감 추가
+        draw_face(frame, loudness[min(len(loudness) - 1, int(t * VIDEO_FPS))], t)
+        return np.ascontiguousarray(frame[:, :, ::-1]) # BGR(cv2) -> RGB(moviepy)
+
+    audio_clip = AudioArrayClip(np.stack([audio, audio], axis=1), fps=AUDIO_SAMPLE_RATE)
+    clip = VideoClip(frame_function=frame_function, duration=duration).with_audio(audio_clip)
+    tmp_path = video_path.with_name(f".{video_path.name}")
+    clip.write_videofile(str(tmp_path), fps=VIDEO_FPS, codec="libx264", audio_codec="aac", logger=None)
+    tmp_path.replace(video_path)
+    meta_path.write_text(json.dumps({
+        "name": name, "duration_seconds": duration, "width": width, "height": height, "fps": VIDEO_FPS,
+        "seed": seed, "segments": segments
+    }, ensure_ascii=False, indent=2))
+    return video_path
+
+def load_fixture_meta(video_path: Path) -> Dict[str, Any]:
+    return json.loads(Path(video_path).with_suffix('.json').read_text())
+
+def stub_gemini(batch_analyzer):
+    """텍스트 감정 분석(Gemini API)을 중립 결과로 대체합니다. 네트워크 지연/비용을 측정에서 제외하기 위함입니다."""
+    batch_analyzer.voice_analyzer.analyze_emotion_from_text = lambda text: NEUTRAL_TEXT_RESULT
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="벤치마크용 합성 영상 생성")
+    parser.add_argument('--durations', type=float, nargs='+', default=[10, 30, 60], help='영상 길이(초) 목록')
+    parser.add_argument('--resolutions', nargs='+', default=['640x480', '1280x720'], help='해상도 목록 (WxH)')
+    parser.add_argument('--seed', type=int, default=0, help='난수 seed')
+    parser.add_argument('--fixture-dir', type=Path, default=DEFAULT_FIXTURE_DIR, help='생성 위치')
+    args = parser.parse_args()
+
+    for duration in args.durations:
+        for resolution in args.resolutions:
+            path = generate_fixture(duration, *parse_resolution(resolution), seed=args.seed, fixture_dir=args.fixture_dir)
+            print(f"{path} ({len(load_fixture_meta(path)['segments'])} speech segments)")
@@ -0,0 +1,85 @@
+# ./benchmarks/load_test.py
+# 실행 중인 API 서버에 HTTP 부하를 주어 requests/sec와 지연시간을 측정합니다.
+# 개발 서버(flask run)와 프로덕션 서버(gunicorn)를 같은 조건으로 비교할 때 사용합니다.
+# 사용법:
+#   flask run --port 5000                               # 또는
+#   gunicorn -c gunicorn.conf.py wsgi:app
+#   python benchmarks/load_test.py --base-url http://localhost:5000 --email a@b.c --password pw --concurrency 16 --duration 20
+
+import argparse
+import threading
+import time
+from typing import Dict, List
+import requests
+
+DEFAULT_PATHS = ['/api/reports/latest', '/api/auth/status']
+
+def percentile(values: List[float], ratio: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * ratio))] if ordered else 0.0
+
+def login(base_url: str, email: str, password: str) -> requests.Session:
+    """로그인한 세션(쿠키 포함)을 반환합니다."""
+    http = requests.Session()
+    response = http.post(f"{base_url}/api/login_email", json={"email": email, "password": password}, timeout=10)
+    response.raise_for_status()
+    return http
+
+def run_path(base_url: str, path: str, cookies, concurrency: int, duration: float) -> Dict[str, float]:
+    """duration초 동안 concurrency개의 스레드가 path를 반복 호출합니다."""
+    latencies: List[float] = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker():
+        http = requests.Session() # 스레드마다 keep-alive 연결을 재사용
+        http.cookies.update(cookies)
+        local_latencies = []
+        local_errors = 0
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                response = http.get(f"{base_url}{path}", timeout=30)
+                if response.status_code != 200:
+                    local_errors += 1
+            except requests.exceptions.RequestException:
+                local_errors += 1
+            local_latencies.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local_latencies)
+            errors[0] += local_errors
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    return {
+        "requests": len(latencies),
+        "errors": errors[0],
+        "rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 0.5) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="API 서버 HTTP 부하 테스트")
+    parser.add_argument('--base-url', default='http://localhost:5000', help='API 서버 주소')
+    parser.add_argument('--email', required=True, help='로그인할 테스트 계정 이메일')
+    parser.add_argument('--password', required=True, help='로그인할 테스트 계정 비밀번호')
+    parser.add_argument('--paths', nargs='+', default=DEFAULT_PATHS, help='측정할 GET 경로 목록')
+    parser.add_argument('--concurrency', type=int, default=16, help='동시 요청 스레드 수')
+    parser.add_argument('--duration', type=float, default=20.0, help='경로별 측정 시간(초)')
+    args = parser.parse_args()
+
+    base_url = args.base_url.rstrip('/')
+    cookies = login(base_url, args.email, args.password).cookies
+    for path in args.paths:
+        result = run_path(base_url, path, cookies, args.concurrency, args.duration)
+        print(f"{path:<28} requests={result['requests']:>7} errors={result['errors']:>4} "
+              f"rps={result['rps']:8.1f}  p50={result['p50_ms']:7.2f} ms  p95={result['p95_ms']:7.2f} ms  p99={result['p99_ms']:7.2f} ms")
@@ -1,66 +1,88 @@
 # ./core/analyzer/audio_analyzer.py
 
-import google.generativeai as genai
-import torch
-from transformers import AutoConfig, Wav2Vec2ForSequenceClassification, HubertForSequenceClassification, AutoFeatureExtractor
 import json
-import torchaudio 
-import torchaudio.transforms as T
 import time
+from functools import cached_property
+from core.utils.tracing import span
 from typing import Dict, Any
 
+# google.generativeai/torch/transformers/torchaudio는 임포트 비용이 크므로 실제로 사용하는 시점에 임포트합니다.
+VOICE_MODEL_IDS = {
+    "wav2vec2": "jungjongho/wav2vec2-xlsr-korean-speech-emotion-recognition2_data_rebalance",
+    "hubert-base": "team-lucid/hubert-base-korean",
+    "wav2vec2_autumn": "inseong00/wav2vec2-large-xlsr-korean-autumn",
+}
+
 class VoiceAnalyzer: # 클래스 이름을 VoiceAnalyzer로 유지하되, 내부 역할 변경
     def __init__(self, api_key: str, voice_model_name: str = "wav2vec2", voice_model_weights_path: str = "infrastructure/models/wav2vec2.pth"):
         self.target_sr = 16000 # 오디오 리샘플링을 위한 목표 샘플링 레이트
-        genai.configure(api_key=api_key)
-        self.gemini_model = genai.GenerativeModel(
+        self.api_key = api_key
+        self.voice_model_weights_path = voice_model_weights_path
+        if voice_model_name not in VOICE_MODEL_IDS:
+            raise ValueError(f"지원하지 않는 모델 이름입니다: {voice_model_name}")
+        self.voice_model_name = voice_model_name
+        self.voice_model_id = VOICE_MODEL_IDS[voice_model_name]
+
+    @cached_property
+    def gemini_model(self):
+        """텍스트 감정 분석용 Gemini 모델 (처음 텍스트를 분석할 때 설정)"""
+        import google.generativeai as genai
+        genai.configure(api_key=self.api_key)
+        return genai.GenerativeModel(
             model_name="gemini-1.5-flash-latest",
             generation_config={"response_mime_type": "application/json"}
         )
-        self.voice_model_weights_path = voice_model_weights_path
-        self.feature_extractor = None
-        self.voice_model = None
-        model_id = ""
-        self.device = "cuda" if torch.cuda.is_available() else "cpu"
-        
-        if voice_model_name == "wav2vec2":
-            model_id = "jungjongho/wav2vec2-xlsr-korean-speech-emotion-recognition2_data_rebalance"
-            finetuned_model_path = "infrastructure/models/wav2vec2.pth" # 실제 .pth 파일 경로로 수정 필수
-            self.feature_extractor = AutoFeatureExtractor.from_pretrained(model_id)
-            
-            # 출력 클래스 개수가 수정된 config 로드
-            config = AutoConfig.from_pretrained(model_id)
-            config.num_labels = 7 # .pth 파일의 클래스 개수인 7로 설정
 
-            # 4. 수정된 config를 기반으로 모델 아키텍처 생성
+    @cached_property
+    def device(self) -> str:
+        import torch
+        return "cuda" if torch.cuda.is_available() else "cpu"
+
+    @cached_property
+    def feature_extractor(self):
+        from transformers import AutoFeatureExtractor
+        return AutoFeatureExtractor.from_pretrained(self.voice_model_id)
+
+    @cached_property
+    def voice_model(self):
+        """음성 특징 기반 감정 분석 모델 (처음 음성을 분석할 때 로드)"""
+        from transformers import Wav2Vec2ForSequenceClassification, HubertForSequenceClassification
+        from core.models.model_registry import model_registry
+        print(f"음성 특징 분석 모델로 '{self.voice_model_id}'를 로드합니다.")
+        if self.voice_model_name == "wav2vec2":
+            build = self._load_finetuned_wav2vec2
+        elif self.voice_model_name == "hubert-base":
+            build = lambda: HubertForSequenceClassification.from_pretrained(self.voice_model_id).to(self.device)
+        else:
+            build = lambda: Wav2Vec2ForSequenceClassification.from_pretrained(self.voice_model_id).to(self.device)
+        return model_registry.get(("voice", self.voice_model_id, str(self.voice_model_weights_path), self.device), build)
+
+    def _load_finetuned_wav2vec2(self):
+        """
+        허브 가중치로 전체 모델을 만든 뒤 .pth로 덮어쓰면 가중치가 두 번 메모리에 올라가므로,
+        config로 구조만 만들고 파인튜닝된 가중치를 mmap으로 바로 연결합니다.
+        """
+        from transformers import AutoConfig, Wav2Vec2ForSequenceClassification
+        from core.models.model_registry import model_registry
+        # 출력 클래스 개수가 수정된 config 로드
+        config = AutoConfig.from_pretrained(self.voice_model_id)
+        config.num_labels = 7 # .pth 파일의 클래스 개수인 7로 설정
+        try:
+            return model_registry.build_with_weights(lambda: Wav2Vec2ForSequenceClassification(config), self.voice_model_weights_path, self.device)
+        except RuntimeError as e:
+            # transformers 버전에 따라 파라미터 이름(weight_norm 등)이 .pth와 다르면 허브 모델을 거쳐 로드합니다.
+            print(f"[경고] 파인튜닝 가중치를 구조에 직접 로드하지 못했습니다. 허브 모델을 통해 로드합니다: {e}")
             # ignore_mismatched_sizes=True 플래그로 classifier 레이어의 크기 불일치를 해결
             model = Wav2Vec2ForSequenceClassification.from_pretrained(
-                model_id,
+                self.voice_model_id,
                 config=config,
                 ignore_mismatched_sizes=True
             )
-            
-            state_dict = torch.load(finetuned_model_path, map_location=self.device)
-            model.load_state_dict(state_dict)
+            model.load_state_dict(model_registry.load_state_dict(self.voice_model_weights_path))
             model.to(self.device)
-            # 6. (중요) 모델을 평가 모드로 설정
+            # (중요) 모델을 평가 모드로 설정
             model.eval()
-            self.voice_model = model
-            
-        elif voice_model_name == "hubert-base":
-            model_id = "team-lucid/hubert-base-korean"
-            self.feature_extractor = AutoFeatureExtractor.from_pretrained(model_id)
-            self.voice_model = HubertForSequenceClassification.from_pretrained(model_id).to(device)
-        elif voice_model_name == "wav2vec2_autumn":
-            model_id = "inseong00/wav2vec2-large-xlsr-korean-autumn"
-            self.feature_extractor = AutoFeatureExtractor.from_pretrained(model_id)
-            self.voice_model = Wav2Vec2ForSequenceClassification.from_pretrained(model_id).to(device)
-        else:
-            raise ValueError(f"지원하지 않는 모델 이름입니다: {voice_model_name}")
-
-        print(f"음성 특징 분석 모델로 '{model_id}'를 로드합니다.")
-        self.voice_model_name = voice_model_name
-        self.voice_model_id = model_id
+            return model
 
     def analyze_emotion_from_text(self, text: str) -> dict:
         """텍스트를 Gemini로 분석하여 감정 스코어를 JSON으로 반환합니다."""
@@ -89,7 +111,8 @@ class VoiceAnalyzer: # 클래스 이름을 VoiceAnalyzer로 유지하되, 내부
         """
         
         try:
-            response = self.gemini_model.generate_content(prompt)
+            with span("gemini_generate", caller="voice_text"):
+                response = self.gemini_model.generate_content(prompt)
             json_response = json.loads(response.text)
             
             expected_emotions = ["기쁨", "당황", "분노", "불안", "상처", "슬픔", "중립"]
@@ -113,6 +136,9 @@ class VoiceAnalyzer: # 클래스 이름을 VoiceAnalyzer로 유지하되, 내부
 
     def analyze_emotion_from_voice(self, audio_path: str) -> dict:
         """오디오 파형 자체를 분석하여 감정 스코어를 반환합니다. (세그먼트 오디오 파일 경로 입력)"""
+        import torch
+        import torchaudio
+        import torchaudio.transforms as T
         try:
             waveform, original_sr = torchaudio.load(audio_path)
         except Exception as e:
@@ -127,10 +153,9 @@ class VoiceAnalyzer: # 클래스 이름을 VoiceAnalyzer로 유지하되, 내부
             waveform = torch.mean(waveform, dim=0, keepdim=True)
             
         speech_array = waveform.squeeze(0).numpy()
-        device = "cuda" if torch.cuda.is_available() else "cpu"
-        inputs = self.feature_extractor(speech_array, sampling_rate=self.target_sr, return_tensors="pt", padding=True).to(device)
+        inputs = self.feature_extractor(speech_array, sampling_rate=self.target_sr, return_tensors="pt", padding=True).to(self.device)
 
-        with torch.no_grad():
+        with torch.no_grad(), span("voice_model_forward"):
             logits = self.voice_model(**inputs).logits
 
         scores = torch.nn.functional.softmax(logits, dim=1).cpu().numpy()[0]
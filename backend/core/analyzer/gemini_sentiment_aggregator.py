@@ -1,8 +1,8 @@
 # ./core/analyzer/gemini_sentiment_aggregator.py
-import google.generativeai as genai
 import json
 from typing import List, Dict, Any, Optional
 from core.utils.analysis_logger import AnalysisLogger # AnalysisLogger 임포트
+from core.utils.tracing import span
 
 class GeminiSentimentAggregator:
     """
@@ -10,6 +10,7 @@ class GeminiSentimentAggregator:
     HTML 카드 형식에 맞춰 필요한 정보를 생성합니다.
     """
     def __init__(self, api_key: str, logger: Optional[AnalysisLogger] = None):
+        import google.generativeai as genai # 집계 단계에서만 필요하므로 모듈 로드 시점에는 임포트하지 않습니다.
         genai.configure(api_key=api_key)
         self.gemini_model = genai.GenerativeModel(
             model_name="gemini-1.5-flash-latest",
@@ -109,7 +110,8 @@ class GeminiSentimentAggregator:
         """
         try:
             print("Gemini API에 종합 감정 분석 요청 중...")
-            response = self.gemini_model.generate_content(prompt)
+            with span("gemini_generate", caller="aggregation"):
+                response = self.gemini_model.generate_content(prompt)
             json_response = json.loads(response.text)
             
             # 응답 스키마 검증 및 누락된 필드 기본값 처리
@@ -1,31 +1,39 @@
 # ./core/analyzer/speech_segmenter.py
 
-from faster_whisper import WhisperModel
 import time
-import torch
+from functools import cached_property
 from typing import List, Dict, Union, Any, Optional
 from core.utils.analysis_logger import AnalysisLogger # AnalysisLogger 임포트
+from core.utils.tracing import span
 
 class SpeechSegmenter:
     """
     오디오 파일에서 음성 발화 세그먼트를 감지하고 텍스트로 변환합니다.
+    STT 모델(FasterWhisper)은 오디오가 있어 get_speech_segments가 처음 호출될 때 로드합니다.
     """
-    def __init__(self, model_size: str = "medium", min_segment_duration: float = 5.0, logger: Optional[AnalysisLogger] = None):
+    def __init__(self, model_size: str = "medium", min_segment_duration: float = 5.0, logger: Optional[AnalysisLogger] = None,
+                 cpu_threads: int = 0):
         self.model_size = model_size
+        self.cpu_threads = cpu_threads # CPU 추론 시 CTranslate2 스레드 수 (0이면 라이브러리 기본값)
         self.min_segment_duration = min_segment_duration
         self.logger = logger
-        
-        self._log_info(f"STT 모델 (FasterWhisper, size='{model_size}') 로드 중...")    
+        self._log_info(f"SpeechSegmenter 설정: 최소 발화 지속 시간 = {min_segment_duration}초.")
+
+    @cached_property
+    def stt_model(self):
+        import torch
+        from faster_whisper import WhisperModel
+        self._log_info(f"STT 모델 (FasterWhisper, size='{self.model_size}') 로드 중...")
 
         # CUDA가 사용 가능한지 확인
         device = "cuda" if torch.cuda.is_available() else "cpu"
         if device == "cuda" :
-            self.stt_model = WhisperModel(model_size, device="cuda", compute_type="float16")
+            stt_model = WhisperModel(self.model_size, device="cuda", compute_type="float16")
         else :
-            self.stt_model = WhisperModel(model_size, device="cpu", compute_type="float32")
+            stt_model = WhisperModel(self.model_size, device="cpu", compute_type="float32", cpu_threads=self.cpu_threads)
 
         self._log_info("STT 모델 로드 완료.")
-        self._log_info(f"SpeechSegmenter 설정: 최소 발화 지속 시간 = {min_segment_duration}초.")
+        return stt_model
 
     def _log_info(self, message: str, data: Optional[Dict[str, Any]] = None):
         if self.logger:
@@ -95,20 +103,25 @@ class SpeechSegmenter:
         """
         self._log_info(f"오디오 ({audio_path})에서 발화 세그먼트 추출 시작...")
         start_time = time.perf_counter()
+        stt_model = self.stt_model # 모델 로드 실패는 트랜스크라이브 오류와 구분하여 그대로 전파합니다.
         
-        try:
-            segments_raw, info = self.stt_model.transcribe(audio_path, beam_size=5, language="ko")
-        except Exception as e:
-            self._log_error(f"STT 모델 트랜스크라이브 중 에러 발생: {e}", {"audio_path": audio_path})
-            return []
-        
-        initial_segments = []
-        for segment in segments_raw:
-            initial_segments.append({
-                "start": segment.start,
-                "end": segment.end,
-                "text": segment.text.strip()
-            })
+        # transcribe()는 제너레이터를 반환하고 실제 디코딩은 순회 중에 일어나므로 순회까지 span에 포함합니다.
+        with span("whisper_transcribe", model_size=self.model_size) as transcribe_span:
+            try:
+                segments_raw, info = stt_model.transcribe(audio_path, beam_size=5, language="ko")
+            except Exception as e:
+                transcribe_span.set_attribute("error.type", type(e).__name__)
+                self._log_error(f"STT 모델 트랜스크라이브 중 에러 발생: {e}", {"audio_path": audio_path})
+                return []
+
+            initial_segments = []
+            for segment in segments_raw:
+                initial_segments.append({
+                    "start": segment.start,
+                    "end": segment.end,
+                    "text": segment.text.strip()
+                })
+            transcribe_span.set_attribute("segments", len(initial_segments))
         
         self._log_info(f"초기 발화 세그먼트 {len(initial_segments)}개 추출 완료.", {"segments": initial_segments})
         self.logger.save_intermediate_result("initial_speech_segments", initial_segments)
@@ -1,64 +1,129 @@
 # ./core/analyzer/video_analyzer.py
 
-import torch
-from torchvision import transforms
 from pathlib import Path
-import cv2
-from moviepy import VideoFileClip
 import numpy as np
 import json
 from PIL import Image
 import os
 import time
-from typing import List, Dict, Union, Any, Optional
+from functools import cached_property
+from typing import List, Dict, Union, Any, Optional, Callable
 from core.utils.analysis_logger import AnalysisLogger # AnalysisLogger 임포트
+from core.utils.thread_budget import ThreadBudget
+from core.utils.tracing import span, traced
 
-# 우리 프로젝트의 핵심 모듈들을 import
-from core.models.model_factory import create_model
-from core.analyzer.audio_analyzer_small import VoiceAnalyzer # VoiceAnalyzer는 이제 세그먼트 단위 분석 담당
-from core.analyzer.speech_segmenter import SpeechSegmenter # 새로운 SpeechSegmenter 임포트
+# torch/torchvision/cv2/moviepy와 모델 모듈(model_factory, audio_analyzer_small, speech_segmenter)은
+# 임포트만으로 수 초가 걸리므로, 해당 단계가 실행될 때 메서드 안에서 임포트합니다.
+# 모델도 __init__에서 로드하지 않고 처음 사용할 때 생성합니다. (benchmarks/check_import_time.py로 회귀 확인)
 
 class BatchVideoAnalyzer: 
     def __init__(self, image_model_name: str, image_model_weights_path: str, voice_model_weights_path: str, 
                  api_key: str, voice_model_name: str = "wav2vec2", min_speech_segment_duration: float = 5.0, 
-                 logger: Optional[AnalysisLogger] = None):
-        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+                 logger: Optional[AnalysisLogger] = None,
+                 progress_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+                 thread_budget: Optional[ThreadBudget] = None):
         self.logger = logger
+        self.progress_callback = progress_callback # 단계별 진행 상황을 전달받을 콜백 (stage, data)
+        self.image_model_name = image_model_name
+        self.image_model_weights_path = image_model_weights_path
+        self.voice_model_weights_path = voice_model_weights_path
+        self.api_key = api_key
+        self.voice_model_name = voice_model_name
+        self.min_speech_segment_duration = min_speech_segment_duration
+        self.thread_budget = thread_budget or ThreadBudget.for_profile("latency") # 라이브러리별 스레드 수 (기본: 단건 응답 시간 우선)
         
-        # 1. 이미지 감정 분석 모델 로드
+        self.emotion_labels = ['기쁨', '당황', '분노', '불안', '상처', '슬픔', '중립']
+
+    @cached_property
+    def device(self):
+        import torch
+        return torch.device("cuda" if torch.cuda.is_available() else "cpu")
+
+    @cached_property
+    def image_model(self):
+        """이미지 감정 분석 모델 (첫 사용 시 로드)"""
+        from core.models.model_factory import create_model
+        from core.models.model_registry import model_registry
         self._log_info("이미지 감정 분석 모델을 로드합니다...")
         print("이미지 감정 분석 모델 로드 중...")
-        self.image_model = create_model(model_name=image_model_name, num_classes=7, pretrained=False)
-        self.image_model.load_state_dict(torch.load(image_model_weights_path, map_location=self.device))
-        self.image_model.to(self.device)
-        self.image_model.eval()
+        # 가중치는 safetensors로 변환된 파일을 mmap으로 읽고, 같은 프로세스에서는 모델 인스턴스를 재사용합니다.
+        image_model = model_registry.get(
+            ("image", self.image_model_name, str(self.image_model_weights_path), str(self.device)),
+            lambda: model_registry.build_with_weights(
+                lambda: create_model(model_name=self.image_model_name, num_classes=7, pretrained=False),
+                self.image_model_weights_path, self.device
+            )
+        )
         self._log_info("이미지 감정 분석 모델 로드 완료.")
         print("이미지 감정 분석 모델 로드 완료.")
-        # 이미지 전처리 transform 정의 (EmoNet 기준)
-        self.image_transform = transforms.Compose([
+        return image_model
+
+    @cached_property
+    def image_transform(self):
+        """이미지 전처리 transform (EmoNet 기준)"""
+        from torchvision import transforms
+        return transforms.Compose([
             transforms.Resize((256, 256)),
             transforms.ToTensor(),
             transforms.Normalize(mean=[0.485, 0.456, 0.406], std=[0.229, 0.224, 0.225])
         ])
-        
-        # DNN 얼굴 탐지기 모델 로드
+
+    @cached_property
+    def face_net(self):
+        """DNN 얼굴 탐지기 (첫 사용 시 로드)"""
+        import cv2
         self._log_info("DNN 얼굴 탐지기를 로드합니다...")
         proto_path = Path("./infrastructure/models/deploy.prototxt")
         model_path = Path("./infrastructure/models/res10_300x300_ssd_iter_140000.caffemodel")
-        self.face_net = cv2.dnn.readNetFromCaffe(str(proto_path), str(model_path))
+        face_net = cv2.dnn.readNetFromCaffe(str(proto_path), str(model_path))
         self._log_info("DNN 얼굴 탐지기 로드 완료.")
-        
-        # 2. 음성 발화 세그먼트 추출기 로드
+        return face_net
+
+    @cached_property
+    def speech_segmenter(self):
+        """음성 발화 세그먼트 추출기 (STT 모델은 SpeechSegmenter 내부에서 다시 지연 로드)"""
+        from core.analyzer.speech_segmenter import SpeechSegmenter
         self._log_info("음성 발화 세그먼트 추출기(SpeechSegmenter)를 로드합니다...")
-        self.speech_segmenter = SpeechSegmenter(min_segment_duration=min_speech_segment_duration, logger=logger) # 최소 발화 지속 시간 및 로거 전달
-        self._log_info(f"SpeechSegmenter 설정: 최소 발화 지속 시간 = {min_speech_segment_duration}초.")
+        speech_segmenter = SpeechSegmenter(min_segment_duration=self.min_speech_segment_duration, logger=self.logger, cpu_threads=self.thread_budget.stt) # 최소 발화 지속 시간 및 로거 전달
+        self._log_info(f"SpeechSegmenter 설정: 최소 발화 지속 시간 = {self.min_speech_segment_duration}초.")
+        return speech_segmenter
 
-        # 3. 음성 감정 분석기 로드
+    @cached_property
+    def voice_analyzer(self):
+        """음성 감정 분석기 (Gemini/음성 모델은 VoiceAnalyzer 내부에서 다시 지연 로드)"""
+        from core.analyzer.audio_analyzer_small import VoiceAnalyzer
         self._log_info("음성 감정 분석기(VoiceAnalyzer)를 로드합니다...")
-        self.voice_analyzer = VoiceAnalyzer(api_key=api_key, voice_model_name=voice_model_name, voice_model_weights_path=voice_model_weights_path) # VoiceAnalyzer에는 로거를 직접 전달하지 않음 (내부에서 로깅하지 않도록 설계)
+        voice_analyzer = VoiceAnalyzer(api_key=self.api_key, voice_model_name=self.voice_model_name, voice_model_weights_path=self.voice_model_weights_path) # VoiceAnalyzer에는 로거를 직접 전달하지 않음 (내부에서 로깅하지 않도록 설계)
         self._log_info("음성 감정 분석기 로드 완료.")
-        
-        self.emotion_labels = ['기쁨', '당황', '분노', '불안', '상처', '슬픔', '중립']
+        return voice_analyzer
+
+    def load_models(self, include_stt: bool = True):
+        """
+        지연 로드되는 모델을 모두 미리 생성합니다. (analysis_worker.py가 fork 전/후에 호출)
+        FasterWhisper(CTranslate2)는 생성 시 내부 스레드를 만들고 스레드는 fork된 자식에 복제되지 않으므로,
+        fork 전에는 include_stt=False로 호출하고 STT 모델은 자식 프로세스에서 로드합니다.
+        """
+        self.image_model, self.image_transform, self.face_net
+        self.voice_analyzer.feature_extractor, self.voice_analyzer.voice_model
+        if include_stt:
+            self.speech_segmenter.stt_model
+
+    def freeze_for_inference(self):
+        """
+        torch 모델을 추론 전용으로 고정합니다. (평가 모드, 파라미터 requires_grad=False)
+        fork 전에 호출하면 자식 프로세스가 파라미터 메타데이터에 쓰지 않아 가중치 페이지가 copy-on-write로 공유됩니다.
+        """
+        for model in (self.image_model, self.voice_analyzer.voice_model):
+            model.eval()
+            for parameter in model.parameters():
+                parameter.requires_grad_(False)
+
+    def bind_job(self, logger: Optional[AnalysisLogger], progress_callback: Optional[Callable[[str, Dict[str, Any]], None]]):
+        """재사용하는 분석기에 작업별 로거와 진행 상황 콜백을 연결합니다."""
+        self.logger = logger
+        self.progress_callback = progress_callback
+        if 'speech_segmenter' in self.__dict__: # 이미 생성된 SpeechSegmenter도 새 로거로 기록하도록 갱신
+            self.speech_segmenter.logger = logger
 
     def _log_info(self, message: str, data: Optional[Dict[str, Any]] = None):
         if self.logger:
@@ -72,11 +137,22 @@ class BatchVideoAnalyzer:
         if self.logger:
             self.logger.log_error(f"[BatchVideoAnalyzer] {message}", data)
 
+    def _report_progress(self, stage: str, current: Optional[int] = None, total: Optional[int] = None):
+        """진행 상황 콜백을 호출합니다. 콜백 실패는 분석을 중단시키지 않습니다."""
+        if not self.progress_callback:
+            return
+        try:
+            self.progress_callback(stage, {"current": current, "total": total})
+        except Exception as e:
+            self._log_warning(f"진행 상황 보고 실패 ({stage}): {e}")
+
+    @traced("extract_frames")
     def extract_frames(self, video_path: Path, start_sec: float = 0, end_sec: float = None, num_frames: int = 3) -> List[Image.Image]:
         """
         비디오에서 지정된 시간 구간(start_sec ~ end_sec) 내 N개의 프레임을 균일한 간격으로 추출합니다.
         end_sec가 None이면, 비디오 끝까지 추출합니다.
         """
+        import cv2
         self._log_info(f"비디오 프레임 추출 시작: {video_path}, 구간 {start_sec:.2f}s - {end_sec if end_sec is not None else 'end'}s, 목표 {num_frames} 프레임.")
         cap = cv2.VideoCapture(str(video_path))
         if not cap.isOpened():
@@ -118,8 +194,10 @@ class BatchVideoAnalyzer:
         self._log_info(f"{len(frames)}개 프레임 추출 완료.")
         return frames
 
+    @traced("detect_face")
     def _detect_and_crop_face(self, frame_pil: Image.Image, confidence_threshold=0.5) -> Image.Image:
         """PIL 이미지를 입력받아 얼굴을 탐지하고, 얼굴 부분만 잘라낸 PIL 이미지를 반환합니다."""
+        import cv2
         cv_img = np.array(frame_pil)
         h, w = cv_img.shape[:2]
         blob = cv2.dnn.blobFromImage(cv2.resize(cv_img, (300, 300)), 1.0, (300, 300), (104.0, 177.0, 123.0))
@@ -153,6 +231,7 @@ class BatchVideoAnalyzer:
         추출된 프레임들의 감정을 분석하고 종합합니다.
         얼굴이 탐지되지 않은 프레임은 분석에서 제외됩니다.
         """
+        import torch
         self._log_info(f"이미지 감정 분석 시작. 총 {len(frames)}개 프레임.")
         all_preds = []
         valid_frames_count = 0
@@ -164,7 +243,8 @@ class BatchVideoAnalyzer:
                     img_tensor = self.image_transform(face_crop).unsqueeze(0).to(self.device)
                     # outputs_dict = self.image_model(img_tensor)
                     # emotion_preds_tensor = outputs_dict['expression']
-                    emotion_preds_tensor = self.image_model(img_tensor)
+                    with span("image_model_forward"):
+                        emotion_preds_tensor = self.image_model(img_tensor)
                     _, preds = torch.max(emotion_preds_tensor, 1)
                     all_preds.append(preds.item())
                 else:
@@ -187,12 +267,16 @@ class BatchVideoAnalyzer:
         self._log_info(f"이미지 감정 분석 완료. 탐지된 얼굴 프레임: {valid_frames_count}/{len(frames)}", result)
         return result
 
+    @traced("analyze_video")
     def analyze(self, video_path_str: str, output_dir: str = "temp") -> Dict[str, Any]:
         """
         하나의 비디오 파일에 대한 전체 이미지/음성/텍스트 감정 분석을 발화 시점별로 수행하고 종합합니다.
         """
+        from moviepy import VideoFileClip
         total_start_time = time.perf_counter()
-        timings = {"overall_processing": {}, "segment_processing": []}
+        timings = {"overall_processing": {}, "segment_processing": [], "thread_budget": self.thread_budget.as_dict()}
+        self.thread_budget.apply() # STT 스레드 수는 모델 생성 시, ffmpeg 스레드 수는 오디오 추출 시 적용
+        self._log_info("스레드 예산 적용", self.thread_budget.as_dict())
         
         video_path = Path(video_path_str)
         output_path = Path(output_dir)
@@ -222,11 +306,12 @@ class BatchVideoAnalyzer:
                     "performance": timings
                 }
             else:
-                main_video_clip.audio.write_audiofile(str(full_audio_path), codec='pcm_s16le', logger=None)
+                main_video_clip.audio.write_audiofile(str(full_audio_path), codec='pcm_s16le', ffmpeg_params=self.thread_budget.ffmpeg_params(), logger=None)
                 if not (full_audio_path.exists() and os.path.getsize(str(full_audio_path)) > 0):
                     raise Exception("오디오 파일이 비어있거나 생성되지 않았습니다.")
             timings["overall_processing"]["full_audio_extraction_seconds"] = time.perf_counter() - full_audio_extraction_start
             self._log_info("전체 오디오 추출 완료.")
+            self._report_progress("audio_extracted")
 
         except Exception as e:
             self._log_error(f"전체 오디오 추출 중 문제 발생: {e}", {"video_path": video_path_str})
@@ -250,6 +335,7 @@ class BatchVideoAnalyzer:
         segments = self.speech_segmenter.get_speech_segments(str(full_audio_path))
         timings["overall_processing"]["speech_segmentation_seconds"] = time.perf_counter() - speech_segmentation_start
         self._log_info(f"총 {len(segments)}개의 발화 세그먼트 추출 완료.")
+        self._report_progress("stt_completed", current=0, total=len(segments))
 
         # 3. 각 발화 세그먼트에 대해 이미지, 음성, 텍스트 감정 분석 수행
         self._log_info("각 발화 세그먼트에 대한 감정 분석을 시작합니다...")
@@ -277,7 +363,7 @@ class BatchVideoAnalyzer:
                 if main_video_clip and main_video_clip.audio is not None:
                     # 수정된 부분: 먼저 비디오 클립을 자른 후, 잘린 비디오 클립에서 오디오를 추출합니다.
                     segment_audio_clip = main_video_clip.subclipped(segment_start, segment_end)
-                    segment_audio_clip.audio.write_audiofile(str(cropped_audio_path), codec='pcm_s16le', logger=None)
+                    segment_audio_clip.audio.write_audiofile(str(cropped_audio_path), codec='pcm_s16le', ffmpeg_params=self.thread_budget.ffmpeg_params(), logger=None)
                     
                     if not (cropped_audio_path.exists() and os.path.getsize(str(cropped_audio_path)) > 0):
                         raise Exception("세그먼트 오디오 파일이 비어있거나 생성되지 않았습니다.")
@@ -338,6 +424,7 @@ class BatchVideoAnalyzer:
                     self._log_warning(f"임시 세그먼트 오디오 파일 삭제 실패 ({cropped_audio_path}): {e}")
 
             self._log_info(f"--- 세그먼트 {segment_id} 분석 완료 (소요 시간: {time.perf_counter() - segment_total_start_time:.2f}초) ---")
+            self._report_progress("segment_completed", current=segment_id, total=len(segments))
 
         total_time_elapsed = time.perf_counter() - total_start_time
         timings["overall_processing"]["total_elapsed_seconds"] = total_time_elapsed
@@ -1,7 +1,8 @@
 from sqlalchemy import Column, DateTime, text, ForeignKey, SmallInteger, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from core.models.database import Base
+from core.models.segment import Segment
 import uuid
 
 class Analysis(Base):
@@ -11,9 +12,7 @@ class Analysis(Base):
     analysis_record_id = Column(UUID(as_uuid=True), ForeignKey('records_tbl.record_id'), nullable=False, unique=True)
     analysis_created = Column(DateTime(timezone=True), server_default=text('now()'))
     analysis_face_emotions_rates = Column(JSONB, nullable=False)
-    analysis_face_emotions_time_series_rates = Column(JSONB, nullable=False)
     analysis_voice_emotions_rates = Column(JSONB, nullable=False)
-    analysis_voice_emotions_time_series_rates = Column(JSONB, nullable=False)
     analysis_face_emotions_score = Column(JSONB, nullable=False)
     analysis_voice_emotions_score = Column(JSONB, nullable=False)
     analysis_majority_emotion = Column(JSONB, nullable=False)
@@ -21,6 +20,16 @@ class Analysis(Base):
     report = relationship("Report", back_populates="analysis", uselist=False, cascade="all, delete-orphan")
     # Records 모델과의 관계 추가
     record = relationship("Records", back_populates="analysis", uselist=False)
+    # 세그먼트별 얼굴/음성 시계열은 segment_tbl에 구간당 1행으로 저장합니다. (접근할 때 로드)
+    segments = relationship("Segment", order_by="Segment.segment_index", passive_deletes=True)
+
+    @property
+    def analysis_face_emotions_time_series_rates(self):
+        return [Segment.to_segment_dict(segment, audio=False) for segment in self.segments]
+
+    @property
+    def analysis_voice_emotions_time_series_rates(self):
+        return [Segment.to_segment_dict(segment, visual=False) for segment in self.segments]
 
     def __repr__(self):
         return f"<Analysis(analysis_id='{self.analysis_id}', record_id='{self.analysis_record_id}')>"
\ No newline at end of file
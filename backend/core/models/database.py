@@ -1,5 +1,9 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import scoped_session, sessionmaker, declarative_base
+from sqlalchemy.pool import NullPool
+from core.utils.db_pool_metrics import InstrumentedQueuePool, pool_metrics
+from core.utils.tracing import tracer
 import os
 
 # 환경 변수에서 데이터베이스 URL 가져오기
@@ -7,8 +11,42 @@ DATABASE_URL = os.environ.get("DATABASE_URL")
 if not DATABASE_URL:
     raise ValueError("DATABASE_URL 환경 변수가 설정되지 않았습니다.")
 
+# 커넥션 풀 설정 (워커 프로세스마다 별도의 풀이 생성되므로, 전체 연결 수 = 워커 수 x (pool_size + max_overflow))
+DB_POOLCLASS = os.environ.get("DB_POOLCLASS", "queue") # 'queue' | 'null' (단발성 스크립트용, 연결을 재사용하지 않음)
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", "5"))
+DB_POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", "10"))
+DB_POOL_RECYCLE = int(os.environ.get("DB_POOL_RECYCLE", "1800")) # DB/프록시의 유휴 연결 종료보다 짧게 설정
+DB_POOL_PRE_PING = os.environ.get("DB_POOL_PRE_PING", "1") == "1"
+# SQLAlchemy가 컴파일한 SQL 문자열을 재사용하는 캐시 크기
+DB_QUERY_CACHE_SIZE = int(os.environ.get("DB_QUERY_CACHE_SIZE", "500"))
+# psycopg(3) 드라이버(DATABASE_URL=postgresql+psycopg://...) 사용 시 서버 측 prepared statement로 전환되는 실행 횟수
+# (psycopg2는 지원하지 않음. 분석 이벤트 LISTEN 스레드는 두 드라이버를 모두 지원합니다: core/services/event_service.py)
+DB_PREPARE_THRESHOLD = int(os.environ.get("DB_PREPARE_THRESHOLD", "5"))
+
+def _engine_options() -> dict:
+    options = {
+        "pool_pre_ping": DB_POOL_PRE_PING,
+        "query_cache_size": DB_QUERY_CACHE_SIZE,
+    }
+    if DB_POOLCLASS == "null":
+        options["poolclass"] = NullPool
+    else:
+        options.update({
+            "poolclass": InstrumentedQueuePool,
+            "pool_size": DB_POOL_SIZE,
+            "max_overflow": DB_MAX_OVERFLOW,
+            "pool_timeout": DB_POOL_TIMEOUT,
+            "pool_recycle": DB_POOL_RECYCLE,
+        })
+    if make_url(DATABASE_URL).get_driver_name() == "psycopg":
+        options["connect_args"] = {"prepare_threshold": DB_PREPARE_THRESHOLD}
+    return options
+
 # SQLAlchemy 엔진 생성
-engine = create_engine(DATABASE_URL)
+engine = create_engine(DATABASE_URL, **_engine_options())
+pool_metrics.attach(engine)
+tracer.register_collector(pool_metrics.prometheus_samples)
 
 # 스레드 안전한 세션 생성
 db_session = scoped_session(sessionmaker(autocommit=False, autoflush=False, bind=engine))
@@ -17,9 +55,11 @@ db_session = scoped_session(sessionmaker(autocommit=False, autoflush=False, bind
 Base = declarative_base()
 Base.query = db_session.query_property()
 
-def init_db():
-    """데이터베이스 테이블을 초기화합니다."""
-    # 모든 모델 클래스를 임포트하여 Base.metadata에 등록
+def register_models():
+    """
+    모든 모델 클래스를 임포트하여 Base.metadata와 매퍼 레지스트리에 등록합니다.
+    app을 임포트하지 않는 프로세스(analysis_worker.py 등)에서 relationship('User') 같은 문자열 참조를 해석하려면 필요합니다.
+    """
     import core.models.user
     import core.models.auth
     import core.models.chatbot_persona
@@ -27,8 +67,13 @@ def init_db():
     import core.models.message
     import core.models.records
     import core.models.analysis
+    import core.models.segment
     import core.models.report
     import core.models.image_url
     import core.models.image_byte
+    import core.models.emotion_rollup
 
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+def init_db():
+    """데이터베이스 테이블을 초기화합니다."""
+    register_models()
+    Base.metadata.create_all(bind=engine)
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Date, DateTime, Float, ForeignKey, Integer, UniqueConstraint, text
+from sqlalchemy.dialects.postgresql import UUID
+from core.models.database import Base
+import uuid
+
+class EmotionDailyRollup(Base):
+    __tablename__ = 'emotion_daily_rollup_tbl'
+    __table_args__ = (
+        UniqueConstraint('rollup_user_id', 'rollup_date', name='emotion_daily_rollup_user_date_unique'),
+    )
+
+    rollup_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    rollup_user_id = Column(UUID(as_uuid=True), ForeignKey('user_tbl.user_id'), nullable=False)
+    rollup_date = Column(Date, nullable=False)
+    rollup_report_count = Column(Integer, nullable=False, default=0)
+    rollup_sentiment_score_sum = Column(Float, nullable=False, default=0.0)
+    rollup_positive_sum = Column(Float, nullable=False, default=0.0)
+    rollup_negative_sum = Column(Float, nullable=False, default=0.0)
+    rollup_updated = Column(DateTime(timezone=True), server_default=text('now()'), onupdate=text('now()'))
+
+    def __repr__(self):
+        return f"<EmotionDailyRollup(user_id='{self.rollup_user_id}', date='{self.rollup_date}', count={self.rollup_report_count})>"
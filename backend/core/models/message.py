@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, text, ForeignKey, Text
+from sqlalchemy import Column, DateTime, Index, text, ForeignKey, Text
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 from core.models.database import Base
@@ -13,10 +13,14 @@ if TYPE_CHECKING:
 
 class Message(Base):
     __tablename__ = 'message_tbl'
+    __table_args__ = (
+        Index('idx_message_chat_session_id', 'message_chat_session_id', text('message_created DESC')),
+    )
 
     message_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     message_user_id = Column(UUID(as_uuid=True), ForeignKey('user_tbl.user_id'), nullable=False)
     message_chat_session_id = Column(UUID(as_uuid=True), ForeignKey('chat_session_tbl.chat_session_id'), nullable=False)
+    message_role = Column(Text, nullable=False, server_default=text("'user'")) # 'user' | 'bot'
     message_text = Column(Text)
     message_image_id = Column(UUID(as_uuid=True), ForeignKey('image_url_tbl.image_id'))
     message_created = Column(DateTime(timezone=True), server_default=text('now()'))
@@ -0,0 +1,116 @@
+# /core/models/model_registry.py
+
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Union
+
+logger = logging.getLogger(__name__)
+
+class ModelRegistry:
+    """
+    모델 가중치 로드와 생성된 모델 인스턴스를 프로세스 단위로 공유하는 레지스트리.
+
+    .pth 가중치는 처음 한 번 같은 위치의 .safetensors로 변환해 두고, 이후에는 mmap으로 읽습니다.
+    mmap된 텐서는 파일의 페이지 캐시를 그대로 사용하므로 로드 시 전체 복사가 없고,
+    같은 머신에서 실행되는 여러 analyzer/워커 프로세스가 읽기 전용 페이지를 공유합니다.
+    """
+    def __init__(self):
+        self._models: Dict[Hashable, Any] = {}
+        self._lock = threading.RLock()
+
+    def get(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        """key에 해당하는 모델을 반환합니다. 없으면 build()로 한 번만 생성합니다."""
+        with self._lock:
+            if key not in self._models:
+                self._models[key] = build()
+            return self._models[key]
+
+    @staticmethod
+    def safetensors_path(weights_path: Union[str, Path]) -> Path:
+        return Path(weights_path).with_suffix('.safetensors')
+
+    def load_state_dict(self, weights_path: Union[str, Path]) -> Dict[str, Any]:
+        """
+        가중치를 CPU 텐서 state_dict로 mmap 로드합니다.
+        .safetensors가 없거나 원본 .pth보다 오래되었으면 변환한 뒤 로드합니다.
+        """
+        weights_path = Path(weights_path)
+        safetensors_path = self.safetensors_path(weights_path)
+        if weights_path.suffix == '.safetensors' or self._is_fresh(safetensors_path, weights_path):
+            return self._load_safetensors(safetensors_path)
+
+        state_dict = self._torch_load(weights_path)
+        try:
+            self._save_safetensors(state_dict, safetensors_path)
+        except Exception as e:
+            # safetensors 미설치, 공유 저장소(tied weight) 텐서, 읽기 전용 디렉터리 등은 변환 없이 mmap 로드 결과를 사용합니다.
+            logger.warning(f"safetensors 변환을 건너뜁니다 ({weights_path}): {e}")
+            return state_dict
+        logger.info(f"가중치를 safetensors로 변환했습니다: {weights_path} -> {safetensors_path}")
+        return self._load_safetensors(safetensors_path)
+
+    @staticmethod
+    def _torch_load(weights_path: Path) -> Dict[str, Any]:
+        """
+        torch 2.1+의 zipfile 형식 체크포인트는 mmap=True로 복사 없이 읽습니다.
+        이전 형식(_use_new_zipfile_serialization=False)이거나 torch<2.1이라 mmap을 쓸 수 없으면 일반 로드로 다시 읽습니다.
+        """
+        import torch
+        try:
+            return torch.load(weights_path, map_location='cpu', mmap=True, weights_only=True)
+        except (TypeError, RuntimeError) as e: # torch<2.1: mmap 인자 없음(TypeError), 이전 형식: mmap 불가(RuntimeError)
+            logger.warning(f"mmap 로드를 사용할 수 없어 일반 로드로 다시 읽습니다 ({weights_path}): {e}")
+            return torch.load(weights_path, map_location='cpu', weights_only=True)
+
+    @staticmethod
+    def _is_fresh(safetensors_path: Path, weights_path: Path) -> bool:
+        if not safetensors_path.exists():
+            return False
+        return not weights_path.exists() or safetensors_path.stat().st_mtime >= weights_path.stat().st_mtime
+
+    @staticmethod
+    def _load_safetensors(path: Path) -> Dict[str, Any]:
+        from safetensors.torch import load_file
+        return load_file(str(path), device='cpu')
+
+    @staticmethod
+    def _save_safetensors(state_dict: Dict[str, Any], path: Path):
+        from safetensors.torch import save_file
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        try:
+            save_file({name: tensor.contiguous() for name, tensor in state_dict.items()}, str(tmp_path))
+            os.replace(tmp_path, path) # 동시에 변환하는 다른 프로세스가 반쯤 쓰인 파일을 읽지 않도록 원자적으로 교체
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+    def build_with_weights(self, build: Callable[[], Any], weights_path: Union[str, Path], device) -> Any:
+        """
+        build()로 만든 모델 구조에 가중치를 로드하고 평가 모드로 device에 올립니다.
+        구조는 meta 디바이스에서 만들고 load_state_dict(assign=True)로 mmap 텐서를 그대로 연결하므로
+        랜덤 초기화 값과 가중치가 메모리에 두 번 올라가지 않습니다.
+        """
+        import torch
+        state_dict = self.load_state_dict(weights_path)
+        with torch.device('meta'):
+            model = build()
+        model.load_state_dict(state_dict, assign=True)
+        if any(tensor.is_meta for tensor in list(model.parameters()) + list(model.buffers())):
+            # state_dict에 없는 버퍼(persistent=False 등)가 있으면 일반 생성 후 복사 로드합니다.
+            model = build()
+            model.load_state_dict(state_dict)
+        model.to(device)
+        model.eval()
+        return model
+
+model_registry = ModelRegistry()
+
+if __name__ == "__main__":
+    # 배포 시 미리 변환: python -m core.models.model_registry infrastructure/models/mobilenet_v3_small.pth infrastructure/models/wav2vec2.pth
+    import sys
+    logging.basicConfig(level=logging.INFO)
+    for path in sys.argv[1:]:
+        state_dict = model_registry.load_state_dict(path)
+        print(f"{path}: {len(state_dict)} tensors -> {model_registry.safetensors_path(path)}")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, text, ForeignKey, Integer, Text
+from sqlalchemy import Column, Index, DateTime, text, ForeignKey, Integer, SmallInteger, Text
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 from core.models.database import Base
@@ -6,13 +6,27 @@ import uuid
 
 class Records(Base):
     __tablename__ = 'records_tbl'
+    __table_args__ = (
+        Index('idx_records_user_id_created', 'record_user_id', text('record_created DESC')),
+        Index('idx_records_processing_heartbeat', 'record_heartbeat', postgresql_where=text("record_analysis_status = 'processing'")),
+    )
     
     record_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     record_user_id = Column(UUID(as_uuid=True), ForeignKey('user_tbl.user_id'), nullable=False)
     record_created = Column(DateTime(timezone=True), server_default=text('now()'))
     record_video_path = Column(Text, nullable=False)
     record_seconds = Column(Integer, nullable=False)
-    record_analysis_status = Column(Text, nullable=False)
+    record_analysis_status = Column(Text, nullable=False) # 'processing' | 'completed' | 'failed'
+    # 분석 진행 상황 (analyzer가 /api/analysis/progress로 보고)
+    record_stage = Column(Text)
+    record_progress_percent = Column(SmallInteger, nullable=False, server_default=text('0'))
+    record_progress_current = Column(Integer)
+    record_progress_total = Column(Integer)
+    record_eta_seconds = Column(Integer)
+    # 분석 프로세스 생존 신호. 오래 갱신되지 않은 'processing' 레코드는 reaper가 재실행하거나 실패 처리합니다.
+    record_heartbeat = Column(DateTime(timezone=True), nullable=False, server_default=text('now()'))
+    record_attempts = Column(SmallInteger, nullable=False, server_default=text('0'))
+    record_error = Column(Text)
 
     user = relationship("User", back_populates="records")
     # Analysis 모델과의 관계 추가
@@ -1,17 +1,21 @@
-from sqlalchemy import Column, DateTime, ForeignKey, text
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Index, DateTime, ForeignKey, text
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from core.models.database import Base
 import uuid
 
 class Report(Base):
     __tablename__ = 'report_tbl'
+    __table_args__ = (
+        Index('idx_report_user_id_created', 'report_user_id', text('report_created DESC')),
+    )
     
     report_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     report_analysis_id = Column(UUID(as_uuid=True), ForeignKey('analysis_tbl.analysis_id'), nullable=False, unique=True)
     report_user_id = Column(UUID(as_uuid=True), ForeignKey('user_tbl.user_id'), nullable=False)
     report_created = Column(DateTime(timezone=True), server_default=text('now()'))
-    report_detail = Column(JSONB, nullable=False)
+    # 세그먼트 전체 분석 결과를 담는 대용량 JSONB이므로 상세 조회에서만 로드합니다.
+    report_detail = deferred(Column(JSONB, nullable=False))
     report_summary = Column(JSONB, nullable=False)
     report_card = Column(JSONB, nullable=False)
     report_card_image_id = Column(UUID(as_uuid=True), ForeignKey('image_url_tbl.image_id'))
@@ -0,0 +1,57 @@
+from sqlalchemy import Column, ForeignKey, Integer, LargeBinary, SmallInteger, Text
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from core.models.database import Base
+from core.utils.time_series_codec import join_segment, split_segment
+
+class Segment(Base):
+    """
+    발화 구간별 분석 결과 (구간당 1행). Analysis의 얼굴/음성 시계열과 Report 상세의 segment_analyses가 함께 참조합니다.
+    감정 분포는 core.utils.time_series_codec의 고정 라벨 순서로 양자화한 bytea(라벨당 uint16 2바이트)로, 구간 시각은 밀리초 정수로 저장합니다.
+    """
+    __tablename__ = 'segment_tbl'
+
+    segment_analysis_id = Column(UUID(as_uuid=True), ForeignKey('analysis_tbl.analysis_id', ondelete='CASCADE'), primary_key=True)
+    segment_index = Column(SmallInteger, primary_key=True) # 분석 결과 내 순서
+    segment_number = Column(Integer) # analyzer의 segment_id
+    segment_start_ms = Column(Integer)
+    segment_end_ms = Column(Integer)
+    segment_text = Column(Text)
+    segment_face_dominant = Column(SmallInteger) # EMOTIONS 인덱스 (NULL이면 "N/A")
+    segment_face = Column(LargeBinary)
+    segment_text_sentiment = Column(LargeBinary)
+    segment_text_emotions = Column(LargeBinary)
+    segment_voice = Column(LargeBinary)
+    segment_extra = Column(JSONB) # 고정 형식에 맞지 않는 값 (에러 메시지 등)
+
+    # split_segment()/join_segment()의 키 -> 컬럼 이름
+    COLUMN_MAP = {
+        "segment_id": "segment_number",
+        "start_ms": "segment_start_ms",
+        "end_ms": "segment_end_ms",
+        "text": "segment_text",
+        "face_dominant": "segment_face_dominant",
+        "face": "segment_face",
+        "sentiment": "segment_text_sentiment",
+        "text_emotions": "segment_text_emotions",
+        "voice": "segment_voice",
+        "extra": "segment_extra",
+    }
+
+    @classmethod
+    def rows_from_analysis(cls, analysis_id, segments: list) -> list:
+        """analyzer의 segment_analyses를 bulk insert용 행 dict 목록으로 변환합니다."""
+        rows = []
+        for index, segment in enumerate(segments):
+            columns = split_segment(segment)
+            row = {column: columns[key] for key, column in cls.COLUMN_MAP.items()}
+            row.update(segment_analysis_id=analysis_id, segment_index=index)
+            rows.append(row)
+        return rows
+
+    @classmethod
+    def to_segment_dict(cls, row, visual: bool = True, audio: bool = True) -> dict:
+        """ORM 객체나 일부 컬럼만 조회한 Row를 기존 segment_analyses 항목 형태로 복원합니다."""
+        return join_segment({key: getattr(row, column, None) for key, column in cls.COLUMN_MAP.items()}, visual=visual, audio=audio)
+
+    def __repr__(self):
+        return f"<Segment(analysis_id='{self.segment_analysis_id}', index={self.segment_index})>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, DateTime, text, ForeignKey, Text
+from sqlalchemy import Column, String, Boolean, DateTime, text, ForeignKey, Text, BigInteger
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 from core.models.database import Base
@@ -24,6 +24,8 @@ class User(Base):
     selected_chatbot_id = Column(UUID(as_uuid=True), ForeignKey('chatbot_persona_tbl.chatbot_id'), nullable=True)
     user_account_created = Column(DateTime(timezone=True), server_default=text('now()'))
     user_account_updated = Column(DateTime(timezone=True), server_default=text('now()'), onupdate=text('now()'))
+    # 리포트/페르소나 등 사용자 화면 데이터가 바뀔 때마다 1씩 증가 (응답 캐시 키와 ETag에 사용)
+    user_data_version = Column(BigInteger, nullable=False, server_default=text('0'))
 
     selected_chatbot = relationship("ChatbotPersona", back_populates="users")
     auth = relationship("Auth", back_populates="user", uselist=False)
@@ -0,0 +1,181 @@
+# backend/core/services/analysis_job_service.py
+
+import logging
+import os
+import subprocess
+import threading
+import time
+from datetime import timedelta
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import func
+from core.models.database import db_session
+from core.models.records import Records
+from core.services.event_service import analysis_events
+
+logger = logging.getLogger(__name__)
+
+class AnalysisJobService:
+    """
+    analyzer 서브프로세스 실행과, heartbeat가 끊긴 분석 작업을 정리하는 reaper를 담당합니다.
+
+    analyzer는 ProgressReporter로 진행 상황과 heartbeat를 보고합니다. 프로세스가 비정상 종료되면
+    heartbeat가 멈추므로, reaper가 주기적으로 오래된 'processing' 레코드를 찾아 재실행하거나 'failed'로 표시합니다.
+
+    ANALYSIS_DISPATCH=worker이면 프로세스를 직접 실행하지 않고 레코드를 대기 상태로만 두며,
+    analysis_worker.py의 워커 프로세스들이 claim_next_job으로 작업을 가져갑니다.
+    """
+    ANALYZER_SCRIPT = "analyzer_small.py"
+    DISPATCH_MODE = os.environ.get("ANALYSIS_DISPATCH", "subprocess") # 'subprocess' | 'worker'
+    PENDING_STAGES = ('queued', 'requeued')
+    HEARTBEAT_TIMEOUT = timedelta(seconds=120) # ProgressReporter.HEARTBEAT_INTERVAL_SECONDS의 4배
+    MAX_ATTEMPTS = 2
+    REAP_INTERVAL_SECONDS = 60
+    REAP_BATCH_SIZE = 50
+
+    def __init__(self):
+        self._reaper_thread = None
+        self._reaper_lock = threading.Lock()
+
+    def launch(self, record_id, user_id, video_path: str):
+        """시도 횟수와 heartbeat를 갱신한 뒤 analyzer 프로세스를 백그라운드로 실행합니다."""
+        try:
+            db_session.query(Records).filter(Records.record_id == record_id).update({
+                Records.record_attempts: Records.record_attempts + 1,
+                Records.record_heartbeat: func.now(),
+                Records.record_stage: 'queued',
+            }, synchronize_session=False)
+            db_session.commit()
+        except Exception as e:
+            db_session.rollback()
+            logger.error(f"분석 작업 시작 정보 저장 중 에러 발생: {e}", exc_info=True)
+            raise
+        self._spawn(record_id, user_id, video_path)
+
+    def _spawn(self, record_id, user_id, video_path: str):
+        if self.DISPATCH_MODE == "worker":
+            logger.info(f"분석 워커 대기열에 작업을 등록했습니다. record_id: {record_id}")
+            return
+        subprocess.Popen(["python", self.ANALYZER_SCRIPT, "--video_path", video_path, "--record_id", str(record_id), "--user_id", str(user_id)])
+        logger.info(f"백그라운드에서 {self.ANALYZER_SCRIPT} 실행 요청. record_id: {record_id}")
+
+    def claim_next_job(self) -> Optional[Tuple]:
+        """
+        대기 중인 분석 작업 하나를 가져와 'claimed'로 표시하고 (record_id, user_id, video_path)를 반환합니다.
+        여러 워커 프로세스가 동시에 호출해도 FOR UPDATE SKIP LOCKED로 같은 작업을 중복으로 가져가지 않습니다.
+        """
+        try:
+            record = db_session.query(Records).filter(
+                Records.record_analysis_status == 'processing',
+                Records.record_stage.in_(self.PENDING_STAGES)
+            ).order_by(Records.record_heartbeat).with_for_update(skip_locked=True).first()
+            if record is None:
+                db_session.rollback() # 잠금 없이 트랜잭션만 종료
+                return None
+            record.record_stage = 'claimed'
+            record.record_heartbeat = func.now()
+            job = (record.record_id, record.record_user_id, record.record_video_path)
+            db_session.commit()
+            return job
+        except Exception as e:
+            db_session.rollback()
+            logger.error(f"분석 작업 할당 중 에러 발생: {e}", exc_info=True)
+            raise
+
+    def reap_stale_jobs(self) -> Dict[str, int]:
+        """
+        heartbeat가 HEARTBEAT_TIMEOUT보다 오래된 'processing' 레코드를 정리합니다.
+        재시도 횟수가 남았고 원본 영상이 있으면 재실행하고, 아니면 'failed'로 표시합니다.
+        여러 워커가 동시에 실행해도 FOR UPDATE SKIP LOCKED로 같은 레코드를 중복 처리하지 않습니다.
+        """
+        requeued: List[Tuple] = []
+        failed = 0
+        try:
+            conditions = [
+                Records.record_analysis_status == 'processing',
+                Records.record_heartbeat < func.now() - self.HEARTBEAT_TIMEOUT
+            ]
+            if self.DISPATCH_MODE == "worker":
+                # 워커 모드의 대기 작업은 워커가 가져가기 전까지 heartbeat가 갱신되지 않으므로 정리 대상이 아닙니다.
+                # (subprocess 모드에서는 실행한 프로세스가 첫 보고 전에 죽은 경우이므로 그대로 정리합니다.)
+                conditions.append(Records.record_stage.notin_(self.PENDING_STAGES))
+            stale_records = db_session.query(Records).filter(*conditions).order_by(Records.record_heartbeat).limit(self.REAP_BATCH_SIZE).with_for_update(skip_locked=True).all()
+
+            for record in stale_records:
+                can_retry = record.record_attempts < self.MAX_ATTEMPTS and os.path.exists(record.record_video_path)
+                if can_retry:
+                    record.record_attempts += 1
+                    record.record_heartbeat = func.now()
+                    record.record_stage = 'requeued'
+                    record.record_progress_percent = 0
+                    record.record_progress_current = None
+                    record.record_eta_seconds = None
+                    requeued.append((record.record_id, record.record_user_id, record.record_video_path))
+                    logger.warning(f"멈춘 분석 작업을 재실행합니다. record_id: {record.record_id}, attempt: {record.record_attempts}")
+                else:
+                    self._fail(record,
+                        f"heartbeat timeout at stage '{record.record_stage}' after {record.record_attempts} attempt(s)"
+                        if os.path.exists(record.record_video_path) else "source video is missing"
+                    )
+                    failed += 1
+                    logger.warning(f"멈춘 분석 작업을 실패 처리합니다. record_id: {record.record_id}, reason: {record.record_error}")
+            db_session.commit()
+        except Exception as e:
+            db_session.rollback()
+            logger.error(f"멈춘 분석 작업 정리 중 에러 발생: {e}", exc_info=True)
+            raise
+
+        # 레코드 상태가 커밋된 뒤에 프로세스를 실행해야 새 프로세스의 보고가 덮어써지지 않습니다.
+        for record_id, user_id, video_path in requeued:
+            self._spawn(record_id, user_id, video_path)
+        return {"requeued": len(requeued), "failed": failed}
+
+    def mark_failed(self, record_id, error: str) -> bool:
+        """
+        분석 실패를 바로 기록하고 'failed' 이벤트를 보냅니다. reaper의 heartbeat 타임아웃을 기다리지 않기 위해 워커가 호출합니다.
+        이미 완료/실패 처리된 레코드는 바꾸지 않으며, 상태를 바꿨으면 True를 반환합니다.
+        """
+        try:
+            record = db_session.query(Records).filter(
+                Records.record_id == record_id,
+                Records.record_analysis_status == 'processing'
+            ).with_for_update().first()
+            if record is None:
+                db_session.rollback()
+                return False
+            self._fail(record, error)
+            db_session.commit()
+        except Exception as e:
+            db_session.rollback()
+            logger.error(f"분석 실패 상태 저장 중 에러 발생. record_id: {record_id}: {e}", exc_info=True)
+            raise
+        logger.warning(f"분석 작업을 실패 처리했습니다. record_id: {record_id}, reason: {error}")
+        return True
+
+    @staticmethod
+    def _fail(record: Records, error: str):
+        """레코드를 'failed'로 표시하고 이벤트를 추가합니다. (호출한 쪽에서 commit)"""
+        record.record_error = error
+        record.record_analysis_status = 'failed'
+        record.record_stage = 'failed'
+        analysis_events.publish(record.record_user_id, 'failed', {
+            "record_id": str(record.record_id),
+            "error": error
+        })
+
+    def start_reaper(self):
+        """REAP_INTERVAL_SECONDS마다 reap_stale_jobs를 실행하는 데몬 스레드를 시작합니다."""
+        with self._reaper_lock:
+            if self._reaper_thread is not None and self._reaper_thread.is_alive():
+                return
+            self._reaper_thread = threading.Thread(target=self._reap_forever, name="analysis-job-reaper", daemon=True)
+            self._reaper_thread.start()
+
+    def _reap_forever(self):
+        while True:
+            time.sleep(self.REAP_INTERVAL_SECONDS)
+            try:
+                self.reap_stale_jobs()
+            except Exception:
+                pass # reap_stale_jobs에서 이미 로깅됨
+            finally:
+                db_session.remove()
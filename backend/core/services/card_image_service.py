@@ -0,0 +1,183 @@
+# backend/core/services/card_image_service.py
+
+import hashlib
+import io
+import logging
+import os
+import queue
+import threading
+from pathlib import Path
+from typing import Optional, Set, Tuple
+
+from core.utils.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+CARD_IMAGE_DIR = Path(os.environ.get("CARD_IMAGE_DIR", "./uploads/images"))
+CARD_IMAGE_MAX_BYTES = int(os.environ.get("CARD_IMAGE_MAX_BYTES", str(10 * 1024 * 1024))) # 디코딩된 원본 이미지 최대 크기
+CARD_THUMBNAIL_SIZE = int(os.environ.get("CARD_THUMBNAIL_SIZE", "320")) # 썸네일 긴 변 픽셀 수 (0 = 만들지 않음)
+CARD_IMAGE_WEBP = os.environ.get("CARD_IMAGE_WEBP", "0") == "1" # 원본과 별도로 WebP 사본 생성
+CARD_IMAGE_MAX_DIMENSION = int(os.environ.get("CARD_IMAGE_MAX_DIMENSION", "0")) # WebP 사본의 긴 변 최대 픽셀 수 (0 = 원본 크기)
+CARD_IMAGE_QUEUE_SIZE = int(os.environ.get("CARD_IMAGE_QUEUE_SIZE", "32")) # 작업마다 원본 바이트를 들고 있으므로 메모리 상한 = 크기 x MAX_BYTES
+CARD_IMAGE_WEBP_QUALITY = 85
+
+# 파일 앞부분(매직 바이트)으로 판별하는 형식 → 저장 확장자
+_SIGNATURES = (
+    (b"\x89PNG\r\n\x1a\n", "png"),
+    (b"\xff\xd8\xff", "jpg"),
+)
+
+card_image_saves = tracer.counter(
+    "feellog_card_image_saves_total", "Emotion card image saves by result (written, unchanged)")
+card_image_derivatives = tracer.counter(
+    "feellog_card_image_derivatives_total", "Emotion card thumbnail/WebP jobs by result (done, cached, dropped, failed)")
+
+def sniff_image_format(data: bytes) -> Optional[str]:
+    """파일 헤더로 이미지 형식을 판별해 확장자('png', 'jpg', 'webp')를 반환합니다. 지원하지 않는 형식이면 None."""
+    for signature, extension in _SIGNATURES:
+        if data.startswith(signature):
+            return extension
+    if len(data) >= 12 and data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "webp"
+    return None
+
+def _write_atomic(path: Path, data: bytes):
+    """임시 파일에 쓴 뒤 교체하여, 읽는 쪽이 반쯤 쓰인 파일을 보지 않도록 합니다."""
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def _file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class CardImageService:
+    """
+    감정 카드 이미지 저장을 담당합니다.
+
+    요청 스레드에서는 헤더로 형식만 확인하고 받은 바이트를 그대로 uploads/images/<user_id>/<report_id>.<ext>에 씁니다.
+    같은 내용이 이미 저장되어 있으면(크기와 SHA-256이 같으면) 쓰지 않습니다.
+    썸네일과 WebP 사본은 백그라운드 스레드가 Pillow로 만들며, 내용 해시별 디렉터리(derived/<sha256>/)에 저장하므로
+    같은 카드를 다시 저장하거나 여러 리포트가 같은 이미지를 쓰더라도 한 번만 생성합니다.
+    작업에는 저장한 바이트를 그대로 담으므로, 그 사이 원본 파일이 다른 이미지로 바뀌거나 지워져도 해시와 내용이 어긋나지 않습니다.
+    """
+    def __init__(self, base_dir: Path = CARD_IMAGE_DIR, queue_size: int = CARD_IMAGE_QUEUE_SIZE):
+        self.base_dir = Path(base_dir)
+        self._jobs: "queue.Queue[Tuple[str, bytes]]" = queue.Queue(maxsize=queue_size)
+        self._queued: Set[str] = set() # 대기/처리 중인 내용 해시 (같은 이미지를 중복으로 넣지 않음)
+        self._lock = threading.Lock()
+        self._worker_thread: Optional[threading.Thread] = None
+
+    def image_path(self, user_id, report_id, extension: str) -> Path:
+        return self.base_dir / str(user_id) / f"{report_id}.{extension}"
+
+    def derived_dir(self, digest: str) -> Path:
+        return self.base_dir / "derived" / digest
+
+    def save(self, user_id, report_id, image_bytes: bytes) -> Tuple[Path, str]:
+        """
+        원본 이미지를 저장하고 (저장 경로, 내용 해시)를 반환합니다. 형식을 알 수 없거나 너무 크면 ValueError를 발생시킵니다.
+        파생 이미지 생성은 대기열에 넣기만 하므로 응답을 늦추지 않습니다.
+        """
+        if len(image_bytes) > CARD_IMAGE_MAX_BYTES:
+            raise ValueError(f"이미지 크기가 너무 큽니다. (최대 {CARD_IMAGE_MAX_BYTES // (1024 * 1024)}MB)")
+        extension = sniff_image_format(image_bytes)
+        if extension is None:
+            raise ValueError("지원하지 않는 이미지 형식입니다. (PNG, JPEG, WebP)")
+
+        digest = hashlib.sha256(image_bytes).hexdigest()
+        path = self.image_path(user_id, report_id, extension)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists() and path.stat().st_size == len(image_bytes) and _file_digest(path) == digest:
+            card_image_saves.inc(result="unchanged")
+        else:
+            _write_atomic(path, image_bytes)
+            card_image_saves.inc(result="written")
+            # 다른 형식으로 저장되어 있던 이전 이미지는 지웁니다.
+            for _, other in _SIGNATURES + ((None, "webp"),):
+                if other != extension:
+                    self.image_path(user_id, report_id, other).unlink(missing_ok=True)
+
+        self.enqueue_derivatives(digest, image_bytes)
+        return path, digest
+
+    def enqueue_derivatives(self, digest: str, image_bytes: bytes):
+        """파생 이미지가 아직 없으면 생성 작업을 대기열에 넣습니다. 대기열이 가득 차면 건너뜁니다. (다음 저장 때 다시 시도)"""
+        if not (CARD_THUMBNAIL_SIZE or CARD_IMAGE_WEBP) or self._derivatives_exist(digest):
+            card_image_derivatives.inc(result="cached")
+            return
+        with self._lock:
+            if digest in self._queued:
+                return
+            try:
+                self._jobs.put_nowait((digest, image_bytes))
+            except queue.Full:
+                card_image_derivatives.inc(result="dropped")
+                logger.warning(f"카드 이미지 작업 대기열이 가득 차 파생 이미지 생성을 건너뜁니다. sha256: {digest}")
+                return
+            self._queued.add(digest)
+        self._ensure_worker()
+
+    def join(self):
+        """대기 중인 파생 이미지 작업이 모두 끝날 때까지 기다립니다. (벤치마크/종료 처리용)"""
+        self._jobs.join()
+
+    def _derivative_paths(self, digest: str):
+        directory = self.derived_dir(digest)
+        if CARD_THUMBNAIL_SIZE:
+            yield "thumbnail", directory / f"thumb_{CARD_THUMBNAIL_SIZE}.webp"
+        if CARD_IMAGE_WEBP:
+            yield "webp", directory / f"card_{CARD_IMAGE_MAX_DIMENSION or 'full'}.webp"
+
+    def _derivatives_exist(self, digest: str) -> bool:
+        return all(path.exists() for _, path in self._derivative_paths(digest))
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._worker_thread is not None and self._worker_thread.is_alive():
+                return
+            self._worker_thread = threading.Thread(target=self._work_forever, name="card-image-worker", daemon=True)
+            self._worker_thread.start()
+
+    def _work_forever(self):
+        while True:
+            digest, image_bytes = self._jobs.get()
+            try:
+                self._build_derivatives(digest, image_bytes)
+                card_image_derivatives.inc(result="done")
+            except Exception as e:
+                card_image_derivatives.inc(result="failed")
+                logger.error(f"카드 파생 이미지 생성 중 에러 발생. sha256: {digest}: {e}", exc_info=True)
+            finally:
+                with self._lock:
+                    self._queued.discard(digest)
+                self._jobs.task_done()
+
+    def _build_derivatives(self, digest: str, image_bytes: bytes):
+        from PIL import Image # 요청 스레드에서는 이미지를 디코딩하지 않으므로 워커에서만 사용
+
+        targets = [(kind, path) for kind, path in self._derivative_paths(digest) if not path.exists()]
+        if not targets:
+            return
+        self.derived_dir(digest).mkdir(parents=True, exist_ok=True)
+        with Image.open(io.BytesIO(image_bytes)) as image:
+            image.load()
+            for kind, path in targets:
+                if kind == "thumbnail":
+                    derived = image.copy()
+                    derived.thumbnail((CARD_THUMBNAIL_SIZE, CARD_THUMBNAIL_SIZE))
+                else:
+                    derived = image
+                    if CARD_IMAGE_MAX_DIMENSION and max(image.size) > CARD_IMAGE_MAX_DIMENSION:
+                        derived = image.copy()
+                        derived.thumbnail((CARD_IMAGE_MAX_DIMENSION, CARD_IMAGE_MAX_DIMENSION))
+                tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+                derived.save(tmp_path, format="WEBP", quality=CARD_IMAGE_WEBP_QUALITY)
+                os.replace(tmp_path, path)
+        logger.info(f"카드 파생 이미지 생성 완료. sha256: {digest}, {', '.join(kind for kind, _ in targets)}")
+
+card_image_service = CardImageService()
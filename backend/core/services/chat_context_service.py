@@ -0,0 +1,245 @@
+# backend/core/services/chat_context_service.py
+
+import logging
+import os
+import threading
+import uuid
+from collections import OrderedDict, deque
+from datetime import datetime, timezone
+from typing import Deque, List, Optional, Tuple
+
+from core.models.database import db_session
+from core.models.chat_session import ChatSession
+from core.models.message import Message
+from core.models.user import User
+from core.services.data_service import report_card_query
+from core.services.persona_cache import PersonaInfo, persona_cache
+from core.models.report import Report
+from sqlalchemy import func
+
+logger = logging.getLogger(__name__)
+
+CHAT_HISTORY_MAX_TOKENS = int(os.environ.get("CHAT_HISTORY_MAX_TOKENS", "1200")) # 프롬프트에 넣을 이전 대화의 최대 토큰 수(추정)
+CHAT_MESSAGE_FLUSH_SIZE = int(os.environ.get("CHAT_MESSAGE_FLUSH_SIZE", "2")) # 이만큼 쌓이면 message_tbl에 한 번에 저장 (2 = 대화 1턴)
+CHAT_CONTEXT_MAX_ENTRIES = int(os.environ.get("CHAT_CONTEXT_MAX_ENTRIES", "512")) # 프로세스당 보관할 대화 컨텍스트 수
+
+ROLE_USER = "user"
+ROLE_BOT = "bot"
+
+def estimate_tokens(text: str) -> int:
+    """
+    토크나이저 없이 Gemini 토큰 수를 추정합니다. (UTF-8 4바이트당 약 1토큰, 한글은 글자당 약 0.75토큰)
+    프롬프트 크기를 일정하게 유지하기 위한 상한 계산용이므로 정확할 필요는 없습니다.
+    """
+    return len(text.encode("utf-8")) // 4 + 1
+
+class ChatContext:
+    """
+    대화 세션 하나의 프롬프트 재료를 보관합니다.
+
+    - 페르소나 텍스트와 최신 감정 카드는 user_data_version이 바뀔 때(분석 결과 저장, 페르소나 변경)만 다시 조회합니다.
+    - 이전 대화는 추정 토큰 수가 max_history_tokens를 넘지 않도록 오래된 메시지부터 버리는 창(window)으로 유지합니다.
+    - 새 메시지는 pending에 모았다가 flush_size개가 되면 한 번의 INSERT로 message_tbl에 저장합니다.
+    - synced_message_created는 이 창에 반영된 message_tbl의 가장 최근 메시지 시각입니다. DB의 값과 다르면
+      다른 워커 프로세스가 처리한 턴이 있다는 뜻이므로 창을 message_tbl에서 다시 읽습니다.
+    """
+    def __init__(self, chat_session_id: uuid.UUID, user_id, persona: PersonaInfo, latest_card: Optional[dict],
+                 data_version: int, max_history_tokens: int = CHAT_HISTORY_MAX_TOKENS):
+        self.chat_session_id = chat_session_id
+        self.user_id = user_id
+        self.data_version = data_version
+        self.max_history_tokens = max_history_tokens
+        self.history: Deque[Tuple[str, str, int]] = deque() # (role, text, 추정 토큰 수)
+        self.history_tokens = 0
+        self.pending: List[dict] = []
+        self.synced_message_created: Optional[datetime] = None
+        self.lock = threading.Lock()
+        self.set_persona(persona, latest_card, data_version)
+
+    def set_persona(self, persona: PersonaInfo, latest_card: Optional[dict], data_version: int):
+        self.chatbot_id = persona.chatbot_id
+        self.persona_name = persona.chatbot_name
+        self.persona_system_role = persona.chatbot_system_role
+        self.persona_instruction = persona.chatbot_instruction
+        self.latest_card = latest_card
+        self.data_version = data_version
+
+    def push_history(self, role: str, text: str):
+        """대화 창에만 메시지를 추가하고, 토큰 상한을 넘으면 오래된 메시지부터 버립니다. (lock을 잡은 상태에서 호출)"""
+        tokens = estimate_tokens(text)
+        self.history.append((role, text, tokens))
+        self.history_tokens += tokens
+        while self.history_tokens > self.max_history_tokens and len(self.history) > 1:
+            _, _, dropped = self.history.popleft()
+            self.history_tokens -= dropped
+
+    def append(self, role: str, text: str):
+        """메시지를 대화 창과 저장 대기열에 추가합니다. (lock을 잡은 상태에서 호출)"""
+        self.push_history(role, text)
+        self.pending.append({
+            "message_id": uuid.uuid4(),
+            "message_user_id": self.user_id,
+            "message_chat_session_id": self.chat_session_id,
+            "message_role": role,
+            "message_text": text,
+            # 여러 메시지를 한 번에 저장하므로 서버 기본값(now()) 대신 추가된 시각을 기록하여 순서를 보존합니다.
+            "message_created": datetime.now(timezone.utc),
+        })
+
+    def history_lines(self) -> List[str]:
+        return [f"{'사용자' if role == ROLE_USER else self.persona_name}: {text}" for role, text, _ in self.history]
+
+class ChatContextService:
+    """
+    사용자의 대화 컨텍스트(ChatContext)를 chat_session_id별 LRU로 프로세스에 보관합니다.
+
+    message_tbl이 대화 내용의 기준입니다. 요청마다 세션의 가장 최근 메시지 시각을 (버전 조회와 같은 쿼리로) 확인하여,
+    다른 워커 프로세스가 처리한 턴이 있거나 캐시에 없는 세션이면 message_tbl의 최근 메시지로 창을 다시 만듭니다.
+    따라서 다른 워커에 보이려면 턴마다 저장되어야 하며(기본값 flush_size=2), 저장 대기 중인 메시지는
+    LRU에서 밀려날 때와 프로세스 종료 시 flush_all()로 저장합니다.
+    """
+    def __init__(self, max_entries: int = CHAT_CONTEXT_MAX_ENTRIES, flush_size: int = CHAT_MESSAGE_FLUSH_SIZE):
+        self.max_entries = max_entries
+        self.flush_size = flush_size
+        self._contexts: "OrderedDict[uuid.UUID, ChatContext]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_context(self, user_id, chat_session_id: Optional[str] = None) -> ChatContext:
+        """
+        사용자의 대화 컨텍스트를 반환합니다. 캐시에 있고 user_data_version과 최근 메시지 시각이 같으면 조회 1회로 끝납니다.
+        chat_session_id가 없거나 다른 사용자의 세션이거나, 선택한 페르소나가 바뀌었으면 새 대화 세션을 만듭니다.
+        """
+        session_key = self._parse_session_id(chat_session_id)
+        columns = [User.user_data_version, User.selected_chatbot_id]
+        if session_key:
+            # (message_chat_session_id, message_created DESC) 인덱스 한 번 탐색
+            columns.append(db_session.query(func.max(Message.message_created)).filter(
+                Message.message_chat_session_id == session_key
+            ).scalar_subquery().label("last_message_created"))
+        user_state = db_session.query(*columns).filter(User.user_id == user_id).first()
+        data_version = user_state.user_data_version if user_state else 0
+        last_message_created = user_state.last_message_created if user_state and session_key else None
+        with self._lock:
+            context = self._contexts.get(session_key) if session_key else None
+            if context is not None and str(context.user_id) == str(user_id):
+                self._contexts.move_to_end(session_key)
+            else:
+                context = None
+
+        if context is not None and context.data_version == data_version:
+            self._sync_history(context, last_message_created)
+            return context
+
+        persona = persona_cache.effective(user_state.selected_chatbot_id if user_state else None)
+        latest_card = self._latest_card(user_id)
+        if context is not None and context.chatbot_id == persona.chatbot_id:
+            with context.lock:
+                context.set_persona(persona, latest_card, data_version)
+            self._sync_history(context, last_message_created)
+            return context
+
+        chat_session = None
+        if context is not None:
+            self.flush(context) # 페르소나가 바뀌면 이전 대화를 저장하고 새 세션을 시작
+        elif session_key:
+            chat_session = db_session.query(ChatSession).filter(
+                ChatSession.chat_session_id == session_key,
+                ChatSession.chat_user_id == user_id,
+                ChatSession.chat_chatbot_id == persona.chatbot_id
+            ).first()
+        if chat_session is None:
+            # 커밋 후 만료된 속성을 다시 읽지 않도록 id를 직접 만들고 컨텍스트를 먼저 구성합니다.
+            context = ChatContext(uuid.uuid4(), user_id, persona, latest_card, data_version)
+            db_session.add(ChatSession(chat_session_id=context.chat_session_id, chat_user_id=user_id, chat_chatbot_id=persona.chatbot_id))
+            db_session.commit()
+        else:
+            context = ChatContext(chat_session.chat_session_id, user_id, persona, latest_card, data_version)
+            self._load_history(context)
+        self._remember(context)
+        return context
+
+    def record_turn(self, context: ChatContext, user_message: str, reply: str):
+        """사용자 메시지와 답변을 대화 창에 추가하고, 대기열이 flush_size 이상이면 저장합니다."""
+        with context.lock:
+            context.append(ROLE_USER, user_message)
+            context.append(ROLE_BOT, reply)
+            should_flush = len(context.pending) >= self.flush_size
+        if should_flush:
+            self.flush(context)
+
+    def flush(self, context: ChatContext):
+        """저장 대기 중인 메시지를 한 번의 executemany로 message_tbl에 저장합니다. 실패하면 다음 flush에서 다시 시도합니다."""
+        with context.lock:
+            rows, context.pending = context.pending, []
+        if not rows:
+            return
+        try:
+            db_session.execute(Message.__table__.insert(), rows)
+            db_session.commit()
+            with context.lock:
+                context.synced_message_created = max(row["message_created"] for row in rows)
+        except Exception as e:
+            db_session.rollback()
+            logger.error(f"대화 메시지 저장 중 에러 발생. chat_session_id: {context.chat_session_id}: {e}", exc_info=True)
+            with context.lock:
+                context.pending[:0] = rows
+
+    def flush_all(self):
+        with self._lock:
+            contexts = list(self._contexts.values())
+        for context in contexts:
+            self.flush(context)
+
+    def _remember(self, context: ChatContext):
+        with self._lock:
+            self._contexts[context.chat_session_id] = context
+            self._contexts.move_to_end(context.chat_session_id)
+            evicted = []
+            while len(self._contexts) > self.max_entries:
+                evicted.append(self._contexts.popitem(last=False)[1])
+        for old_context in evicted:
+            self.flush(old_context)
+
+    def _sync_history(self, context: ChatContext, last_message_created: Optional[datetime]):
+        """message_tbl의 최근 메시지 시각이 창에 반영된 시각과 다르면(다른 워커가 처리한 턴) 창을 다시 읽습니다."""
+        if last_message_created == context.synced_message_created:
+            return
+        logger.info(f"다른 프로세스에서 저장된 대화가 있어 창을 다시 읽습니다. chat_session_id: {context.chat_session_id}")
+        self._load_history(context)
+
+    def _load_history(self, context: ChatContext):
+        """
+        최근 메시지를 최신순으로 읽어 토큰 상한까지 창을 다시 채웁니다.
+        아직 저장하지 않은 이 프로세스의 메시지(pending)는 DB 메시지 뒤에 이어 붙입니다.
+        """
+        rows = db_session.query(Message.message_role, Message.message_text, Message.message_created).filter(
+            Message.message_chat_session_id == context.chat_session_id
+        ).order_by(Message.message_created.desc()).limit(100).all()
+        with context.lock:
+            context.history.clear()
+            tokens = 0
+            for role, text, _ in rows:
+                text = text or ""
+                estimated = estimate_tokens(text)
+                if tokens + estimated > context.max_history_tokens:
+                    break
+                context.history.appendleft((role, text, estimated))
+                tokens += estimated
+            context.history_tokens = tokens
+            for message in context.pending:
+                context.push_history(message["message_role"], message["message_text"])
+            context.synced_message_created = rows[0].message_created if rows else None
+
+    @staticmethod
+    def _latest_card(user_id) -> Optional[dict]:
+        report = report_card_query().filter(Report.report_user_id == user_id).order_by(Report.report_created.desc()).first()
+        return report.report_card if report else None
+
+    @staticmethod
+    def _parse_session_id(chat_session_id: Optional[str]) -> Optional[uuid.UUID]:
+        if not chat_session_id:
+            return None
+        try:
+            return uuid.UUID(str(chat_session_id))
+        except ValueError:
+            return None
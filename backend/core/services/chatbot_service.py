@@ -1,20 +1,48 @@
 import uuid
+import atexit
 import json
+import logging
 import os
+import time
 from datetime import datetime, timedelta # timedelta 임포트 추가
 from sqlalchemy.exc import IntegrityError
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from core.models import database as db
 from core.models.user import User
 from core.models.report import Report
 from core.models.chatbot_persona import ChatbotPersona
 from core.models.analysis import Analysis
 from core.models.message import Message
+from core.utils.date_intent import parse_date_intent
+from core.services.data_service import DataService
+from core.services.chat_context_service import ChatContext, ChatContextService
+from core.services.persona_cache import PersonaInfo, persona_cache
+from core.utils.tracing import span, tracer
+from core.utils.fake_gemini import FakeGenerativeModel
 
 import google.generativeai as genai
 
+logger = logging.getLogger(__name__)
+
+CHATBOT_FAKE_LLM = os.environ.get("CHATBOT_FAKE_LLM", "0") == "1" # 로컬 개발/부하 테스트용 가짜 모델 사용
+CHATBOT_STREAM_TIMEOUT_SECONDS = float(os.environ.get("CHATBOT_STREAM_TIMEOUT_SECONDS", "60"))
+PAST_SUMMARY_MAX_ENTRIES = 10 # 기간 요약 답변에 나열할 최대 리포트 수 (최신순)
+CHATBOT_ERROR_MESSAGE = "죄송해요, 지금은 답변해 드릴 수 없어요. 잠시 후 다시 시도해 주세요."
+
+chatbot_time_to_first_token = tracer.histogram(
+    "feellog_chatbot_time_to_first_token_seconds", "Time from chatbot request to the first streamed Gemini chunk")
+chatbot_stream_duration = tracer.histogram(
+    "feellog_chatbot_stream_duration_seconds", "Time from chatbot request to the end of the streamed reply")
+
 class ChatbotService:
     def __init__(self):
+        # 대화 세션별 페르소나/감정 카드/최근 대화 캐시 (대기 중인 메시지는 프로세스 종료 시 저장)
+        self.contexts = ChatContextService()
+        self.data_service = DataService()
+        atexit.register(self.contexts.flush_all)
+        if CHATBOT_FAKE_LLM:
+            self.gemini_model = FakeGenerativeModel()
+            return
         try:
             gemini_api_key = os.getenv("GEMINI_API_KEY")
             if not gemini_api_key:
@@ -107,30 +135,29 @@ class ChatbotService:
                         chatbot_age=persona_data["age"],
                         chatbot_identity=persona_data["identity"],
                         chatbot_personality=persona_data["personality"],
-                        chatbot_speech=persona_data["speech"],
+                        chatbot_speech_style=persona_data["speech"],
                         chatbot_system_role=persona_data["system_role"],
                         chatbot_instruction=persona_data["instruction"]
                     )
-                    db.session.add(new_persona)
+                    db.db_session.add(new_persona)
                     print(f"Chatbot persona '{persona_data['name']}' added to DB.")
                 else:
                     print(f"Chatbot persona '{persona_data['name']}' already exists. Skipping.")
+        persona_cache.invalidate() # 다음 조회 때 추가된 페르소나를 포함하여 다시 로드
 
-    def get_persona_by_name(self, name: str) -> Optional[ChatbotPersona]:
-        return ChatbotPersona.query.filter_by(chatbot_name=name).first()
+    def get_persona_by_name(self, name: str) -> Optional[PersonaInfo]:
+        return persona_cache.get_by_name(name)
 
-    def get_all_personas(self) -> List[ChatbotPersona]:
-        return ChatbotPersona.query.all()
+    def get_all_personas(self) -> List[PersonaInfo]:
+        return persona_cache.all()
     
-    def get_user_selected_persona(self, user_id: uuid.UUID) -> Optional[ChatbotPersona]:
+    def get_user_selected_persona(self, user_id: uuid.UUID) -> Optional[PersonaInfo]:
         """
         사용자가 현재 선택한 챗봇 페르소나를 조회합니다.
         선택된 페르소나가 없으면 None을 반환합니다.
         """
-        user = User.query.get(user_id)
-        if user and user.user_selected_chatbot_id:
-            return ChatbotPersona.query.get(user.user_selected_chatbot_id)
-        return None
+        selected_chatbot_id = db.db_session.query(User.selected_chatbot_id).filter(User.user_id == user_id).scalar()
+        return persona_cache.get(selected_chatbot_id)
 
     def set_user_selected_persona(self, user_id: uuid.UUID, chatbot_id: uuid.UUID) -> bool:
         """
@@ -138,102 +165,72 @@ class ChatbotService:
         """
         user = User.query.get(user_id)
         if user:
-            user.user_selected_chatbot_id = chatbot_id
+            user.selected_chatbot_id = chatbot_id
             try:
-                db.session.commit()
+                DataService().bump_user_data_version(user_id) # 챗봇 초기 화면 캐시/대화 컨텍스트 갱신
+                db.db_session.commit()
                 return True
             except Exception as e:
-                db.session.rollback()
+                db.db_session.rollback()
                 print(f"Error setting user selected persona for user {user_id}: {e}")
                 return False
         return False
 
-    def get_effective_persona(self, user_id: Optional[uuid.UUID]) -> ChatbotPersona:
+    def get_effective_persona(self, user_id: Optional[uuid.UUID]) -> PersonaInfo:
         """
         사용자 ID에 따라 유효한 챗봇 페르소나를 결정합니다.
         1. 사용자가 선택한 페르소나
         2. '도담이' 페르소나 (기본값)
         3. 첫 번째 사용 가능한 페르소나
         """
+        selected_chatbot_id = None
         if user_id:
-            selected_persona = self.get_user_selected_persona(user_id)
-            if selected_persona:
-                return selected_persona
-
-        # If no user-selected, try to get '도담이' as default
-        dodami_persona = self.get_persona_by_name("도담이")
-        if dodami_persona:
-            return dodami_persona
-
-        # Fallback to the first available persona
-        first_persona = ChatbotPersona.query.first()
-        if first_persona:
-            return first_persona
-        
-        raise ValueError("No chatbot personas found in the database.")
+            selected_chatbot_id = db.db_session.query(User.selected_chatbot_id).filter(User.user_id == user_id).scalar()
+        return persona_cache.effective(selected_chatbot_id)
 
 
     def _get_past_emotions_summary(self, user_id: uuid.UUID, query: str) -> Optional[str]:
         """
         사용자의 과거 감정 기록을 조회하여 요약합니다.
-        '어제 감정 어땠어?', '지난주 행복했어?', '8월 1일 감정 알려줘' 등의 질문에 대응.
+        '어제 감정 어땠어?', '지난주 행복했어?', '8월 1일 감정 알려줘', '최근 3일 어땠어?' 등의 질문에 대응.
+        날짜 표현은 parse_date_intent()로 기간으로 바꾸고, 리포트 카드의 감정/온도 두 값만 한 번의 쿼리로 조회합니다.
+        기간 요약은 최근 PAST_SUMMARY_MAX_ENTRIES건만 가져오고 나머지는 건수(total_count)로만 표시합니다.
         """
-        current_date = datetime.now().date()
-        target_date: Optional[datetime] = None
-        
-        if "어제" in query or "지난 날" in query:
-            target_date = current_date - timedelta(days=1)
-        elif "지난주" in query:
-            start_of_last_week = current_date - timedelta(days=current_date.weekday() + 7)
-            end_of_last_week = start_of_last_week + timedelta(days=6)
-            reports_in_range = Report.query.filter(Report.report_user_id == user_id, db.func.date(Report.report_created) >= start_of_last_week, db.func.date(Report.report_created) <= end_of_last_week).order_by(Report.report_created.desc()).all()
-            if reports_in_range:
-                summary_parts = []
-                for r in reports_in_range:
-                    card_data = r.report_card
-                    summary_parts.append(f"{r.report_created.strftime('%Y년 %m월 %d일')}: {card_data.get('dominant_overall_emotion', 'N/A')} ({card_data.get('sentiment_score', 'N/A')}점)")
-                return "지난주 감정 요약: " + ", ".join(summary_parts)
-            else:
-                return "지난주에는 기록된 감정이 없습니다."
-        elif "감정" in query and any(d in query for d in ["오늘", "이번 달", "월", "일"]):
-            if "오늘" in query:
-                target_date = current_date
-        
-        import re
-        match = re.search(r'(\d{1,2})월 (\d{1,2})일', query)
-        if match:
-            month = int(match.group(1))
-            day = int(match.group(2))
-            try:
-                target_date = datetime(current_date.year, month, day).date()
-            except ValueError:
-                target_date = None
-
-        if target_date:
-            report = Report.query.filter(Report.report_user_id == user_id, db.func.date(Report.report_created) == target_date).order_by(Report.report_created.desc()).first()
-            if report:
-                card_data = report.report_card
-                return f"{target_date.strftime('%Y년 %m월 %d일')}에는 {card_data.get('dominant_overall_emotion', 'N/A')} 감정이 주를 이루었고, 감정 온도는 {card_data.get('sentiment_score', 'N/A')}점이었어요."
-            else:
-                return f"{target_date.strftime('%Y년 %m월 %d일')}에 기록된 감정은 없습니다."
-        
-        return None
-    
-    def generate_chatbot_response(self, user_id: Optional[uuid.UUID], user_message: str, current_sentiment: Dict = None) -> str:
-        if not self.gemini_model:
-            return "챗봇 서비스를 이용할 수 없습니다. API 키를 확인해주세요."
+        intent = parse_date_intent(query, datetime.now().date())
+        if intent is None:
+            return None
 
-        try:
-            persona = self.get_effective_persona(user_id) # 유효한 페르소나 사용
-        except ValueError as e:
-            return str(e)
+        if intent.is_single_day:
+            rows = self.data_service.get_card_emotions_in_range(user_id, intent.date_range, limit=1)
+            if not rows:
+                return f"{intent.label}에 기록된 감정은 없습니다."
+            row = rows[0]
+            return f"{intent.label}에는 {row.dominant_emotion or 'N/A'} 감정이 주를 이루었고, 감정 온도는 {'N/A' if row.sentiment_score is None else row.sentiment_score}점이었어요."
 
-        past_emotion_summary = None
-        if user_id:
-            past_emotion_summary = self._get_past_emotions_summary(user_id, user_message.lower())
-            if past_emotion_summary:
-                return f"{persona.chatbot_name} : {past_emotion_summary}"
+        rows = self.data_service.get_card_emotions_in_range(user_id, intent.date_range, limit=PAST_SUMMARY_MAX_ENTRIES)
+        if not rows:
+            return f"{intent.label}에는 기록된 감정이 없습니다."
+        summary_parts = [
+            f"{row.report_created.strftime('%Y년 %m월 %d일')}: {row.dominant_emotion or 'N/A'} ({'N/A' if row.sentiment_score is None else row.sentiment_score}점)"
+            for row in rows
+        ]
+        if rows[0].total_count > len(rows):
+            summary_parts.append(f"외 {rows[0].total_count - len(rows)}건")
+        return f"{intent.label} 감정 요약: " + ", ".join(summary_parts)
+    
+    def build_chat_prompt(self, context: ChatContext, user_message: str,
+                          current_sentiment: Dict = None) -> Tuple[Optional[str], Optional[str]]:
+        """
+        (바로 보낼 답변, Gemini 프롬프트) 중 하나를 반환합니다.
+        과거 감정 조회처럼 DB만으로 답할 수 있으면 답변을, 아니면 Gemini에 보낼 프롬프트를 반환합니다.
+        페르소나와 최신 감정 카드, 이전 대화는 context에 캐시된 값을 사용하므로, 스트리밍 중에는 DB 연결을 잡고 있지 않아도 됩니다.
+        current_sentiment를 생략하면 가장 최근 리포트 카드를 현재 감정 상태로 사용합니다.
+        """
+        past_emotion_summary = self._get_past_emotions_summary(context.user_id, user_message.lower())
+        if past_emotion_summary:
+            return f"{context.persona_name} : {past_emotion_summary}", None
 
+        current_sentiment = current_sentiment or context.latest_card
         current_sentiment_info = ""
         if current_sentiment:
             current_sentiment_info = f"""
@@ -244,21 +241,67 @@ class ChatbotService:
             감정 분포: {json.dumps(current_sentiment.get('emotion_distribution', []), ensure_ascii=False)}
             """
 
+        with context.lock:
+            history = "\n        ".join(context.history_lines())
+
         prompt = f"""
-        {persona.chatbot_system_role}
+        {context.persona_system_role}
 
         추가 지시사항 (Instruction):
-        {persona.chatbot_instruction}
+        {context.persona_instruction}
 
         --- 대화의 맥락 ---
-        사용자: {user_message}
         {current_sentiment_info}
+        {history}
+        사용자: {user_message}
+
+        {context.persona_name}: """
+        return None, prompt
+
+    def generate_chatbot_response(self, context: ChatContext, user_message: str, current_sentiment: Dict = None) -> str:
+        if not self.gemini_model:
+            return "챗봇 서비스를 이용할 수 없습니다. API 키를 확인해주세요."
 
-        {persona.chatbot_name}: """
-        
+        reply, prompt = self.build_chat_prompt(context, user_message, current_sentiment)
+        if reply is None:
+            try:
+                with span("gemini_generate", caller="chatbot"):
+                    response = self.gemini_model.generate_content(prompt)
+                reply = response.text.strip()
+            except Exception as e:
+                logger.error(f"Gemini API 호출 중 에러 발생: {e}", exc_info=True)
+                return CHATBOT_ERROR_MESSAGE
+        self.contexts.record_turn(context, user_message, reply)
+        return reply
+
+    @staticmethod
+    def _chunk_text(chunk) -> str:
         try:
-            response = self.gemini_model.generate_content(prompt)
-            return response.text.strip()
-        except Exception as e:
-            print(f"Gemini API 호출 중 에러 발생: {e}")
-            return "죄송해요, 지금은 답변해 드릴 수 없어요. 잠시 후 다시 시도해 주세요."
\ No newline at end of file
+            return chunk.text or ""
+        except ValueError:
+            return "" # 안전 필터 등으로 텍스트가 없는 조각
+
+    def stream_chatbot_response(self, prompt: str, started: Optional[float] = None) -> Iterator[str]:
+        """
+        build_chat_prompt()가 만든 프롬프트로 Gemini 스트리밍 API를 호출하여 받은 텍스트 조각을 차례로 반환합니다.
+        started(time.monotonic())부터 첫 조각까지의 시간과 전체 시간을 지표로 기록하며, 에러는 호출한 쪽으로 전달합니다.
+        span은 첫 조각을 받을 때까지만 기록합니다. (yield 사이에 현재 span이 남아 있지 않도록)
+        """
+        started = time.monotonic() if started is None else started
+        text = ""
+        with span("gemini_first_token", caller="chatbot"):
+            chunks = iter(self.gemini_model.generate_content(
+                prompt, stream=True, request_options={"timeout": CHATBOT_STREAM_TIMEOUT_SECONDS}
+            ))
+            for chunk in chunks:
+                text = self._chunk_text(chunk)
+                if text:
+                    break
+        if text:
+            chatbot_time_to_first_token.observe(time.monotonic() - started)
+            yield text
+        for chunk in chunks:
+            text = self._chunk_text(chunk)
+            if text:
+                yield text
+        chatbot_stream_duration.observe(time.monotonic() - started)
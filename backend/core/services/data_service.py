@@ -1,18 +1,57 @@
 # backend/core/services/data_service.py
+from collections import namedtuple
 from uuid import UUID
-from datetime import date
+from datetime import date, datetime
 from core.models.database import db_session
 from core.models.user import User
 from core.models.report import Report
 from core.models.records import Records
 from core.models.analysis import Analysis
-from core.models.chatbot_persona import ChatbotPersona
+from core.models.segment import Segment
+from core.models.emotion_rollup import EmotionDailyRollup
+from core.services.event_service import analysis_events
+from core.services.persona_cache import PersonaInfo, persona_cache
+from core.utils.date_range import DateRange, day_range, range_filter
+from core.utils.tracing import traced
+from sqlalchemy import func, case, cast, Float
+from sqlalchemy.orm import load_only, undefer
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 import logging
-from collections import defaultdict
-from typing import Union
+import numpy as np
+from typing import List, Optional, Union
 
 logger = logging.getLogger(__name__)
 
+def _pack_distributions(distributions: list):
+    """
+    세그먼트별 감정 분포 dict 리스트를 (감정 × 세그먼트) 형태의 NumPy 배열로 변환합니다.
+    감정 순서는 세그먼트에서 처음 등장한 순서를 따르며, 누락된 감정은 0.0으로 채웁니다.
+    """
+    labels = list(dict.fromkeys(label for dist in distributions for label in dist))
+    if not distributions or not labels:
+        return labels, np.zeros((len(labels), 0))
+    # 세그먼트 × 감정으로 만든 뒤 전치하여, 세그먼트 축 합산이 기존 순차 합산과 같은 순서로 이루어지도록 합니다.
+    matrix = np.array([[dist.get(label, 0.0) for label in labels] for dist in distributions], dtype=np.float64).T
+    return labels, matrix
+
+def _mean_distribution(distributions: list) -> dict:
+    """
+    세그먼트별 분포의 감정별 평균을 계산합니다.
+    sum()은 pairwise 합산이라 마지막 자리가 달라질 수 있으므로, 세그먼트 순서대로 더하는 cumsum으로 기존 결과와 같은 값을 냅니다.
+    """
+    labels, matrix = _pack_distributions(distributions)
+    if matrix.shape[1] == 0:
+        return {}
+    means = np.cumsum(matrix, axis=1)[:, -1] / matrix.shape[1]
+    return dict(zip(labels, means.tolist()))
+
+def _dominant(distribution: dict, default: str = "중립") -> str:
+    """분포에서 가장 높은 값을 가진 감정을 반환합니다. 동점이면 먼저 등장한 감정을 선택합니다."""
+    if not distribution:
+        return default
+    labels = list(distribution)
+    return labels[int(np.argmax(np.fromiter(distribution.values(), dtype=np.float64, count=len(labels))))]
+
 def _process_raw_analysis_data(analysis_data: dict) -> dict:
     """analyzer.py의 원본 분석 결과를 DB 스키마에 맞게 가공합니다."""
     
@@ -20,63 +59,44 @@ def _process_raw_analysis_data(analysis_data: dict) -> dict:
     if not segments:
         return {}
 
-    # 1. analysis_face_emotions_rates 계산
-    face_emotion_sums = defaultdict(float)
-    valid_face_segments = 0
-    for segment in segments:
-        if 'visual_analysis' in segment and 'distribution' in segment['visual_analysis']:
-            valid_face_segments += 1
-            for emotion, score in segment['visual_analysis']['distribution'].items():
-                face_emotion_sums[emotion] += score
-    
-    mean_face_distribution = {emotion: total / valid_face_segments for emotion, total in face_emotion_sums.items()} if valid_face_segments > 0 else {}
-    mean_dominant_face_emotion = max(mean_face_distribution, key=mean_face_distribution.get) if mean_face_distribution else "중립"
+    # 1. 세그먼트를 한 번만 순회하며 분포 수집
+    face_distributions = []
+    text_sentiments = []
+    text_emotions = []
+    voice_distributions = []
+
+    for s in segments:
+        visual_analysis = s.get("visual_analysis")
+        audio_analysis = s.get('audio_analysis', {})
+
+        if 'visual_analysis' in s and 'distribution' in s['visual_analysis']:
+            face_distributions.append(s['visual_analysis']['distribution'])
+
+        if 'text_based_analysis' in audio_analysis:
+            text_sentiments.append(audio_analysis['text_based_analysis'].get('sentiment', {}))
+            text_emotions.append(audio_analysis['text_based_analysis'].get('emotions', {}))
+
+        if 'voice_based_analysis' in audio_analysis and 'error' not in audio_analysis['voice_based_analysis']:
+            voice_distributions.append(audio_analysis['voice_based_analysis'].get('distribution', {}))
+
+    # 2. analysis_face_emotions_rates 계산
+    mean_face_distribution = _mean_distribution(face_distributions)
+    mean_dominant_face_emotion = _dominant(mean_face_distribution)
     
     analysis_face_emotions_rates = {
         "mean_dominant_emotion": mean_dominant_face_emotion,
         "mean_distribution": mean_face_distribution
     }
 
-    # 2. analysis_face_emotions_time_series_rates 생성
-    analysis_face_emotions_time_series_rates = [
-        {
-            "segment_id": s.get("segment_id"),
-            "start_time": s.get("start_time"),
-            "end_time": s.get("end_time"),
-            "transcribed_text": s.get("transcribed_text"),
-            "visual_analysis": s.get("visual_analysis")
-        } for s in segments
-    ]
-
     # 3. analysis_voice_emotions_rates 계산
-    text_sentiment_sums = defaultdict(float)
-    text_emotion_sums = defaultdict(float)
-    voice_distribution_sums = defaultdict(float)
-    valid_text_segments = 0
-    valid_voice_segments = 0
-
-    for segment in segments:
-        audio_analysis = segment.get('audio_analysis', {})
-        if 'text_based_analysis' in audio_analysis:
-            valid_text_segments += 1
-            for sentiment, score in audio_analysis['text_based_analysis'].get('sentiment', {}).items():
-                text_sentiment_sums[sentiment] += score
-            for emotion, score in audio_analysis['text_based_analysis'].get('emotions', {}).items():
-                text_emotion_sums[emotion] += score
-        
-        if 'voice_based_analysis' in audio_analysis and 'error' not in audio_analysis['voice_based_analysis']:
-            valid_voice_segments += 1
-            for emotion, score in audio_analysis['voice_based_analysis'].get('distribution', {}).items():
-                voice_distribution_sums[emotion] += score
-
-    mean_text_sentiment = {s: t / valid_text_segments for s, t in text_sentiment_sums.items()} if valid_text_segments > 0 else {}
-    mean_text_emotions = {e: t / valid_text_segments for e, t in text_emotion_sums.items()} if valid_text_segments > 0 else {}
-    mean_voice_distribution = {e: t / valid_voice_segments for e, t in voice_distribution_sums.items()} if valid_voice_segments > 0 else {}
+    mean_text_sentiment = _mean_distribution(text_sentiments)
+    mean_text_emotions = _mean_distribution(text_emotions)
+    mean_voice_distribution = _mean_distribution(voice_distributions)
     
     analysis_voice_emotions_rates = {
-        "mean_dominant_sentiment": max(mean_text_sentiment, key=mean_text_sentiment.get) if mean_text_sentiment else "중립",
-        "mean_dominant_emotion": max(mean_text_emotions, key=mean_text_emotions.get) if mean_text_emotions else "중립",
-        "mean_dominant_distribution": max(mean_voice_distribution, key=mean_voice_distribution.get) if mean_voice_distribution else "중립",
+        "mean_dominant_sentiment": _dominant(mean_text_sentiment),
+        "mean_dominant_emotion": _dominant(mean_text_emotions),
+        "mean_dominant_distribution": _dominant(mean_voice_distribution),
         "mean_text_based_analysis": {
             "mean_sentiment": mean_text_sentiment,
             "mean_emotions": mean_text_emotions
@@ -86,40 +106,27 @@ def _process_raw_analysis_data(analysis_data: dict) -> dict:
         }
     }
 
-    # 4. analysis_voice_emotions_time_series_rates 생성
-    analysis_voice_emotions_time_series_rates = [
-        {
-            "segment_id": s.get("segment_id"),
-            "start_time": s.get("start_time"),
-            "end_time": s.get("end_time"),
-            "transcribed_text": s.get("transcribed_text"),
-            "audio_analysis": s.get("audio_analysis")
-        } for s in segments
-    ]
-
-    # 5. analysis_face_emotions_score 계산
-    face_score_emotion = max(mean_face_distribution, key=mean_face_distribution.get) if mean_face_distribution else "중립"
-    face_score_value = mean_face_distribution.get(face_score_emotion, 0)
-    analysis_face_emotions_score = {"emotion": face_score_emotion, "score": face_score_value}
-
-    # 6. analysis_voice_emotions_score 계산
-    text_emotions = analysis_voice_emotions_rates['mean_text_based_analysis']['mean_emotions']
-    voice_emotions = analysis_voice_emotions_rates['mean_voice_based_analysis']['mean_distribution']
-    
-    text_emotion = max(text_emotions, key=text_emotions.get) if text_emotions else "중립"
-    text_score = text_emotions.get(text_emotion, 0)
+    # 4. analysis_face_emotions_score 계산
+    analysis_face_emotions_score = {
+        "emotion": mean_dominant_face_emotion,
+        "score": mean_face_distribution.get(mean_dominant_face_emotion, 0)
+    }
+
+    # 5. analysis_voice_emotions_score 계산 (텍스트 0.7 / 음성 0.3 가중치)
+    text_emotion = analysis_voice_emotions_rates["mean_dominant_emotion"]
+    text_score = mean_text_emotions.get(text_emotion, 0)
     if text_emotion == "상처":
         text_emotion = "슬픔" # 라벨링만 슬픔으로 변경
 
-    voice_emotion = max(voice_emotions, key=voice_emotions.get) if voice_emotions else "중립"
-    voice_score = voice_emotions.get(voice_emotion, 0)
+    voice_emotion = analysis_voice_emotions_rates["mean_dominant_distribution"]
+    voice_score = mean_voice_distribution.get(voice_emotion, 0)
 
     if (text_score * 0.7) >= (voice_score * 0.3):
         analysis_voice_emotions_score = {"emotion": text_emotion, "score": text_score}
     else:
         analysis_voice_emotions_score = {"emotion": voice_emotion, "score": voice_score}
 
-    # 7. analysis_majority_emotion 계산
+    # 6. analysis_majority_emotion 계산 (얼굴 0.6 / 음성 0.4 가중치)
     face_final_score = analysis_face_emotions_score['score']
     voice_final_score = analysis_voice_emotions_score['score']
 
@@ -130,20 +137,129 @@ def _process_raw_analysis_data(analysis_data: dict) -> dict:
 
     return {
         "analysis_face_emotions_rates": analysis_face_emotions_rates,
-        "analysis_face_emotions_time_series_rates": analysis_face_emotions_time_series_rates,
         "analysis_voice_emotions_rates": analysis_voice_emotions_rates,
-        "analysis_voice_emotions_time_series_rates": analysis_voice_emotions_time_series_rates,
         "analysis_face_emotions_score": analysis_face_emotions_score,
         "analysis_voice_emotions_score": analysis_voice_emotions_score,
         "analysis_majority_emotion": analysis_majority_emotion
     }
 
+NEGATIVE_EMOTIONS = ['분노', '불안', '상처', '슬픔']
+
+# 구간 목록 조회 시 항상 필요한 컬럼과, 얼굴/음성 부분을 복원할 때만 필요한 컬럼
+SEGMENT_BASE_COLUMNS = (Segment.segment_number, Segment.segment_start_ms, Segment.segment_end_ms, Segment.segment_text, Segment.segment_extra)
+SEGMENT_VISUAL_COLUMNS = (Segment.segment_face_dominant, Segment.segment_face)
+SEGMENT_AUDIO_COLUMNS = (Segment.segment_text_sentiment, Segment.segment_text_emotions, Segment.segment_voice)
+
+def load_segments(analysis_id: UUID, visual: bool = True, audio: bool = True) -> list:
+    """segment_tbl에서 필요한 컬럼만 조회하여 segment_analyses 항목 형태로 복원합니다."""
+    columns = SEGMENT_BASE_COLUMNS + (SEGMENT_VISUAL_COLUMNS if visual else ()) + (SEGMENT_AUDIO_COLUMNS if audio else ())
+    rows = db_session.query(*columns).filter(
+        Segment.segment_analysis_id == analysis_id
+    ).order_by(Segment.segment_index).all()
+    return [Segment.to_segment_dict(row, visual=visual, audio=audio) for row in rows]
+
+def _detail_without_segments(detail: dict) -> dict:
+    """
+    report_detail에서 segment_analyses를 뺀 나머지를 반환합니다. 구간 결과는 segment_tbl에 저장하고,
+    구간별 성능 측정값은 performance.segment_processing에 같은 값이 있으므로 따로 보관하지 않습니다.
+    """
+    return {key: value for key, value in detail.items() if key != 'segment_analyses'}
+
+# 목록/카드 화면에서 사용하는 리포트 컬럼. report_detail 등 대용량 JSONB는 제외합니다.
+REPORT_CARD_COLUMNS = (
+    Report.report_id,
+    Report.report_user_id,
+    Report.report_created,
+    Report.report_summary,
+    Report.report_card,
+)
+
+def report_card_query():
+    """카드용 컬럼만 로드하는 Report 쿼리를 반환합니다."""
+    return db_session.query(Report).options(load_only(*REPORT_CARD_COLUMNS))
+
+# 분석 상태 조회(폴링/SSE)에서 사용하는 레코드 컬럼
+RECORD_STATUS_COLUMNS = (
+    Records.record_id,
+    Records.record_analysis_status,
+    Records.record_stage,
+    Records.record_progress_percent,
+    Records.record_progress_current,
+    Records.record_progress_total,
+    Records.record_eta_seconds,
+    Records.record_error,
+)
+
+def record_status_dict(record) -> dict:
+    """RECORD_STATUS_COLUMNS 행을 API 응답 형식으로 변환합니다."""
+    return {
+        "record_id": str(record.record_id),
+        "status": record.record_analysis_status,
+        "stage": record.record_stage,
+        "percent": record.record_progress_percent,
+        "current": record.record_progress_current,
+        "total": record.record_progress_total,
+        "eta_seconds": record.record_eta_seconds,
+        "error": record.record_error,
+    }
+
+def _score_value(score) -> float:
+    """{"emotion": ..., "score": ...} 형태 또는 숫자 형태의 점수에서 값을 꺼냅니다."""
+    if isinstance(score, dict):
+        return score.get('score', 0.0)
+    if isinstance(score, (int, float)):
+        return score
+    return 0.0
+
+def _emotion_rates(rates: dict) -> dict:
+    """analysis_*_emotions_rates에서 감정별 평균 분포를 꺼냅니다."""
+    if not rates:
+        return {}
+    if 'mean_distribution' in rates:
+        return rates['mean_distribution'] or {}
+    if 'mean_voice_based_analysis' in rates:
+        return rates['mean_voice_based_analysis'].get('mean_distribution', {}) or {}
+    return rates
+
+# 월간 트렌드에 쓰는 일간 집계 한 행. 집계 테이블 조회와 원본 재계산 모두 이 형태로 반환합니다.
+DailyRollup = namedtuple('DailyRollup', [
+    'rollup_date', 'rollup_report_count', 'rollup_sentiment_score_sum', 'rollup_positive_sum', 'rollup_negative_sum'
+])
+
+def _rollup_contribution(processed_data: dict) -> dict:
+    """리포트 한 건이 일간 집계에 더하는 감정 온도, 긍정, 부정 점수를 계산합니다."""
+    face_score = _score_value(processed_data.get('analysis_face_emotions_score'))
+    voice_score = _score_value(processed_data.get('analysis_voice_emotions_score'))
+    sentiment_score = (face_score + voice_score) / 2 if (face_score + voice_score) > 0 else 0
+
+    face_rates = _emotion_rates(processed_data.get('analysis_face_emotions_rates'))
+    voice_rates = _emotion_rates(processed_data.get('analysis_voice_emotions_rates'))
+    positive = (face_rates.get('기쁨', 0.0) + voice_rates.get('기쁨', 0.0)) / 2
+    negative = (sum(face_rates.get(e, 0.0) for e in NEGATIVE_EMOTIONS) + sum(voice_rates.get(e, 0.0) for e in NEGATIVE_EMOTIONS)) / 2
+
+    return {"sentiment_score": sentiment_score, "positive": positive, "negative": negative}
+
 class DataService:
     def get_user_by_id(self, user_id: UUID) -> User:
         return db_session.query(User).filter(User.user_id == user_id).first()
 
+    def get_user_data_version(self, user_id: UUID) -> int:
+        """사용자 데이터 버전을 조회합니다. (응답 캐시 키/ETag용, 기본키 조회 1회)"""
+        return db_session.query(User.user_data_version).filter(User.user_id == user_id).scalar() or 0
+
+    def bump_user_data_version(self, user_id: UUID):
+        """
+        현재 트랜잭션에서 사용자 데이터 버전을 1 올립니다. 호출한 쪽에서 commit해야 반영되므로
+        커밋 전에는 이전 버전의 캐시 응답이, 커밋 후에는 새로 계산한 응답이 사용됩니다.
+        """
+        db_session.query(User).filter(User.user_id == user_id).update(
+            # user_account_updated의 onupdate(now())가 적용되지 않도록 기존 값을 그대로 지정
+            {User.user_data_version: User.user_data_version + 1, User.user_account_updated: User.user_account_updated},
+            synchronize_session=False
+        )
+
     def get_recent_reports(self, user_id: UUID, limit: int = 5):
-        return db_session.query(Report).filter(Report.report_user_id == user_id).order_by(Report.report_created.desc()).limit(limit).all()
+        return report_card_query().filter(Report.report_user_id == user_id).order_by(Report.report_created.desc()).limit(limit).all()
 
     def save_video_record(self, user_id: str, video_path: str) -> Union[UUID, None]:
         # 비디오 길이를 0으로 임시 저장하고, 분석 상태를 'processing'으로 설정
@@ -157,6 +273,13 @@ class DataService:
         db_session.commit()
         return new_record.record_id
 
+    def get_latest_record_status(self, user_id: UUID):
+        """사용자의 가장 최근 레코드의 분석 상태/진행 컬럼만 조회합니다."""
+        return db_session.query(*RECORD_STATUS_COLUMNS).filter(
+            Records.record_user_id == user_id
+        ).order_by(Records.record_created.desc()).first()
+
+    @traced("db_save_analysis_results")
     def save_analysis_results(self, user_id: str, record_id: str, analysis_data: dict, report_data: dict):
         try:
             # 원본 데이터를 가공하는 함수 호출
@@ -166,9 +289,7 @@ class DataService:
             new_analysis = Analysis(
                 analysis_record_id=record_id,
                 analysis_face_emotions_rates=processed_data.get('analysis_face_emotions_rates'),
-                analysis_face_emotions_time_series_rates=processed_data.get('analysis_face_emotions_time_series_rates'),
                 analysis_voice_emotions_rates=processed_data.get('analysis_voice_emotions_rates'),
-                analysis_voice_emotions_time_series_rates=processed_data.get('analysis_voice_emotions_time_series_rates'),
                 analysis_face_emotions_score=processed_data.get('analysis_face_emotions_score'),
                 analysis_voice_emotions_score=processed_data.get('analysis_voice_emotions_score'),
                 analysis_majority_emotion=processed_data.get('analysis_majority_emotion')
@@ -176,20 +297,42 @@ class DataService:
             db_session.add(new_analysis)
             db_session.flush()
 
+            # 구간별 결과는 segment_tbl에 한 번의 executemany로 저장합니다.
+            segment_rows = Segment.rows_from_analysis(new_analysis.analysis_id, analysis_data.get('segment_analyses', []))
+            if segment_rows:
+                db_session.execute(Segment.__table__.insert(), segment_rows)
+
             # 2. Report 테이블에 결과 저장
             new_report = Report(
                 report_analysis_id=new_analysis.analysis_id,
                 report_user_id=user_id,
-                report_detail=report_data.get('detail', {}),
+                report_detail=_detail_without_segments(report_data.get('detail', {})),
                 report_summary=report_data.get('summary', {}),
                 report_card=report_data.get('card', {})
             )
             db_session.add(new_report)
+            db_session.flush()
+
+            # 3. 일간 감정 집계 테이블 갱신
+            self._update_daily_rollup(user_id, new_report.report_created.date(), processed_data)
             
-            # 3. Records 테이블의 상태를 'completed'로 업데이트
+            # 4. Records 테이블의 상태를 'completed'로 업데이트
             record = db_session.query(Records).filter(Records.record_id == record_id).first()
             if record:
                 record.record_analysis_status = 'completed'
+                record.record_stage = 'completed'
+                record.record_progress_percent = 100
+                record.record_eta_seconds = 0
+                record.record_heartbeat = func.now()
+
+            # 5. 사용자 응답 캐시 무효화 (리포트/트렌드/챗봇 초기 화면)
+            self.bump_user_data_version(user_id)
+
+            # 6. 완료 이벤트 발행 (커밋 시점에 구독 중인 클라이언트로 전달됨)
+            analysis_events.publish(user_id, 'completed', {
+                "record_id": str(record_id),
+                "report_id": str(new_report.report_id)
+            })
 
             db_session.commit()
             logger.info(f"분석 및 리포트 결과 저장 성공. record_id: {record_id}")
@@ -199,30 +342,271 @@ class DataService:
             logger.error(f"분석 결과 저장 중 에러 발생: {e}", exc_info=True)
             raise
 
+    def update_record_progress(self, user_id: str, record_id: str, stage: str, percent: Optional[int] = None,
+                               current: Optional[int] = None, total: Optional[int] = None, eta_seconds: Optional[int] = None):
+        """
+        분석 진행 상황을 Records 행에 기록하고 heartbeat를 갱신한 뒤, 진행 이벤트를 발행합니다.
+        SELECT 없이 UPDATE 한 번으로 처리하며, 이미 종료된(completed/failed) 레코드는 갱신하지 않습니다.
+        """
+        values = {
+            Records.record_stage: stage,
+            Records.record_progress_current: current,
+            Records.record_progress_total: total,
+            Records.record_eta_seconds: eta_seconds,
+            Records.record_heartbeat: func.now(),
+        }
+        if percent is not None:
+            values[Records.record_progress_percent] = percent
+        try:
+            updated = db_session.query(Records).filter(
+                Records.record_id == record_id,
+                Records.record_analysis_status == 'processing'
+            ).update(values, synchronize_session=False)
+            if updated:
+                analysis_events.publish(user_id, 'progress', {
+                    "record_id": str(record_id),
+                    "stage": stage,
+                    "percent": percent,
+                    "current": current,
+                    "total": total,
+                    "eta_seconds": eta_seconds
+                })
+            db_session.commit()
+            return bool(updated)
+        except Exception as e:
+            db_session.rollback()
+            logger.error(f"분석 진행 상황 저장 중 에러 발생: {e}", exc_info=True)
+            raise
+
+    def touch_record_heartbeat(self, record_id: str) -> bool:
+        """분석 프로세스의 생존 신호로 heartbeat 시각만 갱신합니다."""
+        try:
+            updated = db_session.query(Records).filter(
+                Records.record_id == record_id,
+                Records.record_analysis_status == 'processing'
+            ).update({Records.record_heartbeat: func.now()}, synchronize_session=False)
+            db_session.commit()
+            return bool(updated)
+        except Exception as e:
+            db_session.rollback()
+            logger.error(f"분석 heartbeat 갱신 중 에러 발생: {e}", exc_info=True)
+            raise
+
+    def _update_daily_rollup(self, user_id: str, report_date: date, processed_data: dict):
+        """리포트 한 건의 점수를 (user_id, report_date) 일간 집계 행에 누적합니다."""
+        contribution = _rollup_contribution(processed_data)
+        stmt = pg_insert(EmotionDailyRollup).values(
+            rollup_user_id=user_id,
+            rollup_date=report_date,
+            rollup_report_count=1,
+            rollup_sentiment_score_sum=contribution['sentiment_score'],
+            rollup_positive_sum=contribution['positive'],
+            rollup_negative_sum=contribution['negative']
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[EmotionDailyRollup.rollup_user_id, EmotionDailyRollup.rollup_date],
+            set_={
+                "rollup_report_count": EmotionDailyRollup.rollup_report_count + 1,
+                "rollup_sentiment_score_sum": EmotionDailyRollup.rollup_sentiment_score_sum + stmt.excluded.rollup_sentiment_score_sum,
+                "rollup_positive_sum": EmotionDailyRollup.rollup_positive_sum + stmt.excluded.rollup_positive_sum,
+                "rollup_negative_sum": EmotionDailyRollup.rollup_negative_sum + stmt.excluded.rollup_negative_sum,
+                "rollup_updated": func.now()
+            }
+        )
+        db_session.execute(stmt)
+
+    def get_daily_rollups(self, user_id: UUID, date_range: DateRange) -> List[DailyRollup]:
+        """[start, end) 구간의 일간 감정 집계 행을 날짜순으로 조회합니다."""
+        rows = db_session.query(*(getattr(EmotionDailyRollup, field) for field in DailyRollup._fields)).filter(
+            EmotionDailyRollup.rollup_user_id == user_id,
+            *range_filter(EmotionDailyRollup.rollup_date, date_range)
+        ).order_by(EmotionDailyRollup.rollup_date.asc()).all()
+        return [DailyRollup(*row) for row in rows]
+
+    def compute_daily_rollups(self, user_id: UUID, date_range: DateRange) -> List[DailyRollup]:
+        """
+        [start, end) 구간의 일간 집계를 리포트/분석 원본에서 계산하여 날짜순으로 반환합니다. (쓰기 없음)
+        분석 테이블에서는 점수 계산에 필요한 4개 컬럼만 조회합니다.
+        """
+        rows = db_session.query(
+            Report.report_created,
+            Analysis.analysis_face_emotions_rates,
+            Analysis.analysis_voice_emotions_rates,
+            Analysis.analysis_face_emotions_score,
+            Analysis.analysis_voice_emotions_score
+        ).join(Analysis, Report.report_analysis_id == Analysis.analysis_id).filter(
+            Report.report_user_id == user_id,
+            *range_filter(Report.report_created, date_range)
+        ).order_by(Report.report_created.asc()).all() # 저장 시 누적한 순서와 같게 더함
+
+        sums = {}
+        for row in rows:
+            contribution = _rollup_contribution(row._asdict())
+            day = sums.setdefault(row.report_created.date(), [0, 0.0, 0.0, 0.0])
+            day[0] += 1
+            day[1] += contribution['sentiment_score']
+            day[2] += contribution['positive']
+            day[3] += contribution['negative']
+        return [DailyRollup(report_date, *day) for report_date, day in sorted(sums.items())]
+
+    def rebuild_daily_rollups(self, user_id: UUID, date_range: DateRange) -> List[DailyRollup]:
+        """
+        [start, end) 구간의 일간 집계 행을 원본에서 다시 계산한 값으로 덮어씁니다.
+        집계 테이블 도입 이전에 저장된 리포트를 보정하는 backfill_rollups.py에서 사용하며,
+        upsert로 쓰므로 같은 구간을 여러 번(또는 동시에) 실행해도 유일 제약 조건에 걸리지 않습니다.
+        """
+        rollups = self.compute_daily_rollups(user_id, date_range)
+        try:
+            # 리포트가 없어진 날짜의 집계 행 삭제
+            db_session.query(EmotionDailyRollup).filter(
+                EmotionDailyRollup.rollup_user_id == user_id,
+                *range_filter(EmotionDailyRollup.rollup_date, date_range),
+                EmotionDailyRollup.rollup_date.notin_([rollup.rollup_date for rollup in rollups])
+            ).delete(synchronize_session=False)
+            if rollups:
+                stmt = pg_insert(EmotionDailyRollup).values([
+                    {"rollup_user_id": user_id, **rollup._asdict()} for rollup in rollups
+                ])
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[EmotionDailyRollup.rollup_user_id, EmotionDailyRollup.rollup_date],
+                    set_={
+                        "rollup_report_count": stmt.excluded.rollup_report_count,
+                        "rollup_sentiment_score_sum": stmt.excluded.rollup_sentiment_score_sum,
+                        "rollup_positive_sum": stmt.excluded.rollup_positive_sum,
+                        "rollup_negative_sum": stmt.excluded.rollup_negative_sum,
+                        "rollup_updated": func.now()
+                    }
+                )
+                db_session.execute(stmt)
+            db_session.commit()
+        except Exception as e:
+            db_session.rollback()
+            logger.error(f"일간 감정 집계 재계산 중 에러 발생: {e}", exc_info=True)
+            raise
+
+        logger.info(f"일간 감정 집계 재계산 완료. user_id: {user_id}, range: {date_range}, 일자 {len(rollups)}개")
+        return rollups
+
+    def get_monthly_trend_source(self, user_id: UUID, date_range: DateRange):
+        """
+        월간 트렌드에 필요한 (리포트 카드 목록, 일간 집계 목록)을 반환합니다.
+        리포트 수에 관계없이 카드 조회 1회와 집계 조회 1회로 끝납니다.
+        집계 건수가 리포트 수와 다르면(백필 전 리포트) 원본에서 메모리로만 계산하며(조회 1회 추가), 읽기 요청에서는 쓰지 않습니다.
+        """
+        report_cards = db_session.query(Report.report_id, Report.report_card, Report.report_created).filter(
+            Report.report_user_id == user_id,
+            *range_filter(Report.report_created, date_range)
+        ).order_by(Report.report_created.asc()).all()
+
+        daily_rollups = self.get_daily_rollups(user_id, date_range)
+        if sum(r.rollup_report_count for r in daily_rollups) != len(report_cards):
+            logger.warning(f"일간 감정 집계가 리포트 수와 일치하지 않아 원본에서 계산합니다. backfill_rollups.py를 실행하세요. user_id: {user_id}, range: {date_range}")
+            daily_rollups = self.compute_daily_rollups(user_id, date_range)
+
+        return report_cards, daily_rollups
+
     def get_latest_report(self, user_id: UUID) -> Report:
-        return db_session.query(Report).filter(Report.report_user_id == user_id).order_by(Report.report_created.desc()).first()
+        return report_card_query().filter(Report.report_user_id == user_id).order_by(Report.report_created.desc()).first()
 
-    def get_user_chatbot_persona(self, user_id: UUID) -> ChatbotPersona:
-        user = self.get_user_by_id(user_id)
-        if user and user.selected_chatbot_id:
-            return db_session.query(ChatbotPersona).filter(ChatbotPersona.chatbot_id == user.selected_chatbot_id).first()
-        return db_session.query(ChatbotPersona).filter(ChatbotPersona.chatbot_name == '도담이').first()
+    def get_user_chatbot_persona(self, user_id: UUID) -> PersonaInfo:
+        """사용자가 선택한 페르소나(없으면 기본 페르소나)를 반환합니다. 선택 id만 조회하고 페르소나 내용은 캐시에서 읽습니다."""
+        selected_chatbot_id = db_session.query(User.selected_chatbot_id).filter(User.user_id == user_id).scalar()
+        return persona_cache.effective(selected_chatbot_id)
 
     def set_user_chatbot_persona(self, user_id: UUID, chatbot_id: UUID):
         user = self.get_user_by_id(user_id)
         if user:
             user.selected_chatbot_id = chatbot_id
+            self.bump_user_data_version(user_id)
             db_session.commit()
 
-    def get_report_by_id(self, report_id: UUID) -> Report:
-        return db_session.query(Report).filter(Report.report_id == report_id).first()
+    def get_report_by_id(self, report_id: UUID, with_detail: bool = True) -> Report:
+        """리포트를 조회합니다. with_detail=False이면 report_detail을 로드하지 않습니다."""
+        query = db_session.query(Report).options(undefer(Report.report_detail)) if with_detail else report_card_query()
+        return query.filter(Report.report_id == report_id).first()
         
-    def get_reports_by_date(self, user_id: UUID, query_date: date):
-        from datetime import timedelta
-        start_of_day = query_date
-        end_of_day = start_of_day + timedelta(days=1)
-        return db_session.query(Report).filter(
+    def get_report_detail(self, report: Report) -> dict:
+        """report_detail에 segment_tbl의 구간 결과(segment_analyses)를 합쳐 기존 상세 형태로 반환합니다."""
+        detail = report.report_detail or {}
+        if 'segment_analyses' in detail:
+            return detail # segment_tbl 도입 이전에 저장된 리포트
+        segments = load_segments(report.report_analysis_id)
+        timings = {
+            timing.get('segment_id'): timing
+            for timing in detail.get('performance', {}).get('segment_processing', [])
+        }
+        for segment in segments:
+            if segment['segment_id'] in timings:
+                segment['performance'] = timings[segment['segment_id']]
+        return {**detail, 'segment_analyses': segments}
+
+    def get_reports_in_range(self, user_id: UUID, date_range: DateRange, newest_first: bool = True):
+        """[start, end) 범위에 생성된 사용자의 리포트를 조회합니다. (report_user_id, report_created) 인덱스를 사용합니다."""
+        order = Report.report_created.desc() if newest_first else Report.report_created.asc()
+        return report_card_query().filter(
             Report.report_user_id == user_id,
-            Report.report_created >= start_of_day,
-            Report.report_created < end_of_day
-        ).order_by(Report.report_created.desc()).all()
\ No newline at end of file
+            *range_filter(Report.report_created, date_range)
+        ).order_by(order)
+
+    def get_reports_since(self, user_id: UUID, since: datetime):
+        """since 이후 생성된 사용자의 리포트를 최신순으로 조회합니다."""
+        return report_card_query().filter(
+            Report.report_user_id == user_id,
+            Report.report_created >= since
+        ).order_by(Report.report_created.desc()).all()
+
+    def get_report_window_summary(self, user_id: UUID, since: datetime) -> Optional[dict]:
+        """
+        since 이후 리포트의 개수, overall_score 합계, 가장 많이 나온 dominant_emotion과 가장 최신 리포트(카드 컬럼)를 반환합니다.
+        리포트가 없으면 None을 반환합니다.
+
+        집계는 DB에서 한 번의 쿼리로 끝나고 최신 리포트 조회도 인덱스로 1행만 읽으므로, 기간 안의 리포트 수와 관계없이
+        쿼리 2회로 끝납니다. 빈도가 같은 감정은 더 최근에 나온 감정을 선택합니다. (최신순 Counter.most_common과 동일)
+        """
+        window_filter = (Report.report_user_id == user_id, Report.report_created >= since)
+        overall_score = Report.report_summary['overall_score']
+        dominant_emotion = Report.report_summary['dominant_emotion'].astext
+
+        most_common_emotion = db_session.query(dominant_emotion).filter(
+            *window_filter, dominant_emotion.isnot(None), dominant_emotion != ''
+        ).group_by(dominant_emotion).order_by(
+            func.count().desc(), func.max(Report.report_created).desc()
+        ).limit(1).scalar_subquery()
+
+        stats = db_session.query(
+            func.count(Report.report_id).label('report_count'),
+            func.coalesce(func.sum(case(
+                (func.jsonb_typeof(overall_score) == 'number', cast(overall_score.astext, Float)), else_=0.0
+            )), 0.0).label('overall_score_sum'),
+            most_common_emotion.label('dominant_emotion')
+        ).filter(*window_filter).one()
+
+        if not stats.report_count:
+            return None
+        latest_report = report_card_query().filter(*window_filter).order_by(Report.report_created.desc()).first()
+        return {
+            "report_count": stats.report_count,
+            "overall_score_sum": stats.overall_score_sum,
+            "dominant_emotion": stats.dominant_emotion,
+            "latest_report": latest_report,
+        }
+
+    def get_card_emotions_in_range(self, user_id: UUID, date_range: DateRange, limit: Optional[int] = None):
+        """
+        [start, end) 범위 리포트의 (report_created, dominant_emotion, sentiment_score, total_count)를 최신순으로 조회합니다.
+        report_card JSONB 전체 대신 필요한 두 값만 DB에서 꺼내며, (report_user_id, report_created) 인덱스를 사용합니다.
+        total_count는 LIMIT 적용 전 범위 전체의 리포트 수이므로, limit개만 가져오면서 '외 N건'을 같은 쿼리로 계산할 수 있습니다.
+        """
+        query = db_session.query(
+            Report.report_created,
+            Report.report_card['dominant_overall_emotion'].astext.label('dominant_emotion'),
+            Report.report_card['sentiment_score'].label('sentiment_score'),
+            func.count().over().label('total_count')
+        ).filter(
+            Report.report_user_id == user_id,
+            *range_filter(Report.report_created, date_range)
+        ).order_by(Report.report_created.desc())
+        return query.limit(limit).all() if limit else query.all()
+
+    def get_reports_by_date(self, user_id: UUID, query_date: date):
+        return self.get_reports_in_range(user_id, day_range(query_date)).all()
@@ -0,0 +1,114 @@
+# backend/core/services/event_service.py
+
+import json
+import logging
+import queue
+import select
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, Optional
+from sqlalchemy import text
+from core.models.database import db_session, engine
+
+logger = logging.getLogger(__name__)
+
+class AnalysisEventBroker:
+    """
+    분석 진행/완료 이벤트를 사용자별 구독자(SSE 연결)에게 전달하는 브로커.
+
+    발행은 PostgreSQL NOTIFY로 하므로 트랜잭션이 커밋된 뒤에만 전달되고,
+    여러 워커 프로세스 중 어느 곳에서 저장하더라도 모든 프로세스의 LISTEN 스레드가 이벤트를 받습니다.
+    """
+    CHANNEL = 'analysis_events'
+    RECONNECT_DELAY_SECONDS = 3.0
+
+    def __init__(self):
+        self._subscribers: Dict[str, set] = defaultdict(set)
+        self._lock = threading.Lock()
+        self._listener_thread: Optional[threading.Thread] = None
+
+    def publish(self, user_id, event_type: str, data: Optional[Dict[str, Any]] = None):
+        """
+        현재 db_session 트랜잭션에 NOTIFY를 추가합니다.
+        호출한 쪽에서 commit해야 이벤트가 전달되며, rollback되면 전달되지 않습니다.
+        """
+        payload = json.dumps({"user_id": str(user_id), "type": event_type, "data": data or {}}, ensure_ascii=False, default=str)
+        db_session.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": self.CHANNEL, "payload": payload})
+
+    def subscribe(self, user_id) -> queue.Queue:
+        """사용자의 이벤트를 받을 큐를 등록하고, 필요하면 LISTEN 스레드를 시작합니다."""
+        self._ensure_listener()
+        subscriber = queue.Queue()
+        with self._lock:
+            self._subscribers[str(user_id)].add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, user_id, subscriber: queue.Queue):
+        with self._lock:
+            subscribers = self._subscribers.get(str(user_id))
+            if subscribers is not None:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._subscribers[str(user_id)]
+
+    def _dispatch(self, payload: str):
+        try:
+            event = json.loads(payload)
+        except json.JSONDecodeError:
+            logger.warning(f"잘못된 분석 이벤트 payload를 무시합니다: {payload[:200]}")
+            return
+        with self._lock:
+            subscribers = list(self._subscribers.get(event.get("user_id"), ()))
+        for subscriber in subscribers:
+            subscriber.put(event)
+
+    def _ensure_listener(self):
+        with self._lock:
+            if self._listener_thread is not None and self._listener_thread.is_alive():
+                return
+            self._listener_thread = threading.Thread(target=self._listen_forever, name="analysis-event-listener", daemon=True)
+            self._listener_thread.start()
+
+    def _listen_forever(self):
+        while True:
+            try:
+                self._listen()
+            except Exception as e:
+                logger.error(f"분석 이벤트 LISTEN 연결 오류, {self.RECONNECT_DELAY_SECONDS}초 후 재연결합니다: {e}", exc_info=True)
+            time.sleep(self.RECONNECT_DELAY_SECONDS)
+
+    def _listen(self):
+        # 풀에서 꺼낸 연결을 분리(detach)하여 LISTEN 전용으로 사용합니다.
+        pooled = engine.raw_connection()
+        pooled.detach()
+        connection = getattr(pooled, 'dbapi_connection', None) or pooled.connection
+        try:
+            connection.rollback() # pre-ping 등으로 열린 트랜잭션이 있으면 autocommit으로 바꿀 수 없음 (psycopg)
+            connection.autocommit = True
+            with connection.cursor() as cursor:
+                cursor.execute(f"LISTEN {self.CHANNEL}")
+            logger.info(f"분석 이벤트 채널 LISTEN 시작: {self.CHANNEL}")
+            if callable(getattr(connection, 'notifies', None)):
+                self._receive_psycopg(connection)
+            else:
+                self._receive_psycopg2(connection)
+        finally:
+            connection.close()
+
+    def _receive_psycopg2(self, connection):
+        """psycopg2: 소켓이 읽기 가능해지면 poll()로 받은 알림을 connection.notifies 리스트에서 꺼냅니다."""
+        while True:
+            if select.select([connection], [], [], 30.0) == ([], [], []):
+                continue
+            connection.poll()
+            while connection.notifies:
+                self._dispatch(connection.notifies.pop(0).payload)
+
+    def _receive_psycopg(self, connection):
+        """psycopg(3): notifies()는 알림이 올 때까지 블록하며 하나씩 반환하는 제너레이터입니다. (연결이 끊기면 예외)"""
+        while True:
+            for notify in connection.notifies():
+                self._dispatch(notify.payload)
+
+analysis_events = AnalysisEventBroker()
@@ -0,0 +1,98 @@
+# backend/core/services/persona_cache.py
+
+import logging
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from core.models.database import db_session
+from core.models.chatbot_persona import ChatbotPersona
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PERSONA_NAME = "도담이"
+PERSONA_FIELDS = (
+    "chatbot_id", "chatbot_name", "chatbot_age", "chatbot_identity", "chatbot_personality",
+    "chatbot_speech_style", "chatbot_system_role", "chatbot_instruction",
+)
+
+class PersonaInfo:
+    """
+    ChatbotPersona 행의 읽기 전용 복사본. ORM 객체와 같은 속성 이름을 사용하므로 호출하는 쪽은 그대로 persona.chatbot_name 등을 읽습니다.
+    세션에 묶이지 않아 커밋/세션 종료 후에도 다시 조회하지 않으며, 여러 스레드가 공유하므로 값을 바꿀 수 없습니다.
+    """
+    __slots__ = PERSONA_FIELDS
+
+    def __init__(self, row):
+        for field in PERSONA_FIELDS:
+            object.__setattr__(self, field, getattr(row, field))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("PersonaInfo는 읽기 전용입니다.")
+
+    def __repr__(self):
+        return f"<PersonaInfo(chatbot_id='{self.chatbot_id}', name='{self.chatbot_name}')>"
+
+class PersonaCache:
+    """
+    챗봇 페르소나 전체를 프로세스에 보관하는 캐시.
+
+    페르소나는 init.sql/initialize_default_personas로만 추가되는 정적 데이터이므로 한 번에 모두 읽어 두고,
+    캐시에 없는 chatbot_id를 요청받으면(다른 프로세스가 새로 추가한 경우) min_reload_seconds 간격으로만 다시 읽습니다.
+    조회 결과는 (id별, 이름별) 딕셔너리 한 쌍을 통째로 교체하므로 읽을 때는 lock이 필요 없습니다.
+    """
+    def __init__(self, min_reload_seconds: float = 5.0):
+        self.min_reload_seconds = min_reload_seconds
+        self._snapshot: Optional[Tuple[Dict, Dict]] = None # ({chatbot_id: PersonaInfo}, {chatbot_name: PersonaInfo})
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def load(self):
+        """DB에서 페르소나 전체를 한 번의 쿼리로 다시 읽습니다."""
+        rows = db_session.query(*(getattr(ChatbotPersona, field) for field in PERSONA_FIELDS)).all()
+        personas = [PersonaInfo(row) for row in rows]
+        with self._lock:
+            self._snapshot = ({persona.chatbot_id: persona for persona in personas},
+                              {persona.chatbot_name: persona for persona in personas})
+            self._loaded_at = time.monotonic()
+        logger.info(f"챗봇 페르소나 {len(personas)}개를 캐시에 로드했습니다.")
+
+    def invalidate(self):
+        """다음 조회 때 다시 읽도록 캐시를 비웁니다. (페르소나 추가/수정 후 호출)"""
+        with self._lock:
+            self._snapshot = None
+
+    def _personas(self) -> Tuple[Dict, Dict]:
+        snapshot = self._snapshot
+        if snapshot is None:
+            self.load()
+            snapshot = self._snapshot
+        return snapshot
+
+    def get(self, chatbot_id) -> Optional[PersonaInfo]:
+        if chatbot_id is None:
+            return None
+        by_id, _ = self._personas()
+        persona = by_id.get(chatbot_id)
+        if persona is None and time.monotonic() - self._loaded_at >= self.min_reload_seconds:
+            self.load()
+            persona = self._snapshot[0].get(chatbot_id)
+        return persona
+
+    def get_by_name(self, name: str) -> Optional[PersonaInfo]:
+        return self._personas()[1].get(name)
+
+    def all(self):
+        return list(self._personas()[0].values())
+
+    def effective(self, selected_chatbot_id=None) -> PersonaInfo:
+        """선택한 페르소나 → 기본 페르소나(도담이) → 아무 페르소나 순으로 반환합니다."""
+        persona = self.get(selected_chatbot_id) or self.get_by_name(DEFAULT_PERSONA_NAME)
+        if persona is None:
+            personas = self.all()
+            if not personas:
+                raise ValueError("No chatbot personas found in the database.")
+            persona = personas[0]
+        return persona
+
+persona_cache = PersonaCache()
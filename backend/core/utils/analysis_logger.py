@@ -1,20 +1,70 @@
 # ./core/utils/analysis_logger.py
 
 import json
+import os
+import reprlib
+import threading
+from collections import deque
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import Any, Deque, Dict, Optional, TextIO
+
+LOG_LEVELS = {"INFO": 20, "WARNING": 30, "ERROR": 40}
+RESULT_VERBOSITY = ("full", "preview", "none")
+DEFAULT_LOG_LEVEL = os.environ.get("ANALYSIS_LOG_LEVEL", "INFO").upper()
+DEFAULT_RESULT_VERBOSITY = os.environ.get("ANALYSIS_LOG_RESULTS", "full").lower()
+DEFAULT_MAX_MEMORY_ENTRIES = int(os.environ.get("ANALYSIS_LOG_MAX_ENTRIES", "500"))
+PREVIEW_LENGTH = 200
+
+# 미리보기는 결과 전체를 문자열로 만들지 않고 앞부분만 순회하여 만듭니다. (세그먼트가 수백 개여도 비용이 일정)
+_preview_repr = reprlib.Repr()
+_preview_repr.maxlevel = 3
+_preview_repr.maxdict = 8
+_preview_repr.maxlist = 8
+_preview_repr.maxstring = 80
+_preview_repr.maxother = 80
+
+def result_preview(result: Any) -> str:
+    preview = _preview_repr.repr(result)
+    return preview[:PREVIEW_LENGTH] + "..." if len(preview) > PREVIEW_LENGTH else preview
 
 class AnalysisLogger:
     """
-    분석 과정에서 발생하는 모든 로그 메시지와 중간 결과값을 수집하고 저장하는 클래스.
+    분석 과정에서 발생하는 로그 메시지와 중간 결과값을 기록하는 클래스.
+
+    stream_to(path)를 호출하면 이후 기록은 한 줄에 하나씩 JSON(NDJSON)으로 바로 파일에 추가되므로,
+    분석 도중 프로세스가 죽어도 그때까지의 로그가 남습니다. 메모리에는 최근 max_memory_entries개의 로그와
+    중간 결과 미리보기만 보관하여 긴 영상에서도 사용량이 일정합니다.
+
+    - level: 이 수준 미만의 로그는 기록하지 않습니다. (INFO | WARNING | ERROR, 기본: ANALYSIS_LOG_LEVEL)
+    - result_verbosity: 중간 결과를 파일에 전체(full)/미리보기만(preview)/기록 안 함(none) (기본: ANALYSIS_LOG_RESULTS)
     """
-    def __init__(self):
-        self.logs: List[Dict[str, Any]] = []
-        self.intermediate_results: Dict[str, Any] = {}
+    def __init__(self, level: str = DEFAULT_LOG_LEVEL, result_verbosity: str = DEFAULT_RESULT_VERBOSITY,
+                 max_memory_entries: int = DEFAULT_MAX_MEMORY_ENTRIES):
+        if level not in LOG_LEVELS:
+            raise ValueError(f"알 수 없는 로그 수준입니다: {level} (사용 가능: {', '.join(LOG_LEVELS)})")
+        if result_verbosity not in RESULT_VERBOSITY:
+            raise ValueError(f"알 수 없는 중간 결과 기록 방식입니다: {result_verbosity} (사용 가능: {', '.join(RESULT_VERBOSITY)})")
+        self.min_level = LOG_LEVELS[level]
+        self.result_verbosity = result_verbosity
+        self.logs: Deque[Dict[str, Any]] = deque(maxlen=max_memory_entries)
+        self.intermediate_results: Dict[str, str] = {} # key -> 미리보기 (키 종류는 분석 단계 수만큼으로 한정됨)
         self.analysis_start_time = datetime.now()
+        self.filename: Optional[str] = None
+        self._file: Optional[TextIO] = None
+        self._lock = threading.Lock() # heartbeat 등 다른 스레드의 기록과 줄이 섞이지 않도록 보호
+
+    def _write_record(self, record: Dict[str, Any]):
+        if self._file is None:
+            return
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            if self._file is not None:
+                self._file.write(line + "\n")
 
     def _add_log_entry(self, level: str, message: str, data: Optional[Dict[str, Any]] = None):
         """내부 로그 항목 추가."""
+        if LOG_LEVELS[level] < self.min_level:
+            return
         log_entry = {
             "timestamp": datetime.now().isoformat(),
             "level": level,
@@ -23,6 +73,7 @@ class AnalysisLogger:
         if data:
             log_entry["data"] = data
         self.logs.append(log_entry)
+        self._write_record({"type": "log", **log_entry})
 
     def log_info(self, message: str, data: Optional[Dict[str, Any]] = None):
         """정보 로그를 추가합니다."""
@@ -37,25 +88,64 @@ class AnalysisLogger:
         self._add_log_entry("ERROR", message, data)
 
     def save_intermediate_result(self, key: str, result: Any):
-        """중간 결과값을 저장합니다."""
-        self.intermediate_results[key] = result
-        self.log_info(f"중간 결과 저장: {key}", {"result_preview": str(result)[:200] + "..." if len(str(result)) > 200 else str(result)})
+        """
+        중간 결과값을 기록합니다. 전체 값은 메모리에 보관하지 않고 result_verbosity에 따라 파일에만 기록하므로,
+        stream_to() 이전에 저장한 결과는 미리보기만 남습니다.
+        """
+        if self.result_verbosity == "none" or LOG_LEVELS["INFO"] < self.min_level:
+            return
+        preview = result_preview(result)
+        self.intermediate_results[key] = preview
+        self._add_log_entry("INFO", f"중간 결과 저장: {key}", {"result_preview": preview})
+        if self.result_verbosity == "full":
+            self._write_record({"type": "result", "timestamp": datetime.now().isoformat(), "key": key, "result": result})
 
     def get_full_log_data(self) -> Dict[str, Any]:
-        """모든 로그와 중간 결과값을 포함하는 전체 데이터를 반환합니다."""
+        """메모리에 남아 있는 최근 로그와 중간 결과 미리보기를 반환합니다."""
         return {
             "analysis_started_at": self.analysis_start_time.isoformat(),
-            "logs": self.logs,
-            "intermediate_results": self.intermediate_results,
+            "logs": list(self.logs),
+            "intermediate_results": dict(self.intermediate_results),
             "analysis_finished_at": datetime.now().isoformat()
         }
 
-    def save_to_file(self, filename: str):
-        """모든 로그와 중간 결과값을 JSON 파일로 저장합니다."""
-        full_data = self.get_full_log_data()
+    def stream_to(self, filename: str):
+        """
+        이후 기록을 filename에 NDJSON으로 바로 추가합니다.
+        호출 전에 메모리에 남아 있던 로그도 먼저 기록합니다. (파일을 열 수 없으면 메모리에만 기록을 계속합니다)
+        """
+        if self.filename == filename and self._file is not None:
+            return
+        self.close()
         try:
-            with open(filename, "w", encoding='utf-8') as f:
-                json.dump(full_data, f, ensure_ascii=False, indent=2)
-            self.log_info(f"상세 분석 로그 및 중간 결과가 '{filename}'에 저장되었습니다.")
-        except Exception as e:
-            self.log_error(f"상세 로그 파일 저장 실패: {e}", {"filename": filename})
\ No newline at end of file
+            directory = os.path.dirname(filename)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = open(filename, "a", encoding="utf-8", buffering=1) # 줄 단위 버퍼링: 기록마다 파일에 반영
+        except OSError as e:
+            self.log_error(f"상세 로그 파일 열기 실패: {e}", {"filename": filename})
+            return
+        self.filename = filename
+        self._write_record({
+            "type": "start", "analysis_started_at": self.analysis_start_time.isoformat(),
+            "pid": os.getpid(), "result_verbosity": self.result_verbosity
+        })
+        for log_entry in list(self.logs):
+            self._write_record({"type": "log", **log_entry})
+
+    def close(self):
+        """종료 레코드를 기록하고 파일을 닫습니다."""
+        if self._file is None:
+            return
+        self._write_record({"type": "end", "analysis_finished_at": datetime.now().isoformat()})
+        with self._lock:
+            self._file.close()
+            self._file = None
+
+    def save_to_file(self, filename: str):
+        """로그를 filename에 기록하고 닫습니다. 이미 stream_to(filename)으로 기록 중이면 종료 레코드만 추가합니다."""
+        self.stream_to(filename)
+        if self._file is None:
+            return # stream_to에서 이미 에러를 기록함
+        self.close()
+        self.log_info(f"상세 분석 로그 및 중간 결과가 '{filename}'에 저장되었습니다.")
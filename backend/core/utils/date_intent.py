@@ -0,0 +1,94 @@
+# ./core/utils/date_intent.py
+
+import re
+from datetime import date, timedelta
+from typing import Optional
+
+from core.utils.date_range import DateRange, day_range, days_range, month_range, week_range
+
+# 챗봇 메시지에서 과거 감정 조회 의도(날짜 표현)를 찾는 패턴. 한 번의 search로 가장 먼저 나오는 표현을 찾습니다.
+# 구체적인 날짜(N월 N일)가 상대 표현보다 우선하도록 별도 패턴으로 먼저 검사합니다.
+_EXPLICIT_DAY = re.compile(r"(?P<month>\d{1,2})\s*월\s*(?P<day>\d{1,2})\s*일")
+_RELATIVE = re.compile(
+    r"(?P<last_days>(?:지난|최근)\s*(?P<days>\d{1,3})\s*일)"
+    r"|(?P<day_before>그제|그저께|그끄제)"
+    r"|(?P<yesterday>어제)"
+    r"|(?P<last_week>지난\s*주|저번\s*주)"
+    r"|(?P<this_week>이번\s*주)"
+    r"|(?P<last_month>지난\s*달|저번\s*달)"
+    r"|(?P<this_month>이번\s*달)"
+    r"|(?P<today>오늘)"
+)
+# 날짜 표현은 일상 대화에도 자주 나오므로('이번 주에 시험이 있어'), 감정을 묻는 말이 함께 있을 때만 조회 의도로 봅니다.
+_QUERY_CUE = re.compile(r"감정|어땠|어땟|어때|알려\s*줘|보여\s*줘|요약|했어\s*\?|였어\s*\?|했니|였니")
+MAX_LAST_DAYS = 366
+
+class DateIntent:
+    """
+    메시지에서 찾은 날짜 의도. date_range는 [start, end) 반개구간이며,
+    is_single_day이면 하루의 대표 감정을, 아니면 기간 요약을 답합니다.
+    """
+    __slots__ = ("label", "date_range")
+
+    def __init__(self, label: str, date_range: DateRange):
+        self.label = label
+        self.date_range = date_range
+
+    @property
+    def is_single_day(self) -> bool:
+        start, end = self.date_range
+        return end - start == timedelta(days=1)
+
+    def __eq__(self, other):
+        return isinstance(other, DateIntent) and (self.label, self.date_range) == (other.label, other.date_range)
+
+    def __repr__(self):
+        return f"<DateIntent(label='{self.label}', range={self.date_range[0]}~{self.date_range[1]})>"
+
+def _format_day(target_date: date) -> str:
+    return target_date.strftime('%Y년 %m월 %d일')
+
+def parse_date_intent(message: str, today: date) -> Optional[DateIntent]:
+    """
+    한국어 상대 날짜 표현(오늘, 어제, 그제, 지난주, 이번 주, 이번 달, 지난달, 지난/최근 N일, N월 N일)을 기간으로 변환합니다.
+    날짜 표현이 없거나 감정을 묻는 말('감정', '어땠어', '알려줘', '~했어?' 등)이 없으면 None을 반환합니다.
+    '오늘'은 특히 자주 나오므로 '감정'이 함께 있을 때만 조회 의도로 봅니다. N월 N일이 오늘 이후이면 작년 날짜로 해석합니다.
+    """
+    if not _QUERY_CUE.search(message):
+        return None
+
+    match = _EXPLICIT_DAY.search(message)
+    if match:
+        month, day = int(match.group("month")), int(match.group("day"))
+        try:
+            target_date = date(today.year, month, day)
+            if target_date > today:
+                target_date = target_date.replace(year=today.year - 1)
+        except ValueError:
+            return None # 2월 30일 등 존재하지 않는 날짜, 또는 작년에 없는 2월 29일
+        return DateIntent(_format_day(target_date), day_range(target_date))
+
+    for match in _RELATIVE.finditer(message):
+        kind = match.lastgroup
+        if kind == "today":
+            if "감정" not in message:
+                continue
+            return DateIntent(_format_day(today), day_range(today))
+        if kind == "yesterday":
+            return DateIntent(_format_day(today - timedelta(days=1)), day_range(today - timedelta(days=1)))
+        if kind == "day_before":
+            offset = 3 if match.group("day_before") == "그끄제" else 2
+            return DateIntent(_format_day(today - timedelta(days=offset)), day_range(today - timedelta(days=offset)))
+        if kind == "last_days":
+            num_days = min(max(int(match.group("days")), 1), MAX_LAST_DAYS)
+            return DateIntent(f"최근 {num_days}일", days_range(today - timedelta(days=num_days - 1), num_days))
+        if kind == "last_week":
+            return DateIntent("지난주", week_range(today - timedelta(days=7)))
+        if kind == "this_week":
+            return DateIntent("이번 주", (week_range(today)[0], today + timedelta(days=1)))
+        if kind == "last_month":
+            last_month_end = today.replace(day=1) - timedelta(days=1)
+            return DateIntent("지난달", month_range(last_month_end.year, last_month_end.month))
+        if kind == "this_month":
+            return DateIntent("이번 달", (today.replace(day=1), today + timedelta(days=1)))
+    return None
@@ -0,0 +1,33 @@
+# ./core/utils/date_range.py
+
+from datetime import date, timedelta
+from typing import Tuple
+
+# 모든 달력 조건은 [start, end) 반개구간으로 변환합니다.
+# func.date()/func.extract()로 컬럼을 감싸면 (user_id, created DESC) 복합 인덱스를 사용할 수 없으므로,
+# 리포트/레코드의 날짜 필터는 항상 이 모듈의 범위를 통해 "created >= start AND created < end"로 작성합니다.
+DateRange = Tuple[date, date]
+
+def day_range(target_date: date) -> DateRange:
+    """하루 [target_date, target_date + 1일) 범위를 반환합니다."""
+    return target_date, target_date + timedelta(days=1)
+
+def days_range(start_date: date, num_days: int) -> DateRange:
+    """start_date부터 num_days일 동안의 범위를 반환합니다."""
+    return start_date, start_date + timedelta(days=num_days)
+
+def week_range(target_date: date) -> DateRange:
+    """target_date가 속한 주(월요일 시작)의 범위를 반환합니다."""
+    week_start = target_date - timedelta(days=target_date.weekday())
+    return days_range(week_start, 7)
+
+def month_range(year: int, month: int) -> DateRange:
+    """year년 month월 한 달의 범위를 반환합니다."""
+    month_start = date(year, month, 1)
+    next_month_start = (month_start + timedelta(days=31)).replace(day=1)
+    return month_start, next_month_start
+
+def range_filter(column, date_range: DateRange):
+    """컬럼에 [start, end) 범위 조건을 적용한 SQLAlchemy 조건식 2개를 반환합니다."""
+    start, end = date_range
+    return column >= start, column < end
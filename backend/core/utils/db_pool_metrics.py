@@ -0,0 +1,109 @@
+# ./core/utils/db_pool_metrics.py
+
+import threading
+import time
+from typing import Any, Dict, Iterable, Tuple
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool
+
+class PoolMetrics:
+    """
+    DB 커넥션 풀의 체크아웃/대기/신규 연결 횟수를 프로세스 단위로 집계하는 클래스.
+    checkouts 대비 connects가 작을수록 연결이 재사용되고 있다는 뜻입니다.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._engine = None
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.connects = 0          # 새로 맺은 물리 연결 수
+            self.checkouts = 0         # 풀에서 연결을 꺼낸 횟수
+            self.checkins = 0
+            self.invalidations = 0     # pre_ping 실패 등으로 폐기된 연결 수
+            self.wait_count = 0
+            self.wait_seconds_total = 0.0
+            self.wait_seconds_max = 0.0
+            self.timeouts = 0          # pool_timeout 초과로 실패한 체크아웃 수
+
+    def attach(self, engine):
+        """엔진의 풀 이벤트에 집계 리스너를 등록합니다."""
+        self._engine = engine
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+        event.listen(engine, "invalidate", self._on_invalidate)
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        with self._lock:
+            self.checkouts += 1
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.checkins += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        with self._lock:
+            self.invalidations += 1
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            self.wait_count += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """현재 집계값과 풀 상태(크기/사용 중/overflow)를 반환합니다."""
+        with self._lock:
+            metrics = {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "wait_count": self.wait_count,
+                "wait_seconds_total": round(self.wait_seconds_total, 6),
+                "wait_seconds_max": round(self.wait_seconds_max, 6),
+                "timeouts": self.timeouts,
+            }
+        pool = self._engine.pool if self._engine is not None else None
+        if isinstance(pool, QueuePool):
+            metrics.update({
+                "pool_size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+            })
+        return metrics
+
+    def prometheus_samples(self) -> Iterable[Tuple[str, str, str, Dict[str, Any], float]]:
+        """tracer.register_collector()용: snapshot()을 Prometheus 지표로 변환합니다."""
+        metrics = self.snapshot()
+        for key, name in (("connects", "connects"), ("checkouts", "checkouts"), ("invalidations", "invalidations"),
+                          ("wait_count", "waits"), ("timeouts", "timeouts")):
+            yield (f"feellog_db_pool_{name}_total", "counter", f"DB connection pool {name}", {}, metrics[key])
+        yield ("feellog_db_pool_wait_seconds_total", "counter", "Time spent waiting for a pooled connection", {}, metrics["wait_seconds_total"])
+        yield ("feellog_db_pool_wait_seconds_max", "gauge", "Longest single wait for a pooled connection", {}, metrics["wait_seconds_max"])
+        for name in ("pool_size", "checked_out", "overflow"):
+            if name in metrics:
+                yield (f"feellog_db_pool_{name}", "gauge", f"DB connection pool {name.replace('_', ' ')}", {}, metrics[name])
+
+pool_metrics = PoolMetrics()
+
+class InstrumentedQueuePool(QueuePool):
+    """체크아웃에 걸린 시간(풀 대기 + 신규 연결 + pre_ping)을 pool_metrics에 기록하는 QueuePool."""
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            pool_metrics.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        pool_metrics.record_wait(time.perf_counter() - start)
+        return connection
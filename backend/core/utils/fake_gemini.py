@@ -0,0 +1,47 @@
+# ./core/utils/fake_gemini.py
+# 네트워크 없이 Gemini GenerativeModel.generate_content(stream=True/False)를 흉내 내는 로컬 모델.
+# CHATBOT_FAKE_LLM=1이면 ChatbotService가 이 모델을 사용하므로, API 키 없이 스트리밍 응답과 지연 시간을 재현할 수 있습니다.
+
+import os
+import re
+import time
+from typing import Iterator, Optional
+
+FAKE_FIRST_TOKEN_SECONDS = float(os.environ.get("CHATBOT_FAKE_FIRST_TOKEN_SECONDS", "0.5"))
+FAKE_TOKEN_SECONDS = float(os.environ.get("CHATBOT_FAKE_TOKEN_SECONDS", "0.05"))
+
+class FakeResponse:
+    """generate_content()의 응답/스트림 조각과 같은 .text 속성만 가집니다."""
+    def __init__(self, text: str):
+        self.text = text
+
+class FakeGenerativeModel:
+    """
+    프롬프트의 마지막 사용자 메시지를 되돌려주는 가짜 모델.
+    첫 조각 전에 first_token_seconds, 이후 조각마다 token_seconds만큼 기다려 실제 API의 지연 형태를 재현합니다.
+    """
+    def __init__(self, first_token_seconds: float = FAKE_FIRST_TOKEN_SECONDS, token_seconds: float = FAKE_TOKEN_SECONDS,
+                 reply: Optional[str] = None):
+        self.first_token_seconds = first_token_seconds
+        self.token_seconds = token_seconds
+        self.reply = reply
+
+    def _reply_for(self, prompt: str) -> str:
+        if self.reply is not None:
+            return self.reply
+        messages = re.findall(r"사용자: (.*)", prompt)
+        return f"'{messages[-1].strip()}'라고 말씀하셨군요. 오늘 하루도 수고 많으셨어요." if messages else "안녕하세요."
+
+    def _stream(self, text: str) -> Iterator[FakeResponse]:
+        time.sleep(self.first_token_seconds)
+        for index, token in enumerate(re.findall(r"\S+\s*", text)):
+            if index:
+                time.sleep(self.token_seconds)
+            yield FakeResponse(token)
+
+    def generate_content(self, prompt: str, stream: bool = False, **kwargs):
+        text = self._reply_for(prompt)
+        if stream:
+            return self._stream(text)
+        time.sleep(self.first_token_seconds + self.token_seconds * max(0, len(text.split()) - 1))
+        return FakeResponse(text)
@@ -0,0 +1,52 @@
+# ./core/utils/process_memory.py
+
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+def process_memory(pid: int) -> Optional[Dict[str, float]]:
+    """
+    /proc/<pid>/smaps_rollup에서 프로세스 메모리(MB)를 읽습니다. 프로세스가 없으면 None을 반환합니다.
+    - rss: 상주 메모리 (공유 페이지를 프로세스마다 중복으로 셈)
+    - pss: 공유 페이지를 공유 프로세스 수로 나눠 셈 (프로세스별 합계가 실제 사용량에 가까움)
+    - uss: 해당 프로세스만 사용하는 페이지 (프로세스를 종료하면 회수되는 양)
+    """
+    try:
+        text = Path(f"/proc/{pid}/smaps_rollup").read_text()
+    except FileNotFoundError:
+        # smaps_rollup이 없는 커널(4.14 미만)은 RSS만 제공
+        try:
+            text = Path(f"/proc/{pid}/status").read_text()
+        except FileNotFoundError:
+            return None
+        fields = dict(line.split(':', 1) for line in text.splitlines() if ':' in line)
+        return {"rss": int(fields['VmRSS'].split()[0]) / 1024, "pss": None, "uss": None}
+
+    fields = {}
+    for line in text.splitlines()[1:]: # 첫 줄은 주소 범위 헤더
+        name, value = line.split(':', 1)
+        fields[name] = int(value.split()[0]) # kB
+    return {
+        "rss": fields.get('Rss', 0) / 1024,
+        "pss": fields.get('Pss', 0) / 1024,
+        "uss": (fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0)) / 1024,
+    }
+
+def memory_report(pids: Dict[str, int]) -> Dict[str, Dict[str, float]]:
+    """{이름: pid}의 프로세스별 메모리와 합계("total")를 반환합니다. 종료된 프로세스는 제외합니다."""
+    report = {name: usage for name, pid in pids.items() if (usage := process_memory(pid)) is not None}
+    report["total"] = {
+        key: sum(usage[key] or 0 for usage in list(report.values()))
+        for key in ("rss", "pss", "uss")
+    }
+    return report
+
+def format_memory_report(report: Dict[str, Dict[str, float]], names: Optional[Iterable[str]] = None) -> str:
+    lines = [f"{'process':<16} {'RSS(MB)':>10} {'PSS(MB)':>10} {'USS(MB)':>10}"]
+    for name in list(names or report.keys()):
+        usage = report.get(name)
+        if usage is None:
+            continue
+        lines.append(f"{name:<16} " + " ".join(
+            f"{usage[key]:10.1f}" if usage[key] is not None else f"{'-':>10}" for key in ("rss", "pss", "uss")
+        ))
+    return "\n".join(lines)
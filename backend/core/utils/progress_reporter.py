@@ -0,0 +1,87 @@
+# ./core/utils/progress_reporter.py
+
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+import requests
+
+class ProgressReporter:
+    """
+    analyzer 프로세스의 단계별 진행률/ETA를 백엔드 API로 보고하고, 주기적으로 heartbeat를 전송하는 클래스.
+    BatchVideoAnalyzer의 progress_callback으로 그대로 전달할 수 있습니다. 전송 실패는 분석을 중단시키지 않습니다.
+    """
+    # 세그먼트 외 단계의 진행률(%). 세그먼트 분석은 SEGMENT_PERCENT_RANGE 구간을 세그먼트 수에 비례하여 채웁니다.
+    STAGE_PERCENT = {
+        "started": 0,
+        "audio_extracted": 5,
+        "stt_completed": 20,
+        "aggregation_completed": 95,
+    }
+    SEGMENT_PERCENT_RANGE = (20, 90)
+    THROUGHPUT_WINDOW = 5 # ETA 계산에 사용할 최근 세그먼트 완료 시점 개수
+    HEARTBEAT_INTERVAL_SECONDS = 30
+    REQUEST_TIMEOUT_SECONDS = 2
+
+    def __init__(self, api_base_url: str, record_id: str, user_id: str):
+        self.progress_url = f"{api_base_url}/analysis/progress"
+        self.heartbeat_url = f"{api_base_url}/analysis/heartbeat"
+        self.record_id = record_id
+        self.user_id = user_id
+        self._segment_marks: Deque[Tuple[float, int]] = deque(maxlen=self.THROUGHPUT_WINDOW + 1)
+        self._stop_event = threading.Event()
+        self._heartbeat_thread: Optional[threading.Thread] = None
+
+    def __call__(self, stage: str, data: Optional[Dict[str, Any]] = None):
+        data = data or {}
+        current, total = data.get("current"), data.get("total")
+        if stage == "stt_completed":
+            # 세그먼트 처리량 측정의 기준점
+            self._segment_marks.clear()
+            self._segment_marks.append((time.monotonic(), 0))
+        elif stage == "segment_completed" and current is not None:
+            self._segment_marks.append((time.monotonic(), current))
+
+        self._post(self.progress_url, {
+            "stage": stage,
+            "current": current,
+            "total": total,
+            "percent": self._percent(stage, current, total),
+            "eta_seconds": self._eta_seconds(stage, current, total),
+        })
+
+    def _percent(self, stage: str, current: Optional[int], total: Optional[int]) -> Optional[int]:
+        if stage == "segment_completed" and current is not None and total:
+            low, high = self.SEGMENT_PERCENT_RANGE
+            return int(low + (high - low) * min(current, total) / total)
+        return self.STAGE_PERCENT.get(stage)
+
+    def _eta_seconds(self, stage: str, current: Optional[int], total: Optional[int]) -> Optional[int]:
+        """최근 THROUGHPUT_WINDOW개 세그먼트의 처리 속도로 남은 세그먼트 분석 시간을 추정합니다."""
+        if stage != "segment_completed" or current is None or not total or len(self._segment_marks) < 2:
+            return None
+        (first_time, first_count), (last_time, last_count) = self._segment_marks[0], self._segment_marks[-1]
+        if last_count <= first_count or last_time <= first_time:
+            return None
+        segments_per_second = (last_count - first_count) / (last_time - first_time)
+        return int(round(max(total - current, 0) / segments_per_second))
+
+    def start_heartbeat(self):
+        """분석이 한 단계에서 오래 머물러도 reaper가 살아있는 작업으로 인식하도록 heartbeat 스레드를 시작합니다."""
+        if self._heartbeat_thread is not None:
+            return
+        self._heartbeat_thread = threading.Thread(target=self._heartbeat_loop, name="analysis-heartbeat", daemon=True)
+        self._heartbeat_thread.start()
+
+    def stop_heartbeat(self):
+        self._stop_event.set()
+
+    def _heartbeat_loop(self):
+        while not self._stop_event.wait(self.HEARTBEAT_INTERVAL_SECONDS):
+            self._post(self.heartbeat_url, {})
+
+    def _post(self, url: str, data: Dict[str, Any]):
+        try:
+            requests.post(url, json={"record_id": self.record_id, "user_id": self.user_id, **data}, timeout=self.REQUEST_TIMEOUT_SECONDS)
+        except requests.exceptions.RequestException:
+            pass
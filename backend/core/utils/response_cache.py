@@ -0,0 +1,131 @@
+# ./core/utils/response_cache.py
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = int(os.environ.get("RESPONSE_CACHE_MAX_ENTRIES", "1024"))
+DEFAULT_TTL_SECONDS = float(os.environ.get("RESPONSE_CACHE_TTL_SECONDS", "600"))
+DEFAULT_REDIS_URL = os.environ.get("RESPONSE_CACHE_REDIS_URL") # 설정하면 gunicorn 워커들이 캐시를 공유
+REDIS_KEY_PREFIX = "feellog:response:"
+
+# 캐시 항목: (status, mimetype, body)
+CachedResponse = Tuple[int, str, bytes]
+
+def make_cache_key(user_id, user_version: int, endpoint: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """(사용자, 사용자 데이터 버전, 엔드포인트, 파라미터)로 캐시 키를 만듭니다. ETag 값으로도 사용합니다."""
+    raw = json.dumps([str(user_id), user_version, endpoint, params or {}], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+class ResponseCache:
+    """
+    사용자별 API 응답 캐시.
+
+    키에 사용자 데이터 버전(user_tbl.user_data_version)이 들어가므로 분석 결과 저장 등으로 버전이 올라가면
+    이전 항목은 다시 조회되지 않고 LRU/TTL로 자연히 밀려납니다. 따라서 명시적인 삭제가 필요 없고,
+    여러 워커 프로세스가 각자 캐시를 가져도 오래된 응답을 돌려주지 않습니다.
+
+    - 기본 저장소는 프로세스 내부 LRU(max_entries개, ttl_seconds 후 만료)입니다.
+    - redis_url을 주면 Redis에 저장하여 워커 간에 공유합니다. redis 패키지가 없거나 연결에 실패하면 LRU만 사용합니다.
+    """
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 redis_url: Optional[str] = DEFAULT_REDIS_URL):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, CachedResponse]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis = self._connect_redis(redis_url) if redis_url else None
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _connect_redis(redis_url: str):
+        try:
+            import redis # 선택 의존성
+            client = redis.Redis.from_url(redis_url, socket_timeout=0.5, socket_connect_timeout=0.5)
+            client.ping()
+            logger.info(f"응답 캐시 Redis 연결 성공: {redis_url}")
+            return client
+        except Exception as e:
+            logger.warning(f"응답 캐시 Redis를 사용할 수 없어 프로세스 내부 캐시만 사용합니다: {e}")
+            return None
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+        value = self._redis_get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._store_local(key, value)
+        return value
+
+    def set(self, key: str, status: int, mimetype: str, body: bytes):
+        value = (status, mimetype, body)
+        with self._lock:
+            self._store_local(key, value)
+        self._redis_set(key, value)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses,
+                    "backend": "redis+lru" if self._redis is not None else "lru"}
+
+    def prometheus_samples(self) -> Iterable[Tuple[str, str, str, Dict[str, Any], float]]:
+        """tracer.register_collector()용: 적중/실패 횟수와 현재 항목 수"""
+        stats = self.stats()
+        yield ("feellog_response_cache_hits_total", "counter", "Per-user response cache hits", {}, stats["hits"])
+        yield ("feellog_response_cache_misses_total", "counter", "Per-user response cache misses", {}, stats["misses"])
+        yield ("feellog_response_cache_entries", "gauge", "Entries in the in-process response cache", {}, stats["entries"])
+
+    def _store_local(self, key: str, value: CachedResponse):
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _redis_get(self, key: str) -> Optional[CachedResponse]:
+        if self._redis is None:
+            return None
+        try:
+            raw = self._redis.get(REDIS_KEY_PREFIX + key)
+        except Exception as e:
+            logger.warning(f"응답 캐시 Redis 조회 실패: {e}")
+            return None
+        if raw is None:
+            return None
+        header, _, body = raw.partition(b"\n")
+        status, _, mimetype = header.decode("utf-8").partition(" ")
+        return int(status), mimetype, body
+
+    def _redis_set(self, key: str, value: CachedResponse):
+        if self._redis is None:
+            return
+        status, mimetype, body = value
+        try:
+            self._redis.set(REDIS_KEY_PREFIX + key, f"{status} {mimetype}\n".encode("utf-8") + body,
+                            ex=max(1, int(self.ttl_seconds)))
+        except Exception as e:
+            logger.warning(f"응답 캐시 Redis 저장 실패: {e}")
+
+response_cache = ResponseCache()
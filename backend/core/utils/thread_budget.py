@@ -0,0 +1,77 @@
+# ./core/utils/thread_budget.py
+
+import os
+from pathlib import Path
+from typing import Dict, List
+
+def available_cpus() -> int:
+    """
+    이 프로세스가 실제로 쓸 수 있는 CPU 수.
+    torch/OpenCV/CTranslate2는 호스트 전체 코어 수로 스레드 풀을 만들기 때문에, 컨테이너의 CPU affinity와
+    cgroup CPU quota(cpu.max)를 반영한 값으로 스레드 수를 정해야 과다 구독을 피할 수 있습니다.
+    """
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+    try:
+        quota, period = Path("/sys/fs/cgroup/cpu.max").read_text().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, int(int(quota) / int(period))))
+    except (FileNotFoundError, ValueError):
+        pass
+    return cpus
+
+class ThreadBudget:
+    """
+    분석 파이프라인의 라이브러리별 스레드 수.
+    한 작업 안에서 단계는 순서대로 실행되지만, 각 라이브러리는 자기 스레드 풀을 전체 코어 수로 만들고
+    유휴 상태에서도 스레드를 유지하므로(OpenMP spin-wait 등) 예산을 명시적으로 나눠 줍니다.
+
+    - torch: EmoNet/MobileNet, wav2vec2 추론 (torch.set_num_threads)
+    - opencv: 프레임 디코딩, DNN 얼굴 탐지 (cv2.setNumThreads)
+    - stt: FasterWhisper(CTranslate2) cpu_threads, 모델 생성 시 한 번만 적용됨
+    - ffmpeg: moviepy가 실행하는 ffmpeg의 -threads
+    """
+    PROFILES = ("latency", "throughput")
+
+    def __init__(self, torch: int, opencv: int, stt: int, ffmpeg: int, profile: str = "custom"):
+        self.torch = torch
+        self.opencv = opencv
+        self.stt = stt
+        self.ffmpeg = ffmpeg
+        self.profile = profile
+
+    @classmethod
+    def for_profile(cls, profile: str, concurrency: int = 1, cpus: int = 0) -> "ThreadBudget":
+        """
+        latency: 작업 하나가 CPU를 모두 사용 (단건 분석의 응답 시간 최소화)
+        throughput: 동시에 실행되는 concurrency개 작업이 CPU를 나눠 사용 (워커 풀 전체 처리량 최대화)
+          얼굴 탐지(300x300)와 오디오 인코딩은 병렬화 이득이 작으므로 1스레드로 두고 코어를 torch/STT에 배정합니다.
+        """
+        cpus = cpus or available_cpus()
+        if profile == "latency":
+            return cls(torch=cpus, opencv=cpus, stt=cpus, ffmpeg=min(cpus, 4), profile=profile)
+        if profile == "throughput":
+            per_job = max(1, cpus // max(1, concurrency))
+            return cls(torch=per_job, opencv=1, stt=per_job, ffmpeg=1, profile=profile)
+        raise ValueError(f"지원하지 않는 스레드 프로파일입니다: {profile} (지원: {', '.join(cls.PROFILES)})")
+
+    @classmethod
+    def single(cls) -> "ThreadBudget":
+        """모든 라이브러리를 1스레드로 제한 (fork 전 부모 프로세스의 모델 로드용)"""
+        return cls(torch=1, opencv=1, stt=1, ffmpeg=1, profile="single")
+
+    def apply(self):
+        """현재 프로세스의 torch/OpenCV 스레드 수를 설정합니다. (STT/ffmpeg는 생성/실행 시점에 인자로 전달)"""
+        import cv2
+        import torch
+        torch.set_num_threads(self.torch)
+        cv2.setNumThreads(self.opencv)
+
+    def ffmpeg_params(self) -> List[str]:
+        """moviepy write_audiofile의 ffmpeg_params로 전달할 인자"""
+        return ["-threads", str(self.ffmpeg)]
+
+    def as_dict(self) -> Dict[str, object]:
+        return {"profile": self.profile, "torch": self.torch, "opencv": self.opencv, "stt": self.stt, "ffmpeg": self.ffmpeg}
+
+    def __repr__(self):
+        return f"ThreadBudget({', '.join(f'{key}={value}' for key, value in self.as_dict().items())})"
@@ -0,0 +1,131 @@
+# ./core/utils/time_series_codec.py
+
+import struct
+from typing import Any, Dict, Optional
+
+# 분석기(video/audio_analyzer, Gemini 프롬프트)가 사용하는 고정 라벨 순서
+EMOTIONS = ("기쁨", "당황", "분노", "불안", "상처", "슬픔", "중립")
+SENTIMENTS = ("긍정", "부정")
+# 0~1 분포 값은 1/10000 단위 고정소수점 uint16(little-endian)으로 양자화하여 bytea에 저장합니다. (라벨당 2바이트, 소수 4자리)
+QUANTIZE_SCALE = 10000
+DECODED_PRECISION = 4
+_PACKERS = {len(labels): struct.Struct(f"<{len(labels)}H") for labels in (EMOTIONS, SENTIMENTS)}
+_AUDIO_KEY_ORDER = ("text_based_analysis", "voice_based_analysis")
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def _is_distribution(value: Any, labels: tuple) -> bool:
+    """라벨 집합이 같고 모든 값이 0~1인 분포만 양자화합니다. (범위를 벗어나면 extra에 그대로 보관)"""
+    return isinstance(value, dict) and len(value) == len(labels) and all(
+        _is_number(value.get(label)) and 0.0 <= value[label] <= 1.0 for label in labels
+    )
+
+def _fits_visual(visual: Any) -> bool:
+    return (isinstance(visual, dict) and set(visual) == {"dominant_emotion", "distribution"}
+            and (visual["dominant_emotion"] in EMOTIONS or visual["dominant_emotion"] == "N/A")
+            and _is_distribution(visual["distribution"], EMOTIONS))
+
+def _fits_text(text: Any) -> bool:
+    return (isinstance(text, dict) and set(text) == {"sentiment", "emotions"}
+            and _is_distribution(text["sentiment"], SENTIMENTS) and _is_distribution(text["emotions"], EMOTIONS))
+
+def _fits_voice(voice: Any) -> bool:
+    return isinstance(voice, dict) and set(voice) == {"distribution"} and _is_distribution(voice["distribution"], EMOTIONS)
+
+def _to_array(distribution: Dict[str, float], labels: tuple) -> bytes:
+    return _PACKERS[len(labels)].pack(*(round(distribution[label] * QUANTIZE_SCALE) for label in labels))
+
+def _to_distribution(data: bytes, labels: tuple) -> Dict[str, float]:
+    values = _PACKERS[len(labels)].unpack(bytes(data)) # DB 드라이버는 bytea를 memoryview로 반환
+    return {label: round(value / QUANTIZE_SCALE, DECODED_PRECISION) for label, value in zip(labels, values)}
+
+def _to_ms(seconds: Any) -> Optional[int]:
+    return None if seconds is None else round(seconds * 1000)
+
+def _from_ms(milliseconds: Optional[int]) -> Optional[float]:
+    return None if milliseconds is None else milliseconds / 1000
+
+def split_segment(segment: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    analyzer의 세그먼트 결과 dict를 고정 순서 배열 열로 나눕니다.
+
+    감정/감성 분포는 EMOTIONS/SENTIMENTS 순서로 양자화한 bytes(face, sentiment, text_emotions, voice)로,
+    구간 시각은 밀리초 정수(start_ms, end_ms)로,
+    얼굴 대표 감정은 EMOTIONS 인덱스(face_dominant, "N/A"는 None)로 바꿉니다. 이 형태에 맞지 않는 값
+    (에러 메시지, 다른 라벨 집합, 없는 audio_analysis 등)은 extra에 그대로 담아 join_segment()가 원래대로 복원합니다.
+    세그먼트별 성능 측정값(performance)은 포함하지 않습니다. (report_detail.performance.segment_processing에 있음)
+    """
+    extra: Dict[str, Any] = {}
+    columns: Dict[str, Any] = {
+        "segment_id": segment.get("segment_id"),
+        "start_ms": None, "end_ms": None,
+        "text": segment.get("transcribed_text"),
+        "face_dominant": None, "face": None, "sentiment": None, "text_emotions": None, "voice": None,
+    }
+    # 구간 시각은 밀리초 정수로 저장합니다. 숫자가 아니거나 밀리초로 나타낼 수 없는 값은 extra에 그대로 보관합니다.
+    for key, column in (("start_time", "start_ms"), ("end_time", "end_ms")):
+        value = segment.get(key)
+        if value is None or (_is_number(value) and _to_ms(value) / 1000 == value):
+            columns[column] = _to_ms(value)
+        else:
+            extra[key] = value
+
+    visual = segment.get("visual_analysis")
+    if _fits_visual(visual):
+        columns["face"] = _to_array(visual["distribution"], EMOTIONS)
+        if visual["dominant_emotion"] != "N/A":
+            columns["face_dominant"] = EMOTIONS.index(visual["dominant_emotion"])
+    else:
+        extra["visual_analysis"] = visual
+
+    audio = segment.get("audio_analysis")
+    if isinstance(audio, dict):
+        for key, value in audio.items():
+            if key == "text_based_analysis" and _fits_text(value):
+                columns["sentiment"] = _to_array(value["sentiment"], SENTIMENTS)
+                columns["text_emotions"] = _to_array(value["emotions"], EMOTIONS)
+            elif key == "voice_based_analysis" and _fits_voice(value):
+                columns["voice"] = _to_array(value["distribution"], EMOTIONS)
+            else:
+                extra.setdefault("audio_analysis", {})[key] = value
+        if list(audio) != [key for key in _AUDIO_KEY_ORDER if key in audio]:
+            extra["audio_key_order"] = list(audio)
+    else:
+        extra["audio_analysis"] = audio # None 또는 예상하지 못한 형태
+    columns["extra"] = extra or None
+    return columns
+
+def join_segment(columns: Dict[str, Any], visual: bool = True, audio: bool = True) -> Dict[str, Any]:
+    """split_segment()의 결과를 기존 세그먼트 dict 형태로 복원합니다. 필요 없는 부분은 visual/audio=False로 생략합니다."""
+    extra = columns.get("extra") or {}
+    segment = {
+        "segment_id": columns.get("segment_id"),
+        "start_time": extra["start_time"] if "start_time" in extra else _from_ms(columns.get("start_ms")),
+        "end_time": extra["end_time"] if "end_time" in extra else _from_ms(columns.get("end_ms")),
+        "transcribed_text": columns.get("text"),
+    }
+    if visual:
+        if columns.get("face") is not None:
+            dominant = columns.get("face_dominant")
+            segment["visual_analysis"] = {
+                "dominant_emotion": "N/A" if dominant is None else EMOTIONS[dominant],
+                "distribution": _to_distribution(columns["face"], EMOTIONS),
+            }
+        else:
+            segment["visual_analysis"] = extra.get("visual_analysis")
+    if audio:
+        if "audio_analysis" in extra and not isinstance(extra["audio_analysis"], dict):
+            segment["audio_analysis"] = extra["audio_analysis"]
+        else:
+            parts = dict(extra.get("audio_analysis") or {})
+            if columns.get("text_emotions") is not None:
+                parts["text_based_analysis"] = {
+                    "sentiment": _to_distribution(columns["sentiment"], SENTIMENTS),
+                    "emotions": _to_distribution(columns["text_emotions"], EMOTIONS),
+                }
+            if columns.get("voice") is not None:
+                parts["voice_based_analysis"] = {"distribution": _to_distribution(columns["voice"], EMOTIONS)}
+            order = extra.get("audio_key_order") or _AUDIO_KEY_ORDER
+            segment["audio_analysis"] = {key: parts[key] for key in order if key in parts}
+    return segment
@@ -0,0 +1,328 @@
+# ./core/utils/tracing.py
+
+import bisect
+import functools
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+# 분석 단계 소요 시간 분포용 버킷(초). 얼굴 탐지(ms 단위)부터 STT/Gemini 호출(수십 초)까지 포함합니다.
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+LabelKey = Tuple[Tuple[str, str], ...]
+
+logger = logging.getLogger(__name__)
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+def _escape_label_value(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(key: LabelKey, extra: Iterable[Tuple[str, str]] = ()) -> str:
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label_value(value)}"' for name, value in pairs) + "}"
+
+def _otlp_attributes(key: LabelKey) -> List[Dict[str, Any]]:
+    return [{"key": name, "value": {"stringValue": value}} for name, value in key]
+
+class Counter:
+    def __init__(self, name: str, description: str):
+        self.name = name
+        self.description = description
+        self._values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels):
+        self.inc_key(_label_key(labels), amount)
+
+    def inc_key(self, key: LabelKey, amount: float = 1.0):
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> Dict[LabelKey, float]:
+        with self._lock:
+            return dict(self._values)
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+class Histogram:
+    def __init__(self, name: str, description: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.description = description
+        self.buckets = tuple(sorted(buckets))
+        self._values: Dict[LabelKey, List[float]] = {} # 버킷별 개수(+Inf 포함) + [합계]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        self.observe_key(_label_key(labels), value)
+
+    def observe_key(self, key: LabelKey, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                counts = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            counts[index] += 1
+            counts[-1] += value
+
+    def samples(self) -> Dict[LabelKey, List[float]]:
+        with self._lock:
+            return {key: list(counts) for key, counts in self._values.items()}
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+class _NoopSpan:
+    """트레이싱이 꺼져 있을 때 span()이 반환하는 공유 객체. 시각 측정/할당 없이 바로 반환합니다."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set_attribute(self, name: str, value: Any):
+        pass
+
+_NOOP_SPAN = _NoopSpan()
+
+class Span:
+    __slots__ = ("tracer", "name", "attributes", "trace_id", "span_id", "parent_id", "start_ns", "end_ns", "duration_ns", "status",
+                 "_perf_start_ns", "_token")
+
+    def __init__(self, tracer: "Tracer", name: str, attributes: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.attributes = attributes
+        parent = tracer._current_span.get()
+        # ID는 정수로 보관하고 내보낼 때만 16진수 문자열로 변환합니다.
+        self.trace_id = parent.trace_id if parent else random.getrandbits(128)
+        self.parent_id = parent.span_id if parent else None
+        self.span_id = random.getrandbits(64)
+        self.start_ns = 0 # OTLP 내보내기용 벽시계 시각
+        self.end_ns = 0
+        self.duration_ns = 0 # 단조 시계(perf_counter_ns)로 잰 소요 시간. NTP 보정으로 시계가 바뀌어도 음수가 되지 않음
+        self._perf_start_ns = 0
+        self.status = "ok"
+        self._token = None
+
+    def set_attribute(self, name: str, value: Any):
+        self.attributes[name] = value
+
+    def __enter__(self):
+        self._token = self.tracer._current_span.set(self)
+        self.start_ns = time.time_ns()
+        self._perf_start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration_ns = time.perf_counter_ns() - self._perf_start_ns
+        self.end_ns = self.start_ns + self.duration_ns
+        self.tracer._current_span.reset(self._token)
+        if exc_type is not None:
+            self.status = "error"
+            self.attributes["error.type"] = exc_type.__name__
+        self.tracer._finish(self)
+        return False
+
+class Tracer:
+    """
+    분석 단계별 span과 Prometheus 형식의 counter/histogram을 프로세스 단위로 수집합니다.
+
+    span(name)은 종료 시 feellog_span_duration_seconds{span=name} 히스토그램과
+    feellog_span_total{span, status} 카운터에 기록되고, 최근 span은 OpenTelemetry(OTLP JSON) 형식으로 내보낼 수 있습니다.
+    TRACING_ENABLED=0이면 span()/traced()는 공유 no-op 객체를 반환하거나 원래 함수를 바로 호출하므로 비용이 거의 없습니다.
+    """
+    SPAN_BUFFER_SIZE = 2048 # 내보내기용으로 보관할 최근 span 수
+
+    def __init__(self, service_name: str = "feellog-backend", enabled: bool = True):
+        self.service_name = service_name
+        self.enabled = enabled
+        self._current_span: ContextVar[Optional[Span]] = ContextVar("feellog_current_span", default=None)
+        self._finished: Deque[Span] = deque(maxlen=self.SPAN_BUFFER_SIZE)
+        self._metrics: Dict[str, Any] = {}
+        self._metrics_lock = threading.Lock()
+        self._collectors: List[Callable[[], Iterable[Tuple[str, str, str, Dict[str, Any], float]]]] = []
+        self.span_duration = self.histogram("feellog_span_duration_seconds", "Duration of traced analysis/API stages")
+        self.span_total = self.counter("feellog_span_total", "Number of finished spans by status")
+
+    def counter(self, name: str, description: str) -> Counter:
+        with self._metrics_lock:
+            return self._metrics.setdefault(name, Counter(name, description))
+
+    def histogram(self, name: str, description: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        with self._metrics_lock:
+            return self._metrics.setdefault(name, Histogram(name, description, buckets))
+
+    def register_collector(self, collector: Callable[[], Iterable[Tuple[str, str, str, Dict[str, Any], float]]]):
+        """
+        내보낼 때마다 호출되어 (이름, 타입('counter'|'gauge'), 설명, 라벨, 값)을 반환하는 함수를 등록합니다.
+        DB 커넥션 풀처럼 이미 다른 곳에서 집계 중인 값을 그대로 노출할 때 사용합니다.
+        """
+        self._collectors.append(collector)
+
+    def span(self, name: str, **attributes):
+        if not self.enabled:
+            return _NOOP_SPAN
+        return Span(self, name, attributes)
+
+    def traced(self, name: Optional[str] = None):
+        """함수 호출 전체를 span으로 기록하는 데코레이터. 트레이싱이 꺼져 있으면 원래 함수를 바로 호출합니다."""
+        def decorator(func):
+            span_name = name or func.__qualname__
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with Span(self, span_name, {}):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def _finish(self, span: Span):
+        # span 종료마다 호출되므로 라벨 키를 정렬 없이 직접 만듭니다. (이름순: span < status)
+        self.span_duration.observe_key((("span", span.name),), span.duration_ns / 1e9)
+        self.span_total.inc_key((("span", span.name), ("status", span.status)))
+        self._finished.append(span)
+
+    def reset(self):
+        """수집한 span과 지표 값을 비웁니다. (분석 작업 단위로 내보낼 때 사용)"""
+        self._finished.clear()
+        with self._metrics_lock:
+            for metric in self._metrics.values():
+                metric.clear()
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format(0.0.4)으로 모든 지표를 반환합니다."""
+        lines: List[str] = []
+        with self._metrics_lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            if isinstance(metric, Counter):
+                lines += [f"# HELP {metric.name} {metric.description}", f"# TYPE {metric.name} counter"]
+                lines += [f"{metric.name}{_format_labels(key)} {value}" for key, value in metric.samples().items()]
+            else:
+                lines += [f"# HELP {metric.name} {metric.description}", f"# TYPE {metric.name} histogram"]
+                for key, counts in metric.samples().items():
+                    cumulative = 0.0
+                    for bound, count in zip(metric.buckets + (float("inf"),), counts):
+                        cumulative += count
+                        le = "+Inf" if bound == float("inf") else repr(bound)
+                        lines.append(f"{metric.name}_bucket{_format_labels(key, [('le', le)])} {cumulative}")
+                    lines.append(f"{metric.name}_sum{_format_labels(key)} {counts[-1]}")
+                    lines.append(f"{metric.name}_count{_format_labels(key)} {cumulative}")
+
+        described = set()
+        for collector in self._collectors:
+            for name, metric_type, description, labels, value in collector():
+                if name not in described:
+                    lines += [f"# HELP {name} {description}", f"# TYPE {name} {metric_type}"]
+                    described.add(name)
+                lines.append(f"{name}{_format_labels(_label_key(labels))} {value}")
+        return "\n".join(lines) + "\n"
+
+    def _resource(self) -> Dict[str, Any]:
+        return {"attributes": [
+            {"key": "service.name", "value": {"stringValue": self.service_name}},
+            {"key": "process.pid", "value": {"intValue": str(os.getpid())}},
+        ]}
+
+    @staticmethod
+    def _otlp_value(value: Any) -> Dict[str, Any]:
+        if isinstance(value, bool):
+            return {"boolValue": value}
+        if isinstance(value, int):
+            return {"intValue": str(value)}
+        if isinstance(value, float):
+            return {"doubleValue": value}
+        return {"stringValue": str(value)}
+
+    def export_otlp_spans(self, trace_id: Optional[int] = None) -> Dict[str, Any]:
+        """보관 중인 span을 OTLP/JSON(ExportTraceServiceRequest) 형식으로 반환합니다. trace_id를 주면 해당 trace만 반환합니다."""
+        spans = [{
+            "traceId": f"{span.trace_id:032x}",
+            "spanId": f"{span.span_id:016x}",
+            **({"parentSpanId": f"{span.parent_id:016x}"} if span.parent_id is not None else {}),
+            "name": span.name,
+            "kind": 1, # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(span.start_ns),
+            "endTimeUnixNano": str(span.end_ns),
+            "attributes": [{"key": key, "value": self._otlp_value(value)} for key, value in span.attributes.items()],
+            "status": {"code": 2 if span.status == "error" else 1}, # STATUS_CODE_ERROR / STATUS_CODE_OK
+        } for span in list(self._finished) if trace_id is None or span.trace_id == trace_id]
+        return {"resourceSpans": [{"resource": self._resource(), "scopeSpans": [{"scope": {"name": "feellog.tracing"}, "spans": spans}]}]}
+
+    def export_otlp_metrics(self) -> Dict[str, Any]:
+        """counter/histogram을 OTLP/JSON(ExportMetricsServiceRequest) 형식의 누적값으로 반환합니다."""
+        now = str(time.time_ns())
+        metrics = []
+        with self._metrics_lock:
+            registered = list(self._metrics.values())
+        for metric in registered:
+            if isinstance(metric, Counter):
+                metrics.append({"name": metric.name, "description": metric.description, "sum": {
+                    "aggregationTemporality": 2, "isMonotonic": True, # AGGREGATION_TEMPORALITY_CUMULATIVE
+                    "dataPoints": [{"attributes": _otlp_attributes(key), "timeUnixNano": now, "asDouble": value}
+                                   for key, value in metric.samples().items()],
+                }})
+            else:
+                metrics.append({"name": metric.name, "description": metric.description, "histogram": {
+                    "aggregationTemporality": 2,
+                    "dataPoints": [{
+                        "attributes": _otlp_attributes(key), "timeUnixNano": now,
+                        "count": str(int(sum(counts[:-1]))), "sum": counts[-1],
+                        "bucketCounts": [str(int(count)) for count in counts[:-1]],
+                        "explicitBounds": list(metric.buckets),
+                    } for key, counts in metric.samples().items()],
+                }})
+        return {"resourceMetrics": [{"resource": self._resource(), "scopeMetrics": [{"scope": {"name": "feellog.tracing"}, "metrics": metrics}]}]}
+
+class _MetricsRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == "/metrics":
+            body, content_type = tracer.render_prometheus().encode("utf-8"), "text/plain; version=0.0.4; charset=utf-8"
+        elif self.path == "/metrics/otlp":
+            payload = {"traces": tracer.export_otlp_spans(), "metrics": tracer.export_otlp_metrics()}
+            body, content_type = json.dumps(payload).encode("utf-8"), "application/json"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass # 스크레이프마다 stderr에 접근 로그를 남기지 않습니다.
+
+def start_metrics_server(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """
+    Flask 앱이 없는 프로세스(analysis_worker 자식 등)에서 /metrics, /metrics/otlp를 제공하는 데몬 스레드 HTTP 서버를 시작합니다.
+    인증이 없으므로 기본값은 loopback에만 바인딩합니다. 다른 컨테이너에서 수집하려면 내부망 주소나 0.0.0.0을 명시합니다.
+    """
+    server = ThreadingHTTPServer((host, port), _MetricsRequestHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name=f"metrics-{port}", daemon=True).start()
+    logger.info(f"지표 서버 시작: http://{host}:{port}/metrics")
+    return server
+
+tracer = Tracer(
+    service_name=os.environ.get("TRACING_SERVICE_NAME", "feellog-backend"),
+    enabled=os.environ.get("TRACING_ENABLED", "1") == "1"
+)
+span = tracer.span
+traced = tracer.traced
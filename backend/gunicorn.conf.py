@@ -0,0 +1,36 @@
+# backend/gunicorn.conf.py
+# 프로덕션 API 서버 설정. 실행: gunicorn -c gunicorn.conf.py wsgi:app
+# 모든 값은 GUNICORN_* 환경 변수로 덮어쓸 수 있습니다.
+
+import multiprocessing
+import os
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:5000")
+
+# API 요청은 대부분 DB I/O 대기이므로 스레드 워커(gthread)를 사용합니다.
+# SSE(/api/analysis/events) 연결은 스트림이 끝날 때까지 스레드 하나를 점유하므로 스레드 수를 넉넉히 둡니다.
+# 챗봇 스트림(/api/chatbot/chat/stream)은 워커당 CHATBOT_MAX_CONCURRENT_STREAMS(기본: threads의 절반)개까지만 동시에 처리합니다.
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+workers = int(os.environ.get("GUNICORN_WORKERS", min(multiprocessing.cpu_count() * 2 + 1, 8)))
+threads = int(os.environ.get("GUNICORN_THREADS", "8"))
+# 워커마다 DB 커넥션 풀이 따로 생기므로 DB_POOL_SIZE + DB_MAX_OVERFLOW >= threads 가 되도록 맞춥니다.
+
+# 대용량 영상 업로드를 고려한 타임아웃
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "120"))
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", "5"))
+
+# 메모리 누수 대비 주기적 워커 재시작
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", "1000"))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", "100"))
+
+# preload를 사용하지 않습니다. 각 워커가 app을 직접 임포트해야 워커마다 DB 커넥션 풀,
+# LISTEN 스레드, 분석 작업 reaper 스레드가 만들어지고 fork 이전 연결을 공유하지 않습니다.
+preload_app = False
+
+# 컨테이너의 overlay 파일시스템 대신 메모리에 heartbeat 파일을 둡니다.
+worker_tmp_dir = os.environ.get("GUNICORN_WORKER_TMP_DIR", "/dev/shm" if os.path.isdir("/dev/shm") else None)
+
+accesslog = os.environ.get("GUNICORN_ACCESSLOG", "-")
+errorlog = "-"
+loglevel = os.environ.get("GUNICORN_LOGLEVEL", "info")
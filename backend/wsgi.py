@@ -0,0 +1,15 @@
+# backend/wsgi.py
+# 프로덕션 WSGI 진입점. 실행: gunicorn -c gunicorn.conf.py wsgi:app
+
+import logging
+import sys
+
+from app import app
+
+# 모델 추론은 analyzer 서브프로세스에서만 수행합니다.
+# API 워커가 아래 모듈을 임포트하면 워커마다 수백 MB의 메모리와 수 초의 기동 시간이 추가되므로 경고합니다.
+HEAVY_MODULES = ('torch', 'torchvision', 'torchaudio', 'transformers', 'cv2', 'moviepy', 'faster_whisper', 'pyannote')
+
+loaded_heavy_modules = [name for name in HEAVY_MODULES if name in sys.modules]
+if loaded_heavy_modules:
+    logging.getLogger(__name__).warning(f"API 프로세스에 분석용 모듈이 로드되었습니다: {', '.join(loaded_heavy_modules)}")
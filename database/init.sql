@@ -13,6 +13,7 @@ CREATE TABLE IF NOT EXISTS public.user_tbl
     selected_chatbot_id UUID, -- 사용자가 선택한 챗봇 ID (FK)
     user_account_created timestamp with time zone NOT NULL DEFAULT now(),
     user_account_updated timestamp with time zone NOT NULL DEFAULT now(),
+    user_data_version bigint NOT NULL DEFAULT 0, -- 사용자 화면 데이터 변경 시 증가 (응답 캐시/ETag)
     CONSTRAINT user_tbl_pkey PRIMARY KEY (user_id),
     CONSTRAINT user_email_unique UNIQUE (user_email),
     CONSTRAINT user_nickname_unique UNIQUE (user_nickname)
@@ -87,6 +88,7 @@ CREATE TABLE IF NOT EXISTS public.message_tbl
     message_id uuid NOT NULL DEFAULT uuid_generate_v4(),
     message_user_id uuid NOT NULL,
     message_chat_session_id uuid NOT NULL,
+    message_role text NOT NULL DEFAULT 'user', -- 'user' | 'bot'
     message_text text,
     message_image_id uuid,
     message_created timestamp with time zone NOT NULL DEFAULT now(),
@@ -102,6 +104,14 @@ CREATE TABLE IF NOT EXISTS public.records_tbl
     record_video_path text NOT NULL,
     record_seconds integer NOT NULL,
     record_analysis_status text NOT NULL,
+    record_stage text,
+    record_progress_percent smallint NOT NULL DEFAULT 0,
+    record_progress_current integer,
+    record_progress_total integer,
+    record_eta_seconds integer,
+    record_heartbeat timestamp with time zone NOT NULL DEFAULT now(),
+    record_attempts smallint NOT NULL DEFAULT 0,
+    record_error text,
     PRIMARY KEY (record_id)
 );
 
@@ -112,15 +122,31 @@ CREATE TABLE IF NOT EXISTS public.analysis_tbl
     analysis_record_id uuid NOT NULL,
     analysis_created timestamp with time zone NOT NULL DEFAULT now(),
     analysis_face_emotions_rates jsonb NOT NULL,
-    analysis_face_emotions_time_series_rates jsonb NOT NULL,
     analysis_voice_emotions_rates jsonb NOT NULL,
-    analysis_voice_emotions_time_series_rates jsonb NOT NULL,
     analysis_face_emotions_score jsonb NOT NULL,
     analysis_voice_emotions_score jsonb NOT NULL,
     analysis_majority_emotion jsonb NOT NULL,
     PRIMARY KEY (analysis_id)
 );
 
+-- 발화 구간별 분석 결과 테이블 (구간당 1행, analysis_tbl 시계열과 report_tbl 상세가 함께 참조)
+CREATE TABLE IF NOT EXISTS public.segment_tbl
+(
+    segment_analysis_id uuid NOT NULL,
+    segment_index smallint NOT NULL, -- 분석 결과 내 순서
+    segment_number integer, -- analyzer의 segment_id
+    segment_start_ms integer, -- 구간 시작 시각 (밀리초)
+    segment_end_ms integer,
+    segment_text text,
+    segment_face_dominant smallint, -- 감정 라벨 인덱스 (NULL이면 'N/A')
+    segment_face bytea, -- 감정 분포: 기쁨, 당황, 분노, 불안, 상처, 슬픔, 중립 순서의 uint16 little-endian (값 × 10000)
+    segment_text_sentiment bytea, -- 긍정, 부정 순서
+    segment_text_emotions bytea,
+    segment_voice bytea,
+    segment_extra jsonb, -- 고정 형식에 맞지 않는 값 (에러 메시지 등)
+    PRIMARY KEY (segment_analysis_id, segment_index)
+);
+
 -- 보고서 테이블
 CREATE TABLE IF NOT EXISTS public.report_tbl
 (
@@ -135,6 +161,23 @@ CREATE TABLE IF NOT EXISTS public.report_tbl
     PRIMARY KEY (report_id)
 );
 
+-- 사용자별 일간 감정 집계 테이블 (월간 트렌드 조회용)
+CREATE TABLE IF NOT EXISTS public.emotion_daily_rollup_tbl
+(
+    rollup_id uuid NOT NULL DEFAULT uuid_generate_v4(),
+    rollup_user_id uuid NOT NULL,
+    rollup_date date NOT NULL,
+    rollup_report_count integer NOT NULL DEFAULT 0,
+    rollup_sentiment_score_sum double precision NOT NULL DEFAULT 0,
+    rollup_positive_sum double precision NOT NULL DEFAULT 0,
+    rollup_negative_sum double precision NOT NULL DEFAULT 0,
+    rollup_updated timestamp with time zone NOT NULL DEFAULT now(),
+    PRIMARY KEY (rollup_id),
+    CONSTRAINT emotion_daily_rollup_user_date_unique UNIQUE (rollup_user_id, rollup_date)
+);
+
+COMMENT ON TABLE public.emotion_daily_rollup_tbl IS '사용자별 일간 감정 집계 테이블 (save_analysis_results에서 갱신)';
+
 -- 외래 키 제약 조건 추가
 ALTER TABLE IF EXISTS public.auth_tbl
     ADD CONSTRAINT fk_auth_user FOREIGN KEY (user_id)
@@ -184,6 +227,12 @@ ALTER TABLE IF EXISTS public.analysis_tbl
     ON UPDATE NO ACTION
     ON DELETE NO ACTION;
 
+ALTER TABLE IF EXISTS public.segment_tbl
+    ADD CONSTRAINT fk_segment_analysis FOREIGN KEY (segment_analysis_id)
+    REFERENCES public.analysis_tbl (analysis_id)
+    ON UPDATE NO ACTION
+    ON DELETE CASCADE; -- 분석 결과 삭제 시 구간 결과도 함께 삭제
+
 ALTER TABLE IF EXISTS public.report_tbl
     ADD CONSTRAINT fk_report_analysis FOREIGN KEY (report_analysis_id)
     REFERENCES public.analysis_tbl (analysis_id)
@@ -202,6 +251,12 @@ ALTER TABLE IF EXISTS public.report_tbl
     ON UPDATE NO ACTION
     ON DELETE NO ACTION;
 
+ALTER TABLE IF EXISTS public.emotion_daily_rollup_tbl
+    ADD CONSTRAINT fk_rollup_user FOREIGN KEY (rollup_user_id)
+    REFERENCES public.user_tbl (user_id)
+    ON UPDATE NO ACTION
+    ON DELETE CASCADE;
+
 ALTER TABLE IF EXISTS public.user_tbl
 ADD CONSTRAINT fk_user_chatbot_persona FOREIGN KEY (selected_chatbot_id)
 REFERENCES public.chatbot_persona_tbl (chatbot_id)
@@ -211,9 +266,13 @@ ON DELETE SET NULL; -- 페르소나 삭제 시 사용자 선택은 NULL로 변
 -- 인덱스 추가 (쿼리 성능 최적화)
 CREATE INDEX idx_auth_user_id ON public.auth_tbl (user_id);
 CREATE INDEX idx_chat_session_user_id ON public.chat_session_tbl (chat_user_id);
-CREATE INDEX idx_message_chat_session_id ON public.message_tbl (message_chat_session_id);
-CREATE INDEX idx_records_user_id ON public.records_tbl (record_user_id);
+CREATE INDEX idx_message_chat_session_id ON public.message_tbl (message_chat_session_id, message_created DESC);
+-- 사용자별 날짜 범위 조회용 복합 인덱스 (record_user_id 단일 인덱스 역할도 겸함)
+CREATE INDEX idx_records_user_id_created ON public.records_tbl (record_user_id, record_created DESC);
+-- 멈춘 분석 작업 탐색용 부분 인덱스 (processing 상태만 포함)
+CREATE INDEX idx_records_processing_heartbeat ON public.records_tbl (record_heartbeat) WHERE record_analysis_status = 'processing';
 CREATE INDEX idx_analysis_record_id ON public.analysis_tbl (analysis_record_id);
-CREATE INDEX idx_report_user_id ON public.report_tbl (report_user_id);
+-- 사용자별 날짜 범위 조회용 복합 인덱스 (report_user_id 단일 인덱스 역할도 겸함)
+CREATE INDEX idx_report_user_id_created ON public.report_tbl (report_user_id, report_created DESC);
 
 END;
\ No newline at end of file
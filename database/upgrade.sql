@@ -0,0 +1,123 @@
+-- 기존 데이터베이스를 현재 init.sql 스키마로 올리는 스크립트
+-- init.sql의 CREATE TABLE IF NOT EXISTS는 이미 있는 테이블을 바꾸지 않으므로, init.sql 이전 버전으로 만든 DB에는 이 스크립트를 실행합니다.
+-- 여러 번 실행해도 결과가 같으며, 하나의 트랜잭션으로 적용됩니다.
+-- 사용법 (backend, analysis-worker를 멈춘 상태에서):
+--   docker compose exec -T db psql -v ON_ERROR_STOP=1 -U admin5 -d feellog_db < database/upgrade.sql
+--   docker compose run --rm backend python backfill_segments.py
+--   docker compose run --rm backend python backfill_rollups.py
+
+BEGIN;
+
+-- 발화 구간별 분석 결과 테이블 (init.sql과 동일)
+CREATE TABLE IF NOT EXISTS public.segment_tbl
+(
+    segment_analysis_id uuid NOT NULL,
+    segment_index smallint NOT NULL, -- 분석 결과 내 순서
+    segment_number integer, -- analyzer의 segment_id
+    segment_start_ms integer, -- 구간 시작 시각 (밀리초)
+    segment_end_ms integer,
+    segment_text text,
+    segment_face_dominant smallint, -- 감정 라벨 인덱스 (NULL이면 'N/A')
+    segment_face bytea, -- 감정 분포: 기쁨, 당황, 분노, 불안, 상처, 슬픔, 중립 순서의 uint16 little-endian (값 × 10000)
+    segment_text_sentiment bytea, -- 긍정, 부정 순서
+    segment_text_emotions bytea,
+    segment_voice bytea,
+    segment_extra jsonb, -- 고정 형식에 맞지 않는 값 (에러 메시지 등)
+    PRIMARY KEY (segment_analysis_id, segment_index)
+);
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'fk_segment_analysis') THEN
+        ALTER TABLE public.segment_tbl
+            ADD CONSTRAINT fk_segment_analysis FOREIGN KEY (segment_analysis_id)
+            REFERENCES public.analysis_tbl (analysis_id)
+            ON UPDATE NO ACTION
+            ON DELETE CASCADE;
+    END IF;
+END $$;
+
+-- 구간 시계열은 segment_tbl에 저장하므로 analysis_tbl의 기존 시계열 컬럼은 더 이상 채우지 않습니다.
+-- backfill_segments.py가 이 컬럼에서 segment_tbl을 채우므로 컬럼은 남겨 두고 NOT NULL만 해제합니다.
+DO $$
+DECLARE
+    legacy_column text;
+BEGIN
+    FOREACH legacy_column IN ARRAY ARRAY['analysis_face_emotions_time_series_rates', 'analysis_voice_emotions_time_series_rates'] LOOP
+        IF EXISTS (
+            SELECT 1 FROM information_schema.columns
+            WHERE table_schema = 'public' AND table_name = 'analysis_tbl' AND column_name = legacy_column
+        ) THEN
+            EXECUTE format('ALTER TABLE public.analysis_tbl ALTER COLUMN %I DROP NOT NULL', legacy_column);
+        END IF;
+    END LOOP;
+END $$;
+
+-- 분석 작업 진행률/하트비트/재시도 (records_tbl)
+ALTER TABLE public.records_tbl
+    ADD COLUMN IF NOT EXISTS record_stage text,
+    ADD COLUMN IF NOT EXISTS record_progress_percent smallint NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS record_progress_current integer,
+    ADD COLUMN IF NOT EXISTS record_progress_total integer,
+    ADD COLUMN IF NOT EXISTS record_eta_seconds integer,
+    ADD COLUMN IF NOT EXISTS record_heartbeat timestamp with time zone NOT NULL DEFAULT now(),
+    ADD COLUMN IF NOT EXISTS record_attempts smallint NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS record_error text;
+
+-- 사용자 화면 데이터 변경 시 증가 (응답 캐시/ETag)
+ALTER TABLE public.user_tbl
+    ADD COLUMN IF NOT EXISTS user_data_version bigint NOT NULL DEFAULT 0;
+
+-- 챗봇 대화 메시지의 발화자 ('user' | 'bot'). 이전 버전은 message_tbl에 저장하지 않았으므로 기본값으로 충분합니다.
+ALTER TABLE public.message_tbl
+    ADD COLUMN IF NOT EXISTS message_role text NOT NULL DEFAULT 'user';
+
+-- 사용자별 일간 감정 집계 테이블 (init.sql과 동일). 테이블 도입 이전 리포트는 backfill_rollups.py로 채웁니다.
+CREATE TABLE IF NOT EXISTS public.emotion_daily_rollup_tbl
+(
+    rollup_id uuid NOT NULL DEFAULT uuid_generate_v4(),
+    rollup_user_id uuid NOT NULL,
+    rollup_date date NOT NULL,
+    rollup_report_count integer NOT NULL DEFAULT 0,
+    rollup_sentiment_score_sum double precision NOT NULL DEFAULT 0,
+    rollup_positive_sum double precision NOT NULL DEFAULT 0,
+    rollup_negative_sum double precision NOT NULL DEFAULT 0,
+    rollup_updated timestamp with time zone NOT NULL DEFAULT now(),
+    PRIMARY KEY (rollup_id),
+    CONSTRAINT emotion_daily_rollup_user_date_unique UNIQUE (rollup_user_id, rollup_date)
+);
+
+COMMENT ON TABLE public.emotion_daily_rollup_tbl IS '사용자별 일간 감정 집계 테이블 (save_analysis_results에서 갱신)';
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'fk_rollup_user') THEN
+        ALTER TABLE public.emotion_daily_rollup_tbl
+            ADD CONSTRAINT fk_rollup_user FOREIGN KEY (rollup_user_id)
+            REFERENCES public.user_tbl (user_id)
+            ON UPDATE NO ACTION
+            ON DELETE CASCADE;
+    END IF;
+END $$;
+
+-- 인덱스 (init.sql과 동일)
+CREATE INDEX IF NOT EXISTS idx_records_user_id_created ON public.records_tbl (record_user_id, record_created DESC);
+CREATE INDEX IF NOT EXISTS idx_records_processing_heartbeat ON public.records_tbl (record_heartbeat) WHERE record_analysis_status = 'processing';
+CREATE INDEX IF NOT EXISTS idx_report_user_id_created ON public.report_tbl (report_user_id, report_created DESC);
+-- 복합 인덱스가 앞 컬럼 단일 인덱스 역할을 겸하므로 이전 단일 컬럼 인덱스는 삭제합니다.
+DROP INDEX IF EXISTS public.idx_records_user_id;
+DROP INDEX IF EXISTS public.idx_report_user_id;
+
+-- idx_message_chat_session_id는 이름은 같고 (message_chat_session_id, message_created DESC)로 바뀌었으므로 이전 정의이면 다시 만듭니다.
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_indexes
+        WHERE schemaname = 'public' AND indexname = 'idx_message_chat_session_id' AND indexdef LIKE '%message_created DESC%'
+    ) THEN
+        DROP INDEX IF EXISTS public.idx_message_chat_session_id;
+        CREATE INDEX idx_message_chat_session_id ON public.message_tbl (message_chat_session_id, message_created DESC);
+    END IF;
+END $$;
+
+COMMIT;
@@ -24,6 +24,8 @@ export const useMainStore = defineStore('main', {
     showToast: false,
     toastMessage: '',
     intervalId: null,
+    eventSource: null,
+    analysisProgress: null,
   }),
 
   getters: {
@@ -97,11 +99,19 @@ export const useMainStore = defineStore('main', {
       if (!this.isLoggedIn) return;
       try {
         const { data } = await apiClient.get('/records/latest-status');
+        this.handleRecordStatus(data);
+      } catch (error) {
+        if (error.response?.status !== 401) {
+          console.error('분석 상태 확인 중 오류 발생:', error);
+        }
+      }
+    },
 
+    handleRecordStatus(data) {
         if (this.processingRecordId) {
-          if (this.processingRecordId === data.record_id && data.status === 'completed') {
-            console.log(`[Main Store] Record ${data.record_id} completed!`);
-            this.toastMessage = '영상 분석이 완료되었습니다!';
+          if (this.processingRecordId === data.record_id && (data.status === 'completed' || data.status === 'failed')) {
+            console.log(`[Main Store] Record ${data.record_id} ${data.status}!`);
+            this.toastMessage = data.status === 'completed' ? '영상 분석이 완료되었습니다!' : '영상 분석에 실패했습니다. 다시 시도해 주세요.';
             this.showToast = true;
 
             setTimeout(() => {
@@ -109,27 +119,71 @@ export const useMainStore = defineStore('main', {
             }, 3000);
 
             this.processingRecordId = null;
+            this.analysisProgress = null;
+            this.stopPolling(); // 추적할 분석이 없으므로 이벤트 스트림/폴링을 닫습니다.
+          } else if (this.processingRecordId === data.record_id) {
+            this.analysisProgress = data;
           }
         } else {
           if (data.record_id && data.status === 'processing') {
             console.log(`[Main Store] Start tracking record ${data.record_id}`);
             this.processingRecordId = data.record_id;
+            this.analysisProgress = data;
           }
         }
-      } catch (error) {
-        if (error.response?.status !== 401) {
-          console.error('분석 상태 확인 중 오류 발생:', error);
-        }
+    },
+
+    // 진행 중인 분석(processingRecordId)이 있을 때만 서버의 분석 진행/완료 이벤트(SSE)를 구독하고, 완료/실패 시 연결을 닫습니다.
+    // 스트림은 서버 워커 스레드를 점유하므로 분석이 없는 동안에는 열어 두지 않습니다. 연결할 수 없으면 5초 폴링으로 대체합니다.
+    async startPolling() {
+      if (this.eventSource || this.intervalId) return; // 중복 실행 방지
+      if (!this.processingRecordId) {
+        await this.checkStatus(); // 로그인 직후: 진행 중인 분석이 있으면 handleRecordStatus가 processingRecordId를 설정
+        if (!this.processingRecordId || this.eventSource || this.intervalId) return;
       }
+      if (typeof EventSource === 'undefined') {
+        this.startIntervalPolling();
+        return;
+      }
+      console.log('[Main Store] Subscribing to analysis events.');
+      const eventSource = new EventSource(`${apiClient.defaults.baseURL}/analysis/events`, { withCredentials: true });
+      eventSource.addEventListener('status', (event) => {
+        this.handleRecordStatus(JSON.parse(event.data));
+      });
+      eventSource.addEventListener('progress', (event) => {
+        const data = JSON.parse(event.data);
+        if (!this.processingRecordId) this.processingRecordId = data.record_id;
+        this.analysisProgress = data;
+      });
+      eventSource.addEventListener('completed', (event) => {
+        this.handleRecordStatus({ ...JSON.parse(event.data), status: 'completed' });
+      });
+      eventSource.addEventListener('failed', (event) => {
+        this.handleRecordStatus({ ...JSON.parse(event.data), status: 'failed' });
+      });
+      eventSource.onerror = () => {
+        // 서버가 스트림을 주기적으로 닫으면 브라우저가 자동 재연결하므로, 연결 자체가 끊긴 경우(동시 스트림 초과 503 포함)에만 폴링으로 전환합니다.
+        if (eventSource.readyState === EventSource.CLOSED && this.eventSource === eventSource) {
+          console.warn('[Main Store] Analysis event stream closed. Falling back to polling.');
+          this.eventSource = null;
+          this.startIntervalPolling();
+        }
+      };
+      this.eventSource = eventSource;
     },
 
-    startPolling() {
-      if (this.intervalId) return; // 중복 실행 방지
+    startIntervalPolling() {
+      if (this.intervalId) return;
       console.log('[Main Store] Starting status polling.');
       this.intervalId = setInterval(this.checkStatus, 5000);
     },
 
     stopPolling() {
+      if (this.eventSource) {
+        this.eventSource.close();
+        this.eventSource = null;
+        this.analysisProgress = null;
+      }
       if (this.intervalId) {
         clearInterval(this.intervalId);
         this.intervalId = null;